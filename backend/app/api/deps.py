@@ -1,3 +1,4 @@
+import time
 from typing import Annotated
 from uuid import UUID
 
@@ -7,7 +8,9 @@ from fastapi.security import OAuth2PasswordBearer
 
 from app import crud
 from app.core.config import settings
+from app.core.metrics import JWT_DECODE_DURATION
 from app.core.security import ALGORITHM
+from app.core.token_cache import token_cache
 from app.models import TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -17,17 +20,24 @@ reusable_oauth2 = OAuth2PasswordBearer(
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(token: TokenDep) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="Could not validate credentials",
     )
 
+
+def _verify_token(token: str) -> UUID:
+    credentials_exception = _credentials_exception()
+
+    started = time.perf_counter()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         token_data = TokenPayload(**payload)
     except jwt.PyJWTError:
         raise credentials_exception from None
+    finally:
+        JWT_DECODE_DURATION.observe(time.perf_counter() - started)
 
     if token_data.sub is None:
         raise credentials_exception
@@ -37,9 +47,20 @@ def get_current_user(token: TokenDep) -> User:
     except ValueError:
         raise credentials_exception from None
 
+    if token_data.exp is not None:
+        token_cache.put(token, user_id, token_data.exp)
+    return user_id
+
+
+def get_current_user(token: TokenDep) -> User:
+    # A session reuses one token for many requests: only verify it once.
+    user_id = token_cache.get(token)
+    if user_id is None:
+        user_id = _verify_token(token)
+
     user = crud.get_user(user_id=user_id)
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
 
     return user
 
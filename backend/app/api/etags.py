@@ -0,0 +1,74 @@
+"""Entity tags for conditional GETs and optimistic-concurrency PATCHes.
+
+Tags are built from the change counters in ``app.crud.versions``, so
+answering ``If-None-Match`` with a 304 (or ``If-Match`` with a 412) costs a
+dict lookup, ahead of any validation or encoding. Read the tag before the
+data it describes: a write in between then leaves an old tag on new data,
+which only costs the client one more full response.
+"""
+
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Header, HTTPException, Response, status
+
+from app import crud
+
+# Responses are per user, and clients must revalidate before reusing one.
+_CACHE_CONTROL = "private, no-cache"
+
+IfNoneMatch = Annotated[str | None, Header()]
+IfMatch = Annotated[str | None, Header()]
+
+
+def make_etag(scope: str | UUID, version: int) -> str:
+    """Strong tag for what ``scope`` names (a record or a list) at ``version``.
+
+    The scope is part of the tag because one URL can serve different
+    representations: ``/users/me`` or an owner's ``/items/``.
+    """
+    name = scope.hex if isinstance(scope, UUID) else scope
+    return f'"{crud.versions.epoch}-{name}-{version}"'
+
+
+def etag_matches(header: str | None, etag: str, *, weak: bool = True) -> bool:
+    """Whether a conditional header names ``etag``; ``weak=False`` is the
+    strong comparison ``If-Match`` calls for."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if weak:
+            tag = tag.removeprefix("W/")
+        if tag == etag:
+            return True
+    return False
+
+
+def with_etag[R: Response](response: R, etag: str) -> R:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+    return response
+
+
+def not_modified(etag: str) -> Response:
+    return with_etag(Response(status_code=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="The resource has changed since it was read",
+    )
+
+
+def expected_version(if_match: str | None, record_id: UUID, version: int) -> int | None:
+    """Version a conditional update must still find, or ``None`` when the
+    request has no ``If-Match``. Raises 412 if it names another tag."""
+    if if_match is None:
+        return None
+    if not etag_matches(if_match, make_etag(record_id, version), weak=False):
+        raise precondition_failed()
+    return version
@@ -0,0 +1,74 @@
+import base64
+import struct
+from datetime import UTC, datetime
+from typing import Annotated, NamedTuple
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Query, status
+
+from app.crud.backends.base import from_micros, to_micros
+from app.crud.indexes import CreationKey
+
+# Microseconds since the epoch followed by the 16 raw UUID bytes.
+_CURSOR_STRUCT = struct.Struct(">q16s")
+
+
+def encode_cursor(key: CreationKey) -> str:
+    created_at, record_id = key
+    raw = _CURSOR_STRUCT.pack(to_micros(created_at), record_id.bytes)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> CreationKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        micros, id_bytes = _CURSOR_STRUCT.unpack(raw)
+        return from_micros(micros), UUID(bytes=id_bytes)
+    except (ValueError, struct.error, OverflowError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from None
+
+
+def next_cursor(page: list, limit: int) -> str | None:
+    """Cursor for the page after ``page``, or ``None`` when it was the last one."""
+    if len(page) < limit:
+        return None
+    last = page[-1]
+    return encode_cursor((last.created_at, last.id))
+
+
+def get_after_key(
+    after: Annotated[str | None, Query(description="Opaque cursor")] = None,
+) -> CreationKey | None:
+    return None if after is None else decode_cursor(after)
+
+
+AfterKeyDep = Annotated[CreationKey | None, Depends(get_after_key)]
+
+
+class CreatedRange(NamedTuple):
+    since: datetime | None
+    until: datetime | None
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    # Timestamps are stored in UTC; read a naive filter value the same way.
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=UTC)
+
+
+def get_created_range(
+    since: Annotated[
+        datetime | None, Query(description="Only records created at or after this")
+    ] = None,
+    until: Annotated[
+        datetime | None, Query(description="Only records created before this")
+    ] = None,
+) -> CreatedRange:
+    return CreatedRange(_as_utc(since), _as_utc(until))
+
+
+CreatedRangeDep = Annotated[CreatedRange, Depends(get_created_range)]
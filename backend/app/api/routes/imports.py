@@ -0,0 +1,90 @@
+from functools import partial
+from typing import Annotated
+from uuid import UUID
+
+import anyio.to_thread
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app import crud
+from app.api.deps import CurrentSuperuser
+from app.crud.imports import ImportFormat
+from app.models import ImportProgress
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+_FORMATS: dict[str, ImportFormat] = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "ndjson",
+    "text/csv": "csv",
+}
+
+ImportId = Annotated[
+    str | None,
+    Query(max_length=200, description="Client-chosen id to look progress up by"),
+]
+Skip = Annotated[
+    int, Query(ge=0, description="Records to skip, e.g. a previous `committed`")
+]
+
+
+def _format(request: Request) -> ImportFormat:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = _FORMATS.get(content_type.lower())
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send NDJSON (application/x-ndjson) or CSV (text/csv)",
+        )
+    return fmt
+
+
+@router.post("/items")
+async def import_items(
+    request: Request,
+    current_superuser: CurrentSuperuser,
+    import_id: ImportId = None,
+    skip: Skip = 0,
+    owner_id: Annotated[
+        UUID | None, Query(description="Owner of rows that name none")
+    ] = None,
+) -> ImportProgress:
+    fmt = _format(request)
+    if owner_id is None:
+        owner_id = current_superuser.id
+    elif not await anyio.to_thread.run_sync(partial(crud.get_user, user_id=owner_id)):
+        raise HTTPException(status_code=404, detail="Owner not found")
+
+    return await crud.import_items(
+        request.stream(),
+        fmt=fmt,
+        owner_id=owner_id,
+        skip=skip,
+        import_id=import_id,
+    )
+
+
+@router.post("/users")
+async def import_users(
+    request: Request,
+    current_superuser: CurrentSuperuser,
+    import_id: ImportId = None,
+    skip: Skip = 0,
+) -> ImportProgress:
+    _ = current_superuser  # auth gate only
+
+    return await crud.import_users(
+        request.stream(), fmt=_format(request), skip=skip, import_id=import_id
+    )
+
+
+@router.get("/{import_id}")
+def read_import_progress(
+    current_superuser: CurrentSuperuser, import_id: str
+) -> ImportProgress:
+    _ = current_superuser  # auth gate only
+
+    progress = crud.get_import_progress(import_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return progress
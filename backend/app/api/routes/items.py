@@ -1,39 +1,165 @@
 # backend/app/api/routes/items.py
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Body, HTTPException, Path, Query, status
+from fastapi import APIRouter, Body, HTTPException, Path, Query, Response, status
+from pydantic import TypeAdapter, ValidationError
 
 from app import crud
-from app.api.deps import CurrentUser
+from app.api.deps import CurrentSuperuser, CurrentUser
+from app.api.etags import (
+    IfMatch,
+    IfNoneMatch,
+    etag_matches,
+    expected_version,
+    make_etag,
+    not_modified,
+    precondition_failed,
+    with_etag,
+)
+from app.api.pagination import AfterKeyDep, CreatedRangeDep, next_cursor
+from app.api.serialization import (
+    JSONBytesResponse,
+    NDJSONResponse,
+    item_response,
+    items_ndjson,
+    items_page_response,
+)
+from app.core.config import settings
+from app.core.response_cache import response_cache
 from app.models import (
+    BulkItemsResult,
+    BulkItemStatus,
+    Item,
+    ItemBulkUpdate,
     ItemCreate,
+    ItemOrder,
     ItemPublic,
     ItemsPublic,
     ItemUpdate,
     Message,
+    User,
 )
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+# Bulk bodies are parsed as plain JSON and validated here in one adapter call,
+# so a bad element is reported in its own status instead of failing the batch.
+BulkBody = Annotated[list[Any], Body(max_length=settings.BULK_MAX_ITEMS)]
+_ITEM_CREATES = TypeAdapter(list[ItemCreate])
+_ITEM_UPDATES = TypeAdapter(list[ItemBulkUpdate])
+_ITEM_IDS = TypeAdapter(list[UUID])
+
+
+def _validate_batch[T](
+    adapter: TypeAdapter[list[T]], body: list[Any]
+) -> tuple[list[tuple[int, T]], list[BulkItemStatus]]:
+    """Return the valid elements with their indexes, and a 422 for the rest."""
+    try:
+        return list(enumerate(adapter.validate_python(body))), []
+    except ValidationError as exc:
+        details: dict[int, str] = {}
+        for error in exc.errors():
+            index, *field = error["loc"]
+            prefix = ".".join(map(str, field))
+            details.setdefault(
+                index, f"{prefix}: {error['msg']}" if prefix else error["msg"]
+            )
+
+    failed = [
+        BulkItemStatus(index=index, status=422, detail=detail)
+        for index, detail in details.items()
+    ]
+    indexes = [index for index in range(len(body)) if index not in details]
+    values = adapter.validate_python([body[index] for index in indexes])
+    return list(zip(indexes, values, strict=True)), failed
 
-@router.get("/")
+
+def _writable_items(
+    current_user: User, ids: list[tuple[int, UUID]]
+) -> tuple[list[tuple[int, Item]], list[BulkItemStatus]]:
+    """Look up items the caller may change; the rest get the single-item status."""
+    items: list[tuple[int, Item]] = []
+    failed: list[BulkItemStatus] = []
+    seen: set[UUID] = set()
+    for index, item_id in ids:
+        if item_id in seen:
+            failed.append(
+                BulkItemStatus(
+                    index=index,
+                    status=status.HTTP_409_CONFLICT,
+                    id=item_id,
+                    detail="Duplicate item id in batch",
+                )
+            )
+            continue
+        seen.add(item_id)
+        item = crud.get_item(item_id=item_id)
+        if not item:
+            failed.append(
+                BulkItemStatus(
+                    index=index,
+                    status=status.HTTP_404_NOT_FOUND,
+                    id=item_id,
+                    detail="Item not found",
+                )
+            )
+        elif not current_user.is_superuser and item.owner_id != current_user.id:
+            failed.append(
+                BulkItemStatus(
+                    index=index,
+                    status=status.HTTP_403_FORBIDDEN,
+                    id=item_id,
+                    detail="Not enough permissions",
+                )
+            )
+        else:
+            items.append((index, item))
+    return items, failed
+
+
+def _bulk_result(statuses: list[BulkItemStatus]) -> BulkItemsResult:
+    statuses.sort(key=lambda result: result.index)
+    failed = sum(result.status >= 400 for result in statuses)
+    return BulkItemsResult(
+        results=statuses, succeeded=len(statuses) - failed, failed=failed
+    )
+
+
+@router.get("/", response_model=ItemsPublic)
 def read_items(
     current_user: CurrentUser,
+    after: AfterKeyDep,
+    created: CreatedRangeDep,
+    if_none_match: IfNoneMatch = None,
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
-) -> ItemsPublic:
-    if current_user.is_superuser:
-        items, count = crud.get_items(skip=skip, limit=limit)
-    else:
-        items, count = crud.get_items_by_owner(
-            owner_id=current_user.id, skip=skip, limit=limit
-        )
+    order_by: ItemOrder = "-created_at",
+) -> Response:
+    owner_id = None if current_user.is_superuser else current_user.id
+    etag = make_etag(owner_id or "items", crud.get_items_generation(owner_id=owner_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
 
-    return ItemsPublic(
-        data=[ItemPublic.model_validate(item) for item in items],
-        count=count,
-    )
+    page = {
+        "skip": skip,
+        "limit": limit,
+        "after": after,
+        "since": created.since,
+        "until": created.until,
+        "order_by": order_by,
+    }
+
+    def build() -> bytes:
+        if owner_id is None:
+            items, count = crud.get_items(**page)
+        else:
+            items, count = crud.get_items_by_owner(owner_id=owner_id, **page)
+        return items_page_response(items, count, next_cursor(items, limit)).body
+
+    key = ("items", owner_id, *page.values())
+    body = response_cache.get_or_build(key, etag, build)
+    return with_etag(JSONBytesResponse(body), etag)
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -45,11 +171,81 @@ def create_item(
     return ItemPublic.model_validate(item)
 
 
-@router.get("/{item_id}")
+@router.post("/bulk")
+def create_items_bulk(current_user: CurrentUser, body: BulkBody) -> BulkItemsResult:
+    valid, statuses = _validate_batch(_ITEM_CREATES, body)
+    items = crud.create_items(
+        items_in=[item_in for _, item_in in valid], owner_id=current_user.id
+    )
+    statuses += [
+        BulkItemStatus(index=index, status=status.HTTP_201_CREATED, id=item.id)
+        for (index, _), item in zip(valid, items, strict=True)
+    ]
+    return _bulk_result(statuses)
+
+
+@router.patch("/bulk")
+def update_items_bulk(current_user: CurrentUser, body: BulkBody) -> BulkItemsResult:
+    valid, statuses = _validate_batch(_ITEM_UPDATES, body)
+    updates = {index: item_in for index, item_in in valid}
+    items, failed = _writable_items(
+        current_user, [(index, item_in.id) for index, item_in in valid]
+    )
+    crud.update_items(updates=[(item, updates[index]) for index, item in items])
+    statuses += failed
+    statuses += [
+        BulkItemStatus(index=index, status=status.HTTP_200_OK, id=item.id)
+        for index, item in items
+    ]
+    return _bulk_result(statuses)
+
+
+@router.post("/bulk-delete")
+def delete_items_bulk(current_user: CurrentUser, body: BulkBody) -> BulkItemsResult:
+    valid, statuses = _validate_batch(_ITEM_IDS, body)
+    items, failed = _writable_items(current_user, valid)
+    crud.delete_items(items=[item for _, item in items])
+    statuses += failed
+    statuses += [
+        BulkItemStatus(index=index, status=status.HTTP_200_OK, id=item.id)
+        for index, item in items
+    ]
+    return _bulk_result(statuses)
+
+
+@router.get("/export", response_class=NDJSONResponse)
+def export_items(
+    current_superuser: CurrentSuperuser,
+    created: CreatedRangeDep,
+    owner_id: UUID | None = None,
+) -> NDJSONResponse:
+    _ = current_superuser  # auth gate only
+
+    items = crud.export_items(
+        owner_id=owner_id, since=created.since, until=created.until
+    )
+    return NDJSONResponse(items_ndjson(items))
+
+
+@router.get("/search", response_model=ItemsPublic)
+def search_items(
+    current_user: CurrentUser,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> Response:
+    owner_id = None if current_user.is_superuser else current_user.id
+    items, count = crud.search_items(query=q, owner_id=owner_id, skip=skip, limit=limit)
+    return items_page_response(items, count, None)
+
+
+@router.get("/{item_id}", response_model=ItemPublic)
 def read_item(
     current_user: CurrentUser,
     item_id: Annotated[UUID, Path()],
-) -> ItemPublic:
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    etag = make_etag(item_id, crud.get_item_version(item_id=item_id))
     item = crud.get_item(item_id=item_id)
     if not item:
         raise HTTPException(
@@ -62,7 +258,9 @@ def read_item(
             detail="Not enough permissions",
         )
 
-    return ItemPublic.model_validate(item)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(item_response(item), etag)
 
 
 @router.patch("/{item_id}")
@@ -70,7 +268,9 @@ def update_item(
     current_user: CurrentUser,
     item_id: Annotated[UUID, Path()],
     item_in: Annotated[ItemUpdate, Body()],
+    if_match: IfMatch = None,
 ) -> ItemPublic:
+    version = crud.get_item_version(item_id=item_id)
     item = crud.get_item(item_id=item_id)
     if not item:
         raise HTTPException(
@@ -83,7 +283,14 @@ def update_item(
             detail="Not enough permissions",
         )
 
-    item = crud.update_item(item=item, item_in=item_in)
+    try:
+        item = crud.update_item(
+            item=item,
+            item_in=item_in,
+            expected_version=expected_version(if_match, item_id, version),
+        )
+    except crud.VersionConflict:
+        raise precondition_failed() from None
     return ItemPublic.model_validate(item)
 
 
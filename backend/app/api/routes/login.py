@@ -1,12 +1,15 @@
 from datetime import timedelta
+from functools import partial
 from typing import Annotated
 
+import anyio.to_thread
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app import crud
 from app.api.deps import CurrentUser
 from app.core.config import settings
+from app.core.hashing import verify_password
 from app.core.security import create_access_token
 from app.models import Token, UserPublic
 
@@ -14,11 +17,16 @@ router = APIRouter(prefix="/login", tags=["login"])
 
 
 @router.post("/access-token")
-def login_access_token(
+async def login_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
-    user = crud.authenticate(email=form_data.username, password=form_data.password)
-    if not user:
+    # Same checks as crud.authenticate, but Argon2 runs in the hashing pool
+    # so a burst of logins cannot tie up the request threadpool. The lookup
+    # may hit SQLite, so it runs on the threadpool, off the event loop.
+    user = await anyio.to_thread.run_sync(
+        partial(crud.get_user_by_email, email=form_data.username)
+    )
+    if not user or not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password",
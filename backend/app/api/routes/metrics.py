@@ -0,0 +1,64 @@
+import secrets
+from functools import partial
+from typing import Annotated
+
+import anyio.to_thread
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from app import crud
+from app.core import metrics
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.core.token_cache import token_cache
+
+router = APIRouter(tags=["metrics"])
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Read on the event loop when scraped: the default limiter belongs to it.
+# Every other gauge renders on the threadpool, as reading the store blocks.
+def _threadpool_busy() -> float:
+    return anyio.to_thread.current_default_thread_limiter().borrowed_tokens
+
+
+def _threadpool_size() -> float:
+    return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+
+_THREADPOOL_GAUGES = (
+    metrics.CallbackGauge(
+        "threadpool_busy_threads",
+        "Threads of the sync-route threadpool running a job.",
+        _threadpool_busy,
+    ),
+    metrics.CallbackGauge(
+        "threadpool_threads", "Size of the sync-route threadpool.", _threadpool_size
+    ),
+)
+metrics.CallbackGauge("store_users", "Users in the store.", crud.count_users)
+metrics.CallbackGauge("store_items", "Items in the store.", crud.count_items)
+metrics.CallbackGauge(
+    "token_cache_entries", "Verified access tokens cached.", lambda: len(token_cache)
+)
+metrics.CallbackGauge(
+    "response_cache_bytes",
+    "Bytes held by the list-page response cache.",
+    lambda: response_cache.stats().bytes,
+)
+
+
+@router.get("/metrics", response_class=Response)
+async def read_metrics(
+    authorization: Annotated[str | None, Header()] = None,
+) -> Response:
+    # async, so the threadpool gauges see the pool without sitting in it.
+    if settings.METRICS_TOKEN is not None and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    threadpool = "".join(gauge.render() for gauge in _THREADPOOL_GAUGES)
+    rest = await anyio.to_thread.run_sync(
+        partial(metrics.render, exclude=_THREADPOOL_GAUGES)
+    )
+    return Response(threadpool + rest, media_type=_CONTENT_TYPE)
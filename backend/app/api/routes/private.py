@@ -28,8 +28,8 @@ def mock_summary() -> dict:
 
     return {
         "environment": settings.ENVIRONMENT,
-        "users_count": len(users),
-        "items_count": len(items),
+        "users_count": crud.count_users(),
+        "items_count": crud.count_items(),
         "users": [
             {
                 "id": str(u.id),
@@ -1,15 +1,38 @@
+from functools import partial
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Body, HTTPException, Path, Query, status
+import anyio.to_thread
+from fastapi import APIRouter, Body, HTTPException, Path, Query, Response, status
 
 from app import crud
 from app.api.deps import CurrentSuperuser, CurrentUser
-from app.core.security import verify_password
+from app.api.etags import (
+    IfMatch,
+    IfNoneMatch,
+    etag_matches,
+    expected_version,
+    make_etag,
+    not_modified,
+    precondition_failed,
+    with_etag,
+)
+from app.api.pagination import AfterKeyDep, CreatedRangeDep, next_cursor
+from app.api.serialization import (
+    JSONBytesResponse,
+    NDJSONResponse,
+    user_response,
+    users_ndjson,
+    users_page_response,
+)
+from app.core.hashing import hash_password, verify_password
+from app.core.response_cache import response_cache
 from app.models import (
     Message,
     UpdatePassword,
+    User,
     UserCreate,
+    UserOrder,
     UserPublic,
     UsersPublic,
     UserUpdate,
@@ -19,19 +42,38 @@ from app.models import (
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+def _email_taken() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A user with this email already exists",
+    )
+
+
 # ---------------- Current user endpoints ----------------
 
 
-@router.get("/me")
-def read_user_me(current_user: CurrentUser) -> UserPublic:
-    return UserPublic.model_validate(current_user)
+@router.get("/me", response_model=UserPublic)
+def read_user_me(
+    current_user: CurrentUser, if_none_match: IfNoneMatch = None
+) -> Response:
+    etag = make_etag(current_user.id, crud.get_user_version(user_id=current_user.id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    # Re-read: the dependency loaded the user before the tag was taken.
+    user = crud.get_user(user_id=current_user.id) or current_user
+    return with_etag(user_response(user), etag)
 
 
 @router.patch("/me")
 def update_user_me(
     current_user: CurrentUser,
     user_in: Annotated[UserUpdateMe, Body()],
+    if_match: IfMatch = None,
 ) -> UserPublic:
+    version = crud.get_user_version(user_id=current_user.id)
+    expected = expected_version(if_match, current_user.id, version)
+    if expected is not None:
+        current_user = crud.get_user(user_id=current_user.id) or current_user
     if user_in.email and user_in.email.lower() != current_user.email.lower():
         existing = crud.get_user_by_email(email=user_in.email)
         if existing:
@@ -40,16 +82,26 @@ def update_user_me(
                 detail="Email already exists",
             )
 
-    user = crud.update_user_me(user=current_user, user_update=user_in)
+    try:
+        user = crud.update_user_me(
+            user=current_user, user_update=user_in, expected_version=expected
+        )
+    except crud.VersionConflict:
+        raise precondition_failed() from None
+    except crud.EmailAlreadyExists:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already exists",
+        ) from None
     return UserPublic.model_validate(user)
 
 
 @router.patch("/me/password")
-def update_password_me(
+async def update_password_me(
     current_user: CurrentUser,
     body: Annotated[UpdatePassword, Body()],
 ) -> Message:
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password(body.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password",
@@ -61,53 +113,118 @@ def update_password_me(
             detail="New password cannot be the same as the current password",
         )
 
-    crud.update_user_password(user=current_user, new_password=body.new_password)
+    hashed_password = await hash_password(body.new_password)
+    await anyio.to_thread.run_sync(
+        partial(
+            crud.update_user_password,
+            user=current_user,
+            new_password=body.new_password,
+            hashed_password=hashed_password,
+        )
+    )
     return Message(message="Password updated successfully")
 
 
 # ---------------- Superuser endpoints ----------------
 
 
-@router.get("/")
+@router.get("/", response_model=UsersPublic)
 def read_users(
     current_superuser: CurrentSuperuser,
+    after: AfterKeyDep,
+    created: CreatedRangeDep,
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
-) -> UsersPublic:
+    is_active: bool | None = None,
+    is_superuser: bool | None = None,
+    email_prefix: Annotated[str | None, Query(min_length=1, max_length=255)] = None,
+    order_by: UserOrder = "-created_at",
+    if_none_match: IfNoneMatch = None,
+) -> Response:
     _ = current_superuser  # auth gate only
 
-    users, count = crud.get_users(skip=skip, limit=limit)
-    return UsersPublic(
-        data=[UserPublic.model_validate(u) for u in users],
-        count=count,
-    )
+    by_email = order_by.endswith("email")
+    if by_email and after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursors are only supported when ordering by created_at",
+        )
+    etag = make_etag("users", crud.get_users_generation())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    query = {
+        "skip": skip,
+        "limit": limit,
+        "after": after,
+        "is_active": is_active,
+        "is_superuser": is_superuser,
+        "email_prefix": email_prefix,
+        "since": created.since,
+        "until": created.until,
+        "order_by": order_by,
+    }
+
+    def build() -> bytes:
+        users, count = crud.get_users(**query)
+        cursor = None if by_email else next_cursor(users, limit)
+        return users_page_response(users, count, cursor).body
+
+    key = ("users", *query.values())
+    body = response_cache.get_or_build(key, etag, build)
+    return with_etag(JSONBytesResponse(body), etag)
+
+
+# The routes that hash are async so they can await the hashing pool; their
+# crud calls (store I/O, the versions lock) go to the threadpool through
+# these sync helpers, as a sync route's body would.
+
+
+def _store_new_user(user_in: UserCreate, hashed_password: str) -> User:
+    # The route's lookup is only a fast path: another request may have taken
+    # the email while the password was hashed, and the store refuses it.
+    try:
+        return crud.create_user(user_create=user_in, hashed_password=hashed_password)
+    except crud.EmailAlreadyExists:
+        raise _email_taken() from None
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     current_superuser: CurrentSuperuser,
     user_in: Annotated[UserCreate, Body()],
 ) -> UserPublic:
     _ = current_superuser
 
-    existing = crud.get_user_by_email(email=user_in.email)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="A user with this email already exists",
-        )
+    # Checked before hashing, so a taken email costs no Argon2 run.
+    if await anyio.to_thread.run_sync(
+        partial(crud.get_user_by_email, email=user_in.email)
+    ):
+        raise _email_taken()
 
-    user = crud.create_user(user_create=user_in)
+    hashed_password = await hash_password(user_in.password)
+    user = await anyio.to_thread.run_sync(_store_new_user, user_in, hashed_password)
     return UserPublic.model_validate(user)
 
 
-@router.get("/{user_id}")
+@router.get("/export", response_class=NDJSONResponse)
+def export_users(
+    current_superuser: CurrentSuperuser, created: CreatedRangeDep
+) -> NDJSONResponse:
+    _ = current_superuser  # auth gate only
+
+    users = crud.export_users(since=created.since, until=created.until)
+    return NDJSONResponse(users_ndjson(users))
+
+
+@router.get("/{user_id}", response_model=UserPublic)
 def read_user_by_id(
     current_superuser: CurrentSuperuser,
     user_id: Annotated[UUID, Path()],
-) -> UserPublic:
+    if_none_match: IfNoneMatch = None,
+) -> Response:
     _ = current_superuser
 
+    etag = make_etag(user_id, crud.get_user_version(user_id=user_id))
     user = crud.get_user(user_id=user_id)
     if not user:
         raise HTTPException(
@@ -115,33 +232,68 @@ def read_user_by_id(
             detail="User not found",
         )
 
-    return UserPublic.model_validate(user)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(user_response(user), etag)
 
 
-@router.patch("/{user_id}")
-def update_user(
-    current_superuser: CurrentSuperuser,
-    user_id: Annotated[UUID, Path()],
-    user_in: Annotated[UserUpdate, Body()],
-) -> UserPublic:
-    _ = current_superuser
-
+def _user_to_update(
+    user_id: UUID, user_in: UserUpdate, if_match: str | None
+) -> tuple[User, int | None]:
+    """The user an update applies to and the version it must still be at."""
+    version = crud.get_user_version(user_id=user_id)
     user = crud.get_user(user_id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    expected = expected_version(if_match, user_id, version)
 
     if user_in.email and user_in.email.lower() != user.email.lower():
         existing = crud.get_user_by_email(email=user_in.email)
         if existing and existing.id != user.id:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="A user with this email already exists",
-            )
+            raise _email_taken()
+    return user, expected
+
+
+def _store_update(
+    user: User,
+    user_in: UserUpdate,
+    hashed_password: str | None,
+    expected: int | None,
+) -> User:
+    try:
+        return crud.update_user(
+            user=user,
+            user_update=user_in,
+            hashed_password=hashed_password,
+            expected_version=expected,
+        )
+    except crud.VersionConflict:
+        raise precondition_failed() from None
+    except crud.EmailAlreadyExists:
+        raise _email_taken() from None
 
-    user = crud.update_user(user=user, user_update=user_in)
+
+@router.patch("/{user_id}")
+async def update_user(
+    current_superuser: CurrentSuperuser,
+    user_id: Annotated[UUID, Path()],
+    user_in: Annotated[UserUpdate, Body()],
+    if_match: IfMatch = None,
+) -> UserPublic:
+    _ = current_superuser
+
+    user, expected = await anyio.to_thread.run_sync(
+        _user_to_update, user_id, user_in, if_match
+    )
+    hashed_password = (
+        await hash_password(user_in.password) if user_in.password else None
+    )
+    user = await anyio.to_thread.run_sync(
+        _store_update, user, user_in, hashed_password, expected
+    )
     return UserPublic.model_validate(user)
 
 
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, HTTPException, status
 
 from app import crud
-from app.api.deps import CurrentUser
+from app.api.deps import CurrentSuperuser, CurrentUser
 from app.core.config import settings
+from app.core.hashing import hasher_pool
+from app.core.response_cache import response_cache
+from app.models import HashingStats, ResponseCacheStats, StatsPublic
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
@@ -17,11 +20,37 @@ def debug_seed() -> dict[str, int]:
     if not settings.is_local:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
     return {
-        "users": len(crud.list_all_users()),
-        "items": len(crud.list_all_items()),
+        "users": crud.count_users(),
+        "items": crud.count_items(),
     }
 
 
+@router.get("/stats")
+def read_stats(current_user: CurrentUser) -> StatsPublic:
+    own_items = crud.count_items(owner_id=current_user.id)
+    if not current_user.is_superuser:
+        return StatsPublic(items=own_items, own_items=own_items)
+    return StatsPublic(
+        items=crud.count_items(),
+        own_items=own_items,
+        users=crud.get_user_stats(),
+    )
+
+
+@router.get("/hashing-stats")
+def read_hashing_stats(current_superuser: CurrentSuperuser) -> HashingStats:
+    _ = current_superuser  # auth gate only
+    return hasher_pool.stats()
+
+
+@router.get("/response-cache-stats")
+def read_response_cache_stats(
+    current_superuser: CurrentSuperuser,
+) -> ResponseCacheStats:
+    _ = current_superuser  # auth gate only
+    return response_cache.stats()
+
+
 @router.get("/whoami")
 def who_am_i(current_user: CurrentUser) -> dict[str, str]:
     return {"email": current_user.email}
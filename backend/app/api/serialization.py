@@ -0,0 +1,95 @@
+"""Single-pass JSON encoding for record, list and export endpoints.
+
+Stored records were validated when they were written, so read routes skip
+the ``*Public.model_validate`` per row and FastAPI's second validation of
+the response model, and encode straight to JSON bytes. Exports stream the
+same encoding as NDJSON, one record per line.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from itertools import batched
+from typing import TypedDict
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from app.models import Item, User
+
+
+class JSONBytesResponse(Response):
+    """A response whose body is already-encoded JSON."""
+
+    media_type = "application/json"
+
+
+class NDJSONResponse(StreamingResponse):
+    """Newline-delimited JSON, sent with chunked transfer encoding."""
+
+    media_type = "application/x-ndjson"
+
+
+class _ItemsPage(TypedDict):
+    data: list[Item]
+    count: int
+    next_cursor: str | None
+
+
+class _UsersPage(TypedDict):
+    data: list[User]
+    count: int
+    next_cursor: str | None
+
+
+_items_page = TypeAdapter(_ItemsPage)
+_users_page = TypeAdapter(_UsersPage)
+# The only stored user field that ``UserPublic`` leaves out.
+_USERS_EXCLUDE = {"data": {"__all__": {"hashed_password"}}}
+
+_item = TypeAdapter(Item)
+_user = TypeAdapter(User)
+# Records per chunk written to the socket: large enough that per-chunk
+# overhead (a threadpool hop and a send) is amortized, small enough that
+# memory stays flat.
+_NDJSON_CHUNK = 500
+
+
+def item_response(item: Item) -> JSONBytesResponse:
+    return JSONBytesResponse(_item.dump_json(item))
+
+
+def user_response(user: User) -> JSONBytesResponse:
+    return JSONBytesResponse(_encode_user(user))
+
+
+def items_page_response(
+    items: list[Item], count: int, next_cursor: str | None
+) -> JSONBytesResponse:
+    page = _ItemsPage(data=items, count=count, next_cursor=next_cursor)
+    return JSONBytesResponse(_items_page.dump_json(page))
+
+
+def users_page_response(
+    users: list[User], count: int, next_cursor: str | None
+) -> JSONBytesResponse:
+    page = _UsersPage(data=users, count=count, next_cursor=next_cursor)
+    return JSONBytesResponse(_users_page.dump_json(page, exclude=_USERS_EXCLUDE))
+
+
+def _ndjson_chunks[T](
+    records: Iterable[T], encode: Callable[[T], bytes]
+) -> Iterator[bytes]:
+    for chunk in batched(records, _NDJSON_CHUNK):
+        yield b"\n".join(map(encode, chunk)) + b"\n"
+
+
+def _encode_user(user: User) -> bytes:
+    return _user.dump_json(user, exclude={"hashed_password"})
+
+
+def items_ndjson(items: Iterable[Item]) -> Iterator[bytes]:
+    return _ndjson_chunks(items, _item.dump_json)
+
+
+def users_ndjson(users: Iterable[User]) -> Iterator[bytes]:
+    return _ndjson_chunks(users, _encode_user)
@@ -0,0 +1,84 @@
+"""Command-line imports into the configured store.
+
+Run from ``backend/``::
+
+    uv run python -m app.cli import items items.ndjson --owner admin@example.com
+    uv run python -m app.cli import users users.csv --resume
+
+The file is read in blocks and imported in the same chunks as the
+``/import`` endpoints. After every chunk the number of settled records is
+written to ``<file>.progress``; ``--resume`` picks up from there.
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app import crud
+from app.core.hashing import hasher_pool
+from app.crud.backends import get_storage
+from app.crud.imports import ImportFormat
+from app.models import ImportProgress
+
+_BLOCK_SIZE = 1 << 16
+
+
+async def _blocks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while block := f.read(_BLOCK_SIZE):
+            yield block
+
+
+def _checkpoint(path: Path) -> Path:
+    return path.with_name(path.name + ".progress")
+
+
+async def _import(args: argparse.Namespace) -> ImportProgress:
+    path = Path(args.file)
+    fmt: ImportFormat = args.format or ("csv" if path.suffix == ".csv" else "ndjson")
+    checkpoint = _checkpoint(path)
+    skip = int(checkpoint.read_text()) if args.resume and checkpoint.exists() else 0
+
+    def save(progress: ImportProgress) -> None:
+        checkpoint.write_text(str(progress.committed))
+        if not progress.done:
+            print(f"committed {progress.committed:,}", file=sys.stderr)
+
+    if args.kind == "users":
+        return await crud.import_users(
+            _blocks(path), fmt=fmt, skip=skip, on_commit=save
+        )
+    owner = crud.get_user_by_email(email=args.owner) if args.owner else None
+    if owner is None:
+        raise SystemExit("--owner must name an existing user for an items import")
+    return await crud.import_items(
+        _blocks(path), fmt=fmt, owner_id=owner.id, skip=skip, on_commit=save
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="import NDJSON or CSV records")
+    importer.add_argument("kind", choices=["items", "users"])
+    importer.add_argument("file")
+    importer.add_argument("--format", choices=["ndjson", "csv"])
+    importer.add_argument("--owner", help="email of the owner of items")
+    importer.add_argument(
+        "--resume", action="store_true", help="skip records already committed"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        progress = asyncio.run(_import(args))
+    finally:
+        hasher_pool.shutdown()
+        get_storage().close()
+    _checkpoint(Path(args.file)).unlink(missing_ok=True)
+    print(progress.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
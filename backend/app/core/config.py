@@ -27,6 +27,41 @@ class Settings(BaseSettings):
     # Auth settings
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60  # 1 hour
+    TOKEN_CACHE_SIZE: int = 10_000  # verified tokens kept by get_current_user
+    # Encoded list pages kept by the list routes (0 disables)
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 2**20
+
+    # Storage settings
+    STORAGE_BACKEND: Literal["memory", "columnar", "sqlite"] = "memory"
+    SQLITE_PATH: str = "app.db"
+    # Durability for the memory backend: log + snapshots under this directory
+    MEMORY_DATA_DIR: str | None = None
+    MEMORY_SNAPSHOT_EVERY: int = 100_000
+
+    # Most operations accepted by one /items/bulk request
+    BULK_MAX_ITEMS: int = 1000
+    # Records validated and committed together by a streaming import
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 100
+
+    # Password hashing pool (0 workers = hash on a thread in-process)
+    HASHING_WORKERS: int = 2
+    HASHING_QUEUE_LIMIT: int = 64
+
+    # Bearer token /metrics asks for (unset: open, keep it off public ingress)
+    METRICS_TOKEN: str | None = None
+
+    # Logging: "json" writes JSON lines from a background thread
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # JSON mode: share of 2xx/3xx access lines kept (errors always are)
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    # JSON mode: copies of one message per second before the rest are dropped
+    LOG_REPEAT_LIMIT: int = 0
+
+    # Request profiling, local/staging only: traces are written here
+    PROFILING_DIR: str | None = None
+    # Share of requests profiled unasked (X-Profile: 1 always is)
+    PROFILING_SAMPLE_RATE: float = 0.0
 
     FRONTEND_HOST: str = "http://localhost:5173"
     BACKEND_CORS_ORIGINS: Annotated[
@@ -68,6 +103,9 @@ class Settings(BaseSettings):
                 "Use a long random value (recommended >= 32 bytes)."
             )
 
+        if self.ENVIRONMENT == "production" and self.PROFILING_DIR:
+            raise ValueError("PROFILING_DIR cannot be set in production.")
+
         return self
 
 
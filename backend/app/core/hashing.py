@@ -0,0 +1,181 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+
+import anyio
+
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import HASHING_JOB_DURATION
+from app.models import HashingStats
+
+# How long a batch job sleeps before retrying for a free queue slot.
+_BATCH_RETRY_INTERVAL = 0.01
+
+
+class HashingQueueFull(Exception):
+    """Raised when the hashing pool already holds its maximum of pending jobs."""
+
+
+# Jobs go through app.core.security so that in-process runs (workers=0) are
+# timed there too; in worker processes those timings stay in the worker.
+def _hash(password: str) -> str:
+    return security.get_password_hash(password)
+
+
+def _hash_many(passwords: list[str]) -> list[str]:
+    return [security.get_password_hash(password) for password in passwords]
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return security.verify_password(password, hashed_password)
+
+
+class PasswordHasherPool:
+    """Bounded executor for Argon2 hashing and verification.
+
+    Argon2 is CPU-bound and holds the GIL, so running it on the request
+    threadpool starves unrelated routes during a burst of logins. Jobs run in
+    a dedicated process pool instead; once ``queue_limit`` jobs are pending,
+    new ones fail fast with ``HashingQueueFull`` rather than queueing
+    unboundedly. With ``workers=0`` jobs run on a worker thread in-process.
+    """
+
+    def __init__(self, *, workers: int, queue_limit: int) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a multi-threaded server process is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken pool; the next job starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire(self, *, wait: bool = False) -> float | None:
+        """Take a queue slot; ``None`` means it is full and ``wait`` was set."""
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                if wait:
+                    return None
+                self._rejected += 1
+                raise HashingQueueFull
+            self._pending += 1
+        return time.perf_counter()
+
+    def _release(self, started: float, op: str) -> None:
+        elapsed = time.perf_counter() - started
+        HASHING_JOB_DURATION.observe(elapsed, op)
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+
+    async def _run[R](
+        self, fn: Callable[..., R], *args, wait: bool = False, retry: bool = True
+    ) -> R:
+        op = fn.__name__.lstrip("_")
+        while (started := self._acquire(wait=wait)) is None:
+            await anyio.sleep(_BATCH_RETRY_INTERVAL)
+        if self.workers == 0:
+            try:
+                return await anyio.to_thread.run_sync(fn, *args)
+            finally:
+                self._release(started, op)
+
+        executor = self._get_executor()
+        try:
+            try:
+                future: Future[R] = executor.submit(fn, *args)
+            except BaseException:
+                self._release(started, op)
+                raise
+            future.add_done_callback(lambda _: self._release(started, op))
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory) and took the pool with it;
+            # every later job would fail too. Start a new pool and give this
+            # job one more try there.
+            self._discard(executor)
+            if not retry:
+                raise
+        return await self._run(fn, *args, wait=wait, retry=False)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """Hash a batch as one job per worker, in order.
+
+        A batch holds at most ``workers`` queue slots and waits for them
+        rather than failing fast, so bulk work leaves room for logins and
+        never gets rejected by their bursts.
+        """
+        parts = max(1, self.workers)
+        size = -(-len(passwords) // parts)
+        jobs = [
+            self._run(_hash_many, passwords[start : start + size], wait=True)
+            for start in range(0, len(passwords), size or 1)
+        ]
+        return list(chain.from_iterable(await asyncio.gather(*jobs)))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, password, hashed_password)
+
+    def stats(self) -> HashingStats:
+        with self._lock:
+            completed = self._completed
+            return HashingStats(
+                workers=self.workers,
+                queue_limit=self.queue_limit,
+                pending=self._pending,
+                completed=completed,
+                rejected=self._rejected,
+                avg_latency_ms=(
+                    self._latency_total / completed * 1000 if completed else 0.0
+                ),
+                max_latency_ms=self._latency_max * 1000,
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+hasher_pool = PasswordHasherPool(
+    workers=settings.HASHING_WORKERS,
+    queue_limit=settings.HASHING_QUEUE_LIMIT,
+)
+
+
+async def hash_password(password: str) -> str:
+    return await hasher_pool.hash(password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await hasher_pool.verify(password, hashed_password)
@@ -1,8 +1,154 @@
+import atexit
+import json
 import logging
+import queue
+import random
+import time
+from contextvars import ContextVar
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Literal
 
+# Set by the request logging middleware for the duration of a request.
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else on one came from ``extra``.
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None)))
+
+_listener: QueueListener | None = None
+
+
+class JSONFormatter(logging.Formatter):
+    """One compact JSON object per record: time, level, logger, message,
+    ``extra`` fields and the traceback if any."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._encoder = json.JSONEncoder(separators=(",", ":"), default=str)
+        self._second = -1
+        self._prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        # Records come in bursts within one second: format its part once.
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._prefix}.{int((created - second) * 1000):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return self._encoder.encode(entry)
+
+
+class _QueueWriter(logging.StreamHandler):
+    """Writes what the listener dequeues, flushing when the queue runs dry
+    rather than after every line."""
+
+    def __init__(self, records: queue.SimpleQueue) -> None:
+        super().__init__()
+        self._records = records
+
+    def flush(self, *, force: bool = False) -> None:
+        if force or self._records.empty():
+            super().flush()
+
+
+class RequestQueueHandler(QueueHandler):
+    """Hands records to the background writer, doing on the caller's thread
+    only what cannot wait: merging the arguments into the message (they
+    may change afterwards), rendering a traceback and reading the request
+    id, which lives in the caller's context. It is the only handler of the
+    loggers it serves, so it updates records in place instead of copying."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if not hasattr(record, "request_id") and (current := request_id.get()):
+            record.request_id = current
+        return record
+
+
+class AccessSampler(logging.Filter):
+    """Keeps ``rate`` of the access records of successful requests; error
+    responses and every other record always pass."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or not getattr(record, "access", False):
+            return True
+        status = getattr(record, "status", None)
+        return status is None or status >= 400 or random.random() < self.rate
+
+
+class RepeatLimiter(logging.Filter):
+    """Drops a message logged more than ``limit`` times in one second.
+
+    The next copy let through carries ``suppressed``, the number dropped
+    since the last one. Access records are left to ``AccessSampler``. Runs
+    on the writer thread alone, so it keeps no lock.
+    """
+
+    def __init__(self, limit: int) -> None:
+        super().__init__()
+        self.limit = limit
+        self._second = 0
+        self._counts: dict[tuple[str, int, str], int] = {}
+        self._suppressed: dict[tuple[str, int, str], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "access", False):
+            return True
+        second = int(record.created)
+        if second != self._second:
+            self._second = second
+            self._counts.clear()
+        key = (record.name, record.levelno, record.getMessage())
+        count = self._counts[key] = self._counts.get(key, 0) + 1
+        if count > self.limit:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return False
+        if suppressed := self._suppressed.pop(key, 0):
+            record.suppressed = suppressed
+        return True
+
+
+def setup_logging(
+    *,
+    log_format: Literal["text", "json"] = "text",
+    access_sample_rate: float = 1.0,
+    repeat_limit: int = 0,
+) -> None:
+    """Configure the app and uvicorn loggers.
+
+    ``text`` writes plain lines to stderr on the thread that logs. ``json``
+    puts records on a queue that a background thread writes out as JSON
+    lines, sampling access records at ``access_sample_rate`` and, with a
+    ``repeat_limit``, dropping repeated messages.
+    """
+    shutdown_logging()
+    if log_format == "json":
+        _setup_json_logging(access_sample_rate, repeat_limit)
+        return
 
-def setup_logging() -> None:
     dictConfig(
         {
             "version": 1,
@@ -59,5 +205,50 @@ def setup_logging() -> None:
     )
 
 
+def _setup_json_logging(access_sample_rate: float, repeat_limit: int) -> None:
+    global _listener
+    shutdown_logging()  # a repeated setup replaces the running writer
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    writer = _QueueWriter(records)
+    writer.setFormatter(JSONFormatter())
+    if repeat_limit > 0:
+        writer.addFilter(RepeatLimiter(repeat_limit))
+    handler = RequestQueueHandler(records)
+    handler.addFilter(AccessSampler(access_sample_rate))
+    _listener = QueueListener(records, writer)
+    _listener.start()
+    # Before logging's own exit hook, so queued records still get written.
+    # Re-registered rather than added again, so it runs once however many
+    # times logging is set up.
+    atexit.unregister(shutdown_logging)
+    atexit.register(shutdown_logging)
+
+    levels = {
+        "app": logging.INFO,
+        "uvicorn": logging.INFO,
+        "uvicorn.error": logging.INFO,
+        # The app's own access records replace uvicorn's, with more fields.
+        "uvicorn.access": logging.WARNING,
+    }
+    for name, level in levels.items():
+        logger = logging.getLogger(name)
+        logger.handlers[:] = [handler]
+        logger.setLevel(level)
+        logger.propagate = False
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+
+
+def shutdown_logging() -> None:
+    """Write out the records still queued and stop the writer thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush(force=True)
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
@@ -0,0 +1,260 @@
+import math
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Collection, Iterable, Iterator
+
+# Latency buckets in seconds, by how long the measured thing usually takes.
+REQUEST_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DECODE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+
+type Labels = tuple[str, ...]
+type Sample = tuple[str, Labels, float]
+
+# Every thread records into its own shard, a dict of ``(metric, labels)`` to
+# a list of numbers that only that thread ever writes. Recording takes no
+# lock; a scrape sums the shards of the live threads and ``_retired``, the
+# totals that threads which have since exited left behind.
+type Shard = dict[tuple[object, Labels], list[float]]
+
+_local = threading.local()
+_shards: list[Shard] = []
+_retired: Shard = {}
+_shards_lock = threading.Lock()
+_registry: list["Metric"] = []
+
+
+class _ShardOwner:
+    """Held only by a thread's ``_local``, so it dies with the thread."""
+
+    __slots__ = ("__weakref__", "shard")
+
+    def __init__(self, shard: Shard) -> None:
+        self.shard = shard
+
+
+def _shard() -> Shard:
+    try:
+        return _local.owner.shard
+    except AttributeError:
+        shard: Shard = {}
+        owner = _local.owner = _ShardOwner(shard)
+        weakref.finalize(owner, _retire, shard)
+        with _shards_lock:
+            _shards.append(shard)
+        return shard
+
+
+def _retire(shard: Shard) -> None:
+    """Fold an exited thread's shard into ``_retired``, so that threadpools
+    replacing their workers do not grow ``_shards`` without bound."""
+    with _shards_lock:
+        for i, live in enumerate(_shards):
+            if live is shard:
+                del _shards[i]
+                break
+        for key, cells in shard.items():
+            total = _retired.get(key)
+            if total is None:
+                _retired[key] = list(cells)
+            else:
+                for i, value in enumerate(cells):
+                    total[i] += value
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric(ABC):
+    """A named family of samples, listed on ``/metrics`` in creation order."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        _registry.append(self)
+
+    def _totals(self, width: int) -> dict[Labels, list[float]]:
+        """Per-label-set sums of this metric's cells across every shard."""
+        totals: dict[Labels, list[float]] = {}
+        # Held throughout, so a shard cannot move into ``_retired`` mid-sum
+        # and be counted twice. Recording never takes it.
+        with _shards_lock:
+            for shard in [*_shards, _retired]:
+                # A snapshot: the owning thread may add keys while we iterate.
+                for (metric, labels), cells in list(shard.items()):
+                    if metric is not self:
+                        continue
+                    total = totals.setdefault(labels, [0.0] * width)
+                    for i, value in enumerate(cells):
+                        total[i] += value
+        if not totals and not self.labels:
+            # One series whatever happens, so it reads 0 before any event.
+            totals[()] = [0.0] * width
+        return totals
+
+    @abstractmethod
+    def samples(self) -> Iterator[Sample]: ...
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for name, values, value in self.samples():
+            pairs = ",".join(
+                f'{label}="{_escape(v)}"'
+                for label, v in zip(self.labels + ("le",), values, strict=False)
+            )
+            selector = f"{{{pairs}}}" if pairs else ""
+            lines.append(f"{name}{selector} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """A total that only goes up, e.g. requests served."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = _shard()
+        cells = shard.get((self, labels))
+        if cells is None:
+            cells = shard[(self, labels)] = [0.0]
+        cells[0] += amount
+
+    def samples(self) -> Iterator[Sample]:
+        for labels, (value,) in sorted(self._totals(1).items()):
+            yield f"{self.name}_total", labels, value
+
+
+class Gauge(Counter):
+    """A level moved up and down by the threads that change it.
+
+    Each thread keeps its own running delta, so a thread may end negative
+    when another one raised the level; only the sum means anything.
+    """
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self) -> Iterator[Sample]:
+        for labels, (value,) in sorted(self._totals(1).items()):
+            yield self.name, labels, value
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets, with their count and sum.
+
+    Each label set is a list of one count per bucket (``+Inf`` last) and the
+    running sum; buckets are made cumulative only when rendered.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Labels = (),
+        *,
+        buckets: Iterable[float] = REQUEST_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = _shard()
+        cells = shard.get((self, labels))
+        if cells is None:
+            cells = shard[(self, labels)] = [0.0] * (len(self.buckets) + 2)
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def samples(self) -> Iterator[Sample]:
+        width = len(self.buckets) + 2
+        for labels, cells in sorted(self._totals(width).items()):
+            cumulative = 0.0
+            bounds = [*map(_format_value, self.buckets), "+Inf"]
+            for bound, count in zip(bounds, cells, strict=False):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (bound,), cumulative
+            yield f"{self.name}_sum", labels, cells[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class CallbackGauge(Metric):
+    """A level read when scraped, e.g. a store size: nothing to record."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, read: Callable[[], float]
+    ) -> None:
+        super().__init__(name, documentation)
+        self.read = read
+
+    def samples(self) -> Iterator[Sample]:
+        yield self.name, (), self.read()
+
+
+def render(exclude: Collection[Metric] = ()) -> str:
+    """Every registered metric but ``exclude`` in the Prometheus text format."""
+    return "".join(metric.render() for metric in _registry if metric not in exclude)
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from a request's arrival to its last response byte, by route id.",
+    ("route",),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being served right now."
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Argon2 work done in this process, by operation (hash or verify).",
+    ("op",),
+    buckets=HASH_BUCKETS,
+)
+HASHING_JOB_DURATION = Histogram(
+    "hashing_job_duration_seconds",
+    "Hashing pool jobs from submission to result, queueing included.",
+    ("op",),
+    buckets=HASH_BUCKETS,
+)
+JWT_DECODE_DURATION = Histogram(
+    "jwt_decode_duration_seconds",
+    "Access token signature checks and decoding, on token cache misses.",
+    buckets=DECODE_BUCKETS,
+)
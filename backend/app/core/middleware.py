@@ -0,0 +1,152 @@
+import re
+import secrets
+import time
+from collections.abc import Callable
+
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import get_logger, request_id
+from app.core.metrics import REQUEST_DURATION, REQUESTS_IN_FLIGHT
+
+logger = get_logger("app.main")
+
+_SECURITY_HEADERS = {
+    "x-content-type-options": "nosniff",
+    "x-frame-options": "DENY",
+    "x-xss-protection": "1; mode=block",
+    "referrer-policy": "strict-origin-when-cross-origin",
+}
+_HSTS = ("strict-transport-security", "max-age=63072000; includeSubDomains")
+# A caller's X-Request-ID is kept when it looks like one; otherwise we mint one.
+_REQUEST_ID = re.compile(rb"[A-Za-z0-9._-]{1,64}")
+
+
+def _request_id(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id" and _REQUEST_ID.fullmatch(value):
+            return value.decode("ascii")
+    return secrets.token_hex(8)
+
+
+class SecurityHeadersMiddleware:
+    """Sets the security headers on every HTTP response and can log requests.
+
+    A plain ASGI middleware: it only rewrites the ``http.response.start``
+    message on its way out, with headers encoded once here, so a request
+    costs one wrapped ``send`` rather than the extra task and response
+    object of an ``@app.middleware("http")`` function. Headers of the same
+    name set by a route are replaced, as assigning them would.
+
+    With ``log_requests`` each request also gets an id, taken from
+    ``X-Request-ID`` or made up, which is echoed back, set in the
+    ``request_id`` context for every record logged while it runs, and
+    logged with its method, path, status and duration once it is done.
+    """
+
+    def __init__(self, app: ASGIApp, *, hsts: bool, log_requests: bool) -> None:
+        self.app = app
+        headers = dict(_SECURITY_HEADERS)
+        if hsts:
+            headers.update([_HSTS])
+        self._headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        ]
+        self._names = frozenset(name for name, _ in self._headers)
+        self.log_requests = log_requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = None
+        extra_headers = self._headers
+        if self.log_requests:
+            current = _request_id(scope)
+            extra_headers = [*self._headers, (b"x-request-id", current.encode())]
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [
+                    header
+                    for header in message.get("headers", ())
+                    if header[0].lower() not in self._names
+                ]
+                headers.extend(extra_headers)
+                message["headers"] = headers
+            await send(message)
+
+        if not self.log_requests:
+            await self.app(scope, receive, send_with_headers)
+            return
+
+        token = request_id.set(current)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            request_id.reset(token)
+        logger.info(
+            "%s %s -> %s",
+            scope["method"],
+            scope["path"],
+            status,
+            extra={
+                "access": True,
+                "request_id": current,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            },
+        )
+
+
+class MetricsMiddleware:
+    """Records in-flight requests and each request's latency by route id.
+
+    The route is the one the router matched, read back from the scope once
+    the request is done and named by ``route_id`` (the app's operation id
+    function) the first time it is seen; plain Starlette routes such as the
+    docs go by their name. Raw paths would add a label set per record;
+    requests no route matched are counted under ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp, *, route_id: Callable[[APIRoute], str]) -> None:
+        self.app = app
+        self.route_id = route_id
+        self._ids: dict[int, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started, self._label(scope.get("route"))
+            )
+
+    def _label(self, route: BaseRoute | None) -> str:
+        if route is None:
+            return "unmatched"
+        # Routes compare by value and are unhashable; they live as long as
+        # the app, so their ids are stable keys.
+        label = self._ids.get(id(route))
+        if label is None:
+            if isinstance(route, APIRoute):
+                label = self.route_id(route)
+            else:
+                label = getattr(route, "name", None) or "unmatched"
+            self._ids[id(route)] = label
+        return label
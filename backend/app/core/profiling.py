@@ -0,0 +1,76 @@
+import cProfile
+import random
+import secrets
+import time
+from pathlib import Path
+
+import anyio.to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import get_logger
+
+logger = get_logger("app.core.profiling")
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """Profiles the requests that ask for it, plus a random sample.
+
+    A request sending ``X-Profile: 1``, or drawn at ``sample_rate``, runs
+    under cProfile. Since Python 3.12 a profiler sees every thread, so the
+    trace holds the route's dependencies, crud calls and encoding on the
+    threadpool, but also whatever other requests run meanwhile. Only one
+    profiler can be active, so requests arriving during a profiled one run
+    unprofiled. The trace is written to ``directory`` as ``<id>.prof``
+    (pstats) once the response is sent, and the id is returned in the
+    ``X-Profile-Id`` header. The app only installs this when
+    ``PROFILING_DIR`` is set, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp, *, directory: str, sample_rate: float) -> None:
+        self.app = app
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sample_rate = sample_rate
+        # Only touched on the event loop.
+        self._active = False
+
+    def _wanted(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return value == b"1"
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another tool (a debugger, say) holds the hook
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{secrets.token_hex(4)}"
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (PROFILE_ID_HEADER, profile_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            self._active = False
+            path = self.directory / f"{profile_id}.prof"
+            await anyio.to_thread.run_sync(profiler.dump_stats, path)
+            logger.info("Profiled %s %s to %s", scope["method"], scope["path"], path)
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from app.core.config import settings
+from app.models import ResponseCacheStats
+
+# Rough bookkeeping cost of one entry (key tuple, node, tag), counted
+# against the byte budget along with the body.
+_ENTRY_OVERHEAD = 200
+
+
+class ResponseCache:
+    """Bounded LRU of encoded list pages, checked against their ETag.
+
+    Keys name the caller's scope and the parsed query; each entry keeps the
+    tag it was built under. The tag moves with the crud generation counters,
+    so a lookup under a newer tag drops the entry instead of serving it: a
+    write invalidates exactly the pages whose data it touched, and nothing
+    else. The store keeps those counters, so this holds for writes made by
+    other workers sharing it too, although each worker caches its own pages.
+    Bodies are accounted in bytes and the least recently used are
+    evicted past ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[str, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    def get_or_build(
+        self, key: Hashable, etag: str, build: Callable[[], bytes]
+    ) -> bytes:
+        """The body cached under ``key`` for ``etag``, or ``build()``'s, stored.
+
+        Builds run outside the lock; concurrent misses on one key each build
+        and the last one stays.
+        """
+        if self.max_bytes <= 0:
+            return build()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == etag:
+                    self._hits += 1
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                self._stale += 1
+                self._discard(key)
+            self._misses += 1
+        body = build()
+        self._put(key, etag, body)
+        return body
+
+    def _put(self, key: Hashable, etag: str, body: bytes) -> None:
+        size = len(body) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (etag, body)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _discard(self, key: Hashable) -> None:
+        _, body = self._entries.pop(key)
+        self._bytes -= len(body) + _ENTRY_OVERHEAD
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> ResponseCacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return ResponseCacheStats(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                stale=self._stale,
+                evictions=self._evictions,
+                hit_ratio=self._hits / lookups if lookups else 0.0,
+            )
+
+
+response_cache = ResponseCache(max_bytes=settings.RESPONSE_CACHE_MAX_BYTES)
@@ -1,4 +1,5 @@
 # backend/app/core/security.py
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -9,6 +10,7 @@ from pwdlib.hashers.bcrypt import BcryptHasher
 
 # We'll add these values to config.py next
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION
 
 ALGORITHM = "HS256"
 
@@ -26,8 +28,16 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return password_hash.verify(plain_password, hashed_password)
+    started = time.perf_counter()
+    try:
+        return password_hash.verify(plain_password, hashed_password)
+    finally:
+        PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, "verify")
 
 
 def get_password_hash(password: str) -> str:
-    return password_hash.hash(password)
+    started = time.perf_counter()
+    try:
+        return password_hash.hash(password)
+    finally:
+        PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, "hash")
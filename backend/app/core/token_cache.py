@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from app.core.config import settings
+
+
+class TokenCache:
+    """Bounded LRU of already-verified access tokens -> user id.
+
+    Lets ``get_current_user`` skip the JWT signature and claim checks for a
+    token it has seen before. Entries expire at the token's own ``exp`` and
+    are dropped whenever the crud layer deletes, deactivates or re-keys the
+    user they belong to.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # token -> (user id, exp as a unix timestamp)
+        self._entries: OrderedDict[str, tuple[UUID, float]] = OrderedDict()
+        self._tokens_by_user: dict[UUID, set[str]] = {}
+
+    def get(self, token: str) -> UUID | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user_id, exp = entry
+            if exp <= time.time():
+                self._discard(token)
+                return None
+            self._entries.move_to_end(token)
+            return user_id
+
+    def put(self, token: str, user_id: UUID, exp: float) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (user_id, exp)
+            self._entries.move_to_end(token)
+            self._tokens_by_user.setdefault(user_id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, ()):
+                self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, token: str) -> None:
+        user_id, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
@@ -1,57 +1,97 @@
+from app.core.response_cache import response_cache
+from app.core.token_cache import token_cache
+from app.crud.backends import get_storage
+from app.crud.backends.base import EmailAlreadyExists
+from app.crud.imports import get_import_progress, import_items, import_users
 from app.crud.items import (
+    count_items,
     create_item,
+    create_items,
     delete_item,
+    delete_items,
     delete_items_by_owner,
+    export_items,
     get_item,
+    get_item_version,
     get_items,
     get_items_by_owner,
+    get_items_generation,
+    insert_items,
     list_all_items,
+    search_items,
     update_item,
+    update_items,
 )
 from app.crud.seed import seed_mock_data
 from app.crud.users import (
     authenticate,
+    count_users,
     create_user,
+    create_users,
     delete_user,
+    export_users,
     get_user,
     get_user_by_email,
+    get_user_stats,
+    get_user_version,
     get_users,
+    get_users_generation,
     list_all_users,
     update_user,
     update_user_me,
     update_user_password,
 )
+from app.crud.versions import VersionConflict, versions
 
 __all__ = [
+    "EmailAlreadyExists",
+    "VersionConflict",
     "authenticate",
+    "count_items",
+    "count_users",
     "create_item",
+    "create_items",
     "create_user",
+    "create_users",
     "delete_item",
+    "delete_items",
     "delete_items_by_owner",
     "delete_user",
+    "export_items",
+    "export_users",
+    "get_import_progress",
     "get_item",
+    "get_item_version",
     "get_items",
     "get_items_by_owner",
+    "get_items_generation",
     "get_user",
     "get_user_by_email",
+    "get_user_stats",
+    "get_user_version",
     "get_users",
+    "get_users_generation",
+    "import_items",
+    "import_users",
+    "insert_items",
     "list_all_items",
     "list_all_users",
     "reset_mock_data",
+    "search_items",
     "seed_mock_data",
     "update_item",
+    "update_items",
     "update_user",
     "update_user_me",
     "update_user_password",
+    "versions",
 ]
 
 
 def reset_mock_data() -> None:
-    from app.crud.items import _ITEMS_BY_ID
-    from app.crud.users import _USERS_BY_ID
-
-    _USERS_BY_ID.clear()
-    _ITEMS_BY_ID.clear()
+    get_storage().clear()
+    token_cache.clear()
+    response_cache.clear()
     seed_mock_data()
 
 
@@ -0,0 +1,45 @@
+from app.core.config import settings
+from app.crud.backends.base import Storage
+from app.crud.backends.columnar import ColumnarStorage
+from app.crud.backends.journal import JournaledMemoryStorage
+from app.crud.backends.memory import MemoryStorage
+from app.crud.backends.sqlite import SQLiteStorage
+
+__all__ = [
+    "ColumnarStorage",
+    "JournaledMemoryStorage",
+    "MemoryStorage",
+    "SQLiteStorage",
+    "Storage",
+    "create_storage",
+    "get_storage",
+    "set_storage",
+]
+
+
+def create_storage(backend: str | None = None) -> Storage:
+    backend = backend or settings.STORAGE_BACKEND
+    if backend == "sqlite":
+        return SQLiteStorage(settings.SQLITE_PATH)
+    if backend == "columnar":
+        return ColumnarStorage()
+    if settings.MEMORY_DATA_DIR:
+        return JournaledMemoryStorage(
+            settings.MEMORY_DATA_DIR,
+            snapshot_every=settings.MEMORY_SNAPSHOT_EVERY,
+        )
+    return MemoryStorage()
+
+
+_storage: Storage = create_storage()
+
+
+def get_storage() -> Storage:
+    return _storage
+
+
+def set_storage(storage: Storage) -> Storage:
+    """Swap the active backend (tests, benchmarks); returns the previous one."""
+    global _storage
+    previous, _storage = _storage, storage
+    return previous
@@ -0,0 +1,247 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from app.crud.indexes import CreationKey
+from app.models import Item, ItemOrder, User, UserOrder, UserStats
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+class EmailAlreadyExists(Exception):
+    """Another user already has this email, compared case-folded."""
+
+
+def email_key(email: str) -> str:
+    return email.casefold()
+
+
+def to_micros(value: datetime) -> int:
+    """Integer microseconds since the Unix epoch, for compact on-disk storage."""
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    return _EPOCH + value * _ONE_MICROSECOND
+
+
+def optional_micros(value: datetime | None) -> int | None:
+    return None if value is None else to_micros(value)
+
+
+class UserFilter(NamedTuple):
+    """Conditions listed users must meet; ``None`` leaves a field open."""
+
+    is_active: bool | None = None
+    is_superuser: bool | None = None
+    # Matched against the case-folded email, like logins.
+    email_prefix: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+NO_USER_FILTER = UserFilter()
+
+
+class Storage(ABC):
+    """Persistence interface behind the functions exported from ``app.crud``.
+
+    Backends accept and return fully-built ``User``/``Item`` models, whatever
+    form they keep at rest. Item writers hand in a complete replacement
+    record rather than mutating the stored one, so a backend can always
+    compare old and new values when it maintains its indexes. User updates
+    name only the fields they change, and the backend applies them to the
+    record it holds at the time, so two updates of different fields both
+    land.
+    """
+
+    # Users
+
+    @abstractmethod
+    def get_user(self, user_id: UUID) -> User | None: ...
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> User | None: ...
+
+    @abstractmethod
+    def add_user(self, user: User) -> None:
+        """Store a new user; raises ``EmailAlreadyExists`` if its email is taken.
+
+        The check and the insert happen under the same lock (or in the same
+        transaction), so two concurrent adds of one email cannot both succeed.
+        """
+
+    def add_users(self, users: list[User]) -> list[User]:
+        """Store the users whose emails are free; return the ones stored.
+
+        Runs as one batch. Memory stores override it to build their indexes
+        in a single pass when the new users outnumber the stored ones.
+        """
+        stored = []
+        with self.batch():
+            for user in users:
+                try:
+                    self.add_user(user)
+                except EmailAlreadyExists:
+                    continue
+                stored.append(user)
+        return stored
+
+    @abstractmethod
+    def update_user(self, user_id: UUID, changes: dict[str, Any]) -> User | None:
+        """Set the ``changes`` (field name to value) on the stored user.
+
+        Reading the current record and writing the new one is atomic, and
+        the result is returned, or ``None`` if the user is gone. Raises
+        ``EmailAlreadyExists`` like ``add_user`` when a new email belongs to
+        someone else.
+        """
+
+    @abstractmethod
+    def delete_user(self, user_id: UUID) -> None: ...
+
+    @abstractmethod
+    def page_users(
+        self,
+        *,
+        skip: int,
+        limit: int,
+        after: CreationKey | None,
+        filters: UserFilter = NO_USER_FILTER,
+        order_by: UserOrder = "-created_at",
+    ) -> list[User]:
+        """Page of the users matching ``filters``, newest first by default.
+
+        ``after`` is the creation key of the last user of the previous page;
+        cursors only apply to the ``created_at`` orders.
+        """
+
+    @abstractmethod
+    def count_users(self, filters: UserFilter = NO_USER_FILTER) -> int: ...
+
+    @abstractmethod
+    def user_stats(self) -> UserStats: ...
+
+    @abstractmethod
+    def list_users(self) -> list[User]: ...
+
+    @abstractmethod
+    def export_users(
+        self, *, since: datetime | None, until: datetime | None
+    ) -> Iterator[User]:
+        """Users created in ``[since, until)``, oldest first.
+
+        The snapshot is taken when this is called, not when iteration starts,
+        and models are built lazily as the iterator is consumed.
+        """
+
+    # Items
+
+    @abstractmethod
+    def get_item(self, item_id: UUID) -> Item | None: ...
+
+    @abstractmethod
+    def add_item(self, item: Item) -> None: ...
+
+    @abstractmethod
+    def update_item(self, item_id: UUID, changes: dict[str, Any]) -> Item | None:
+        """Set the ``changes`` (field name to value) on the stored item.
+
+        Reading the current record and writing the new one is atomic, and
+        the result is returned, or ``None`` if the item is gone.
+        """
+
+    @abstractmethod
+    def delete_item(self, item_id: UUID) -> None: ...
+
+    @abstractmethod
+    def delete_items_by_owner(self, owner_id: UUID) -> int: ...
+
+    @abstractmethod
+    def page_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        skip: int,
+        limit: int,
+        after: CreationKey | None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        order_by: ItemOrder = "-created_at",
+    ) -> list[Item]:
+        """Page of items created in ``[since, until)``, newest first by
+        default, for one owner or for everyone."""
+
+    @abstractmethod
+    def search_items(
+        self, query: str, *, owner_id: UUID | None, skip: int, limit: int
+    ) -> tuple[list[Item], int]:
+        """Best keyword matches for ``query`` first, and how many matched.
+
+        Every word of the query must match a word of the title or
+        description; words split as ``search.tokenize`` does, and from
+        ``search.MIN_PREFIX`` characters on also match as prefixes.
+        """
+
+    @abstractmethod
+    def count_items(
+        self,
+        owner_id: UUID | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> int: ...
+
+    @abstractmethod
+    def list_items(self) -> list[Item]: ...
+
+    @abstractmethod
+    def export_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Iterator[Item]:
+        """Items created in ``[since, until)``, oldest first; see ``export_users``."""
+
+    # Change counters behind conditional requests (see ``app.crud.versions``).
+    # They live with the data, so every process sharing a store reads the
+    # same numbers. Deleting a record drops its version; ``clear`` drops them
+    # all and draws a new epoch.
+
+    @abstractmethod
+    def version_epoch(self) -> str: ...
+
+    @abstractmethod
+    def record_version(self, record_id: UUID) -> int: ...
+
+    @abstractmethod
+    def generation(self, scope: str) -> int: ...
+
+    @abstractmethod
+    def bump_versions(self, scopes: Iterable[str], updated: Iterable[UUID]) -> None:
+        """Stamp ``scopes`` and the ``updated`` records with the next number
+        of the store's sequence; run it in the batch of the write it counts."""
+
+    # Lifecycle
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group the writes made inside the block.
+
+        Backends pay their per-write overhead (lock hand-off, commit, log
+        flush) once for the whole batch. SQLite also commits it atomically;
+        the memory backends apply each write as it is made.
+        """
+        yield
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        pass
@@ -0,0 +1,362 @@
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import compress, starmap
+from operator import attrgetter, itemgetter, not_
+from typing import Any
+from uuid import UUID
+
+from app.crud.backends.base import to_micros
+from app.crud.backends.memory import MemoryStorage
+from app.crud.backends.records import ItemRecord, item_model
+from app.crud.indexes import CreationKey
+from app.models import Item, ItemOrder
+
+_ID_SIZE = 16
+_CODE_SIZE = 4
+_MAX_OWNERS = 1 << 28
+_ID_CHUNKS = struct.Struct(f"{_ID_SIZE}s")
+_CODE_CHUNKS = struct.Struct(f"{_CODE_SIZE}s")
+
+
+def _owner_code(index: int) -> bytes:
+    """Four bytes for the ``index``-th owner; only the first has its high bit set.
+
+    So every occurrence of a code in the owner column starts on a row
+    boundary, and ``bytearray.rfind``/``count`` filter by owner at C speed
+    without false matches straddling two rows.
+    """
+    return bytes(
+        (
+            0x80 | (index >> 21) & 0x7F,
+            (index >> 14) & 0x7F,
+            (index >> 7) & 0x7F,
+            index & 0x7F,
+        )
+    )
+
+
+def _chunks(column: bytes | bytearray, chunk: struct.Struct):
+    return map(itemgetter(0), chunk.iter_unpack(column))
+
+
+class ColumnarStorage(MemoryStorage):
+    """``MemoryStorage`` with items held column-wise instead of as records.
+
+    Items live in parallel columns kept in ``(created_at, id)`` order: an
+    ``array`` of timestamps, a ``bytearray`` of 16-byte ids, a ``bytearray``
+    of 4-byte owner codes, and plain lists for the strings. Ordering and
+    cursor positioning bisect the timestamp column, owner filters are
+    ``rfind`` scans over the owner column, and deleting an owner's items
+    rebuilds each column in one C-level pass. The id -> timestamp map used
+    to locate an item by id is the only per-row Python object besides the
+    strings. Users are stored exactly as in ``MemoryStorage``.
+    """
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._created = array("q")
+        self._ids = bytearray()
+        self._owner_col = bytearray()
+        self._titles: list[str] = []
+        self._descriptions: list[str | None] = []
+        # Item id -> created_at, to find an item's row by bisection.
+        self._created_by_id: dict[int, int] = {}
+        # Owner id <-> code in the owner column. Codes are never reused.
+        self._owner_codes: dict[int, bytes] = {}
+        self._owner_by_code: dict[bytes, UUID] = {}
+        self._owner_counts: dict[int, int] = {}
+
+    # Rows
+
+    def _id_at(self, pos: int) -> bytes:
+        return bytes(self._ids[pos * _ID_SIZE : (pos + 1) * _ID_SIZE])
+
+    def _owner_at(self, pos: int) -> int:
+        code = bytes(self._owner_col[pos * _CODE_SIZE : (pos + 1) * _CODE_SIZE])
+        return self._owner_by_code[code].int
+
+    def _record_at(self, pos: int, owner_id: int | None = None) -> ItemRecord:
+        return ItemRecord(
+            int.from_bytes(self._ids[pos * _ID_SIZE : (pos + 1) * _ID_SIZE]),
+            self._owner_at(pos) if owner_id is None else owner_id,
+            self._created[pos],
+            self._titles[pos],
+            self._descriptions[pos],
+        )
+
+    def _columns(self, start: int, stop: int) -> tuple:
+        """Rows ``start:stop`` as ``item_model`` arguments, one iterable each.
+
+        Every column is copied out at once, so the result stays valid after
+        the read. Unpacking works on copies anyway: a live bytearray cannot
+        be resized by a writer while an iterator holds its buffer.
+        """
+        ids = bytes(self._ids[start * _ID_SIZE : stop * _ID_SIZE])
+        codes = bytes(self._owner_col[start * _CODE_SIZE : stop * _CODE_SIZE])
+        return (
+            map(int.from_bytes, _chunks(ids, _ID_CHUNKS)),
+            # Codes are never removed, so this lookup is safe after the read.
+            map(self._owner_by_code.__getitem__, _chunks(codes, _CODE_CHUNKS)),
+            self._created[start:stop],
+            self._titles[start:stop],
+            self._descriptions[start:stop],
+        )
+
+    def _position(self, created_at: int, raw_id: bytes) -> int:
+        """Row of the first item at or after ``(created_at, raw_id)``."""
+        pos = bisect_left(self._created, created_at)
+        while (
+            pos < len(self._created)
+            and self._created[pos] == created_at
+            and self._id_at(pos) < raw_id
+        ):
+            pos += 1
+        return pos
+
+    def _find(self, item_id: int) -> int:
+        created_at = self._created_by_id.get(item_id)
+        if created_at is None:
+            return -1
+        raw_id = item_id.to_bytes(_ID_SIZE)
+        pos = self._position(created_at, raw_id)
+        if pos < len(self._created) and self._id_at(pos) == raw_id:
+            return pos
+        return -1
+
+    def _code(self, owner_id: int) -> bytes:
+        code = self._owner_codes.get(owner_id)
+        if code is None:
+            if len(self._owner_codes) >= _MAX_OWNERS:
+                raise OverflowError("Too many item owners for the columnar store")
+            code = _owner_code(len(self._owner_codes))
+            self._owner_codes[owner_id] = code
+            self._owner_by_code[code] = self._owners[owner_id]
+        return code
+
+    # Record-level mutations
+
+    def _insert_item(self, record: ItemRecord) -> None:
+        raw_id = record.id.to_bytes(_ID_SIZE)
+        code = self._code(record.owner_id)
+        n = len(self._created)
+        if not n or (self._created[-1], self._id_at(n - 1)) < (
+            record.created_at,
+            raw_id,
+        ):
+            pos = n  # the common case: newer than everything stored
+        else:
+            pos = self._position(record.created_at, raw_id)
+        self._created.insert(pos, record.created_at)
+        self._ids[pos * _ID_SIZE : pos * _ID_SIZE] = raw_id
+        self._owner_col[pos * _CODE_SIZE : pos * _CODE_SIZE] = code
+        self._titles.insert(pos, record.title)
+        self._descriptions.insert(pos, record.description)
+        self._created_by_id[record.id] = record.created_at
+        counts = self._owner_counts
+        counts[record.owner_id] = counts.get(record.owner_id, 0) + 1
+        self._index_text(record)
+
+    def _swap_item(self, record: ItemRecord) -> None:
+        pos = self._find(record.id)
+        if pos >= 0:
+            self._titles[pos] = record.title
+            self._descriptions[pos] = record.description
+            self._index_text(record)
+
+    def _remove_item(self, item_id: int) -> None:
+        pos = self._find(item_id)
+        if pos < 0:
+            return
+        owner_id = self._owner_at(pos)
+        del self._created[pos]
+        del self._ids[pos * _ID_SIZE : (pos + 1) * _ID_SIZE]
+        del self._owner_col[pos * _CODE_SIZE : (pos + 1) * _CODE_SIZE]
+        del self._titles[pos]
+        del self._descriptions[pos]
+        del self._created_by_id[item_id]
+        self._search.remove(item_id)
+        self._record_versions.pop(item_id, None)
+        self._release(owner_id, 1)
+
+    def _remove_items_by_owner(self, owner_id: int) -> int:
+        deleted = self._owner_counts.get(owner_id, 0)
+        if not deleted:
+            return 0
+        code = self._owner_codes[owner_id]
+        # Build a keep-mask once, then filter every column through it.
+        keep = list(map(code.__ne__, _chunks(self._owner_col, _CODE_CHUNKS)))
+        ids = list(_chunks(self._ids, _ID_CHUNKS))
+        for raw_id in compress(ids, map(not_, keep)):
+            item_id = int.from_bytes(raw_id)
+            del self._created_by_id[item_id]
+            self._search.remove(item_id)
+            self._record_versions.pop(item_id, None)
+        self._created = array("q", compress(self._created, keep))
+        self._ids = bytearray().join(compress(ids, keep))
+        self._owner_col = bytearray().join(
+            compress(_chunks(self._owner_col, _CODE_CHUNKS), keep)
+        )
+        self._titles = list(compress(self._titles, keep))
+        self._descriptions = list(compress(self._descriptions, keep))
+        self._release(owner_id, deleted)
+        return deleted
+
+    def _release(self, owner_id: int, count: int) -> None:
+        remaining = self._owner_counts[owner_id] - count
+        if remaining:
+            self._owner_counts[owner_id] = remaining
+        else:
+            del self._owner_counts[owner_id]
+            self._owners.pop(owner_id, None)
+
+    # Items
+
+    def get_item(self, item_id: UUID) -> Item | None:
+        def read() -> ItemRecord | None:
+            pos = self._find(item_id.int)
+            return None if pos < 0 else self._record_at(pos)
+
+        record = self._read(read)
+        return None if record is None else self._item_model(record)
+
+    def update_item(self, item_id: UUID, changes: dict[str, Any]) -> Item | None:
+        with self._writing():
+            pos = self._find(item_id.int)
+            if pos < 0:
+                return None
+            old = self._record_at(pos)
+            item = self._item_model(old).model_copy(update=changes)
+            self._swap_item(ItemRecord.from_model(item, old.owner_id))
+        return item
+
+    def _bound(self, value: datetime | None, default: int) -> int:
+        """Row of the first item created at or after ``value``."""
+        if value is None:
+            return default
+        return bisect_left(self._created, to_micros(value))
+
+    def _window(
+        self,
+        after: CreationKey | None,
+        since: datetime | None,
+        until: datetime | None,
+        descending: bool,
+    ) -> tuple[int, int]:
+        """Rows ``[start, stop)`` a listing walks, before skip and limit."""
+        start = self._bound(since, 0)
+        stop = self._bound(until, len(self._created))
+        if after is not None:
+            created_at, record_id = after
+            raw_id = record_id.int.to_bytes(_ID_SIZE)
+            cursor = self._position(to_micros(created_at), raw_id)
+            if descending:
+                stop = min(stop, cursor)
+            else:
+                if cursor < len(self._created) and self._id_at(cursor) == raw_id:
+                    cursor += 1
+                start = max(start, cursor)
+        return start, max(start, stop)
+
+    def page_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        skip: int,
+        limit: int,
+        after: CreationKey | None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        order_by: ItemOrder = "-created_at",
+    ) -> list[Item]:
+        descending = order_by == "-created_at"
+        if owner_id is None:
+
+            def read_columns() -> tuple:
+                start, stop = self._window(after, since, until, descending)
+                if descending:
+                    stop = max(start, stop - skip)
+                    return self._columns(max(start, stop - limit), stop)
+                start = min(stop, start + skip)
+                return self._columns(start, min(stop, start + limit))
+
+            items = list(map(item_model, *self._read(read_columns)))
+            if descending:
+                items.reverse()
+            return items
+
+        def read_owner_rows() -> list[ItemRecord]:
+            code = self._owner_codes.get(owner_id.int)
+            if code is None:
+                return []
+            start, stop = self._window(after, since, until, descending)
+            lo, hi = start * _CODE_SIZE, stop * _CODE_SIZE
+            rows: list[int] = []
+            while len(rows) < skip + limit:
+                if descending:
+                    offset = self._owner_col.rfind(code, lo, hi)
+                    hi = offset
+                else:
+                    offset = self._owner_col.find(code, lo, hi)
+                    lo = offset + _CODE_SIZE
+                if offset < 0:
+                    break
+                rows.append(offset // _CODE_SIZE)
+            return [self._record_at(pos, owner_id.int) for pos in rows[skip:]]
+
+        return [self._item_model(record) for record in self._read(read_owner_rows)]
+
+    def count_items(
+        self,
+        owner_id: UUID | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> int:
+        if since is None and until is None:
+            if owner_id is None:
+                return len(self._created)
+            return self._owner_counts.get(owner_id.int, 0)
+
+        def read() -> int:
+            start, stop = self._window(None, since, until, True)
+            if owner_id is None:
+                return stop - start
+            code = self._owner_codes.get(owner_id.int)
+            if code is None:
+                return 0
+            # Codes only match at row boundaries; see ``_owner_code``.
+            return self._owner_col.count(code, start * _CODE_SIZE, stop * _CODE_SIZE)
+
+        return self._read(read)
+
+    def _all_columns(self) -> tuple:
+        return self._read(lambda: self._columns(0, len(self._created)))
+
+    def item_records(self) -> list[ItemRecord]:
+        ids, owners, *rest = self._all_columns()
+        return list(map(ItemRecord, ids, map(attrgetter("int"), owners), *rest))
+
+    def list_items(self) -> list[Item]:
+        return list(map(item_model, *self._all_columns()))
+
+    def export_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Iterator[Item]:
+        def read_columns() -> tuple:
+            return self._columns(
+                self._bound(since, 0), self._bound(until, len(self._created))
+            )
+
+        # The snapshot is a copy of the column slices, about 50 bytes a row.
+        columns = self._read(read_columns)
+        if owner_id is None:
+            return map(item_model, *columns)
+        rows = zip(*columns, strict=True)
+        return starmap(item_model, (row for row in rows if row[1] == owner_id))
@@ -0,0 +1,424 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import UUID
+
+from app.core.logging import get_logger
+from app.crud.backends.memory import MemoryStorage
+from app.crud.backends.records import ItemRecord, UserRecord
+
+logger = get_logger("app.crud.journal")
+
+# On-disk layout
+# --------------
+# snapshot.bin   header, then every user record, then every item record
+# wal-<seq>.log  append-only mutation records; <seq> is the first seq it holds
+#
+# Records use fixed-width little-endian heads followed by length-prefixed
+# UTF-8 strings; a length of 0xFFFFFFFF encodes ``None``.
+
+_SNAPSHOT_NAME = "snapshot.bin"
+_SNAPSHOT_MAGIC = b"FSASNAP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sQQQ")  # magic, seq, n_users, n_items
+_USER_HEAD = struct.Struct("<16sqB")  # id, created_at, flags
+_ITEM_HEAD = struct.Struct("<16s16sq")  # id, owner_id, created_at
+_STR_LEN = struct.Struct("<I")
+_NONE_LEN = 0xFFFFFFFF
+_ACTIVE = 0x01
+_SUPERUSER = 0x02
+
+_LOG_HEADER = struct.Struct("<IIQB")  # payload length, crc32, seq, op
+_CRC_PREFIX = struct.Struct("<QB")  # seq and op are covered by the checksum
+_OP_ADD_USER = 1
+_OP_REPLACE_USER = 2
+_OP_DELETE_USER = 3
+_OP_ADD_ITEM = 4
+_OP_REPLACE_ITEM = 5
+_OP_DELETE_ITEM = 6
+_OP_DELETE_ITEMS_BY_OWNER = 7
+_OP_CLEAR = 8
+
+
+def _pack_str(out: bytearray, value: str | None) -> None:
+    if value is None:
+        out += _STR_LEN.pack(_NONE_LEN)
+        return
+    raw = value.encode("utf-8")
+    out += _STR_LEN.pack(len(raw))
+    out += raw
+
+
+def _unpack_str(buf, offset: int) -> tuple[str | None, int]:
+    (length,) = _STR_LEN.unpack_from(buf, offset)
+    offset += _STR_LEN.size
+    if length == _NONE_LEN:
+        return None, offset
+    return str(buf[offset : offset + length], "utf-8"), offset + length
+
+
+def _encode_user(out: bytearray, user: UserRecord) -> None:
+    flags = (_ACTIVE if user.is_active else 0) | (
+        _SUPERUSER if user.is_superuser else 0
+    )
+    out += _USER_HEAD.pack(user.id.to_bytes(16), user.created_at, flags)
+    _pack_str(out, user.email)
+    _pack_str(out, user.full_name)
+    _pack_str(out, user.hashed_password)
+
+
+def _decode_user(buf, offset: int) -> tuple[UserRecord, int]:
+    id_bytes, created_at, flags = _USER_HEAD.unpack_from(buf, offset)
+    offset += _USER_HEAD.size
+    email, offset = _unpack_str(buf, offset)
+    full_name, offset = _unpack_str(buf, offset)
+    hashed_password, offset = _unpack_str(buf, offset)
+    user = UserRecord(
+        int.from_bytes(id_bytes),
+        email,
+        full_name,
+        hashed_password,
+        bool(flags & _ACTIVE),
+        bool(flags & _SUPERUSER),
+        created_at,
+    )
+    return user, offset
+
+
+def _encode_item(out: bytearray, item: ItemRecord) -> None:
+    out += _ITEM_HEAD.pack(
+        item.id.to_bytes(16), item.owner_id.to_bytes(16), item.created_at
+    )
+    _pack_str(out, item.title)
+    _pack_str(out, item.description)
+
+
+def _decode_item(
+    buf, offset: int, owner_id: Callable[[bytes], int]
+) -> tuple[ItemRecord, int]:
+    """Decode one item; ``owner_id`` maps raw owner bytes to the interned id."""
+    id_bytes, owner_bytes, created_at = _ITEM_HEAD.unpack_from(buf, offset)
+    offset += _ITEM_HEAD.size
+    title, offset = _unpack_str(buf, offset)
+    description, offset = _unpack_str(buf, offset)
+    item = ItemRecord(
+        int.from_bytes(id_bytes),
+        owner_id(owner_bytes),
+        created_at,
+        title,
+        description,
+    )
+    return item, offset
+
+
+def _checksum(seq: int, op: int, payload) -> int:
+    return zlib.crc32(payload, zlib.crc32(_CRC_PREFIX.pack(seq, op)))
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JournaledMemoryStorage(MemoryStorage):
+    """``MemoryStorage`` made durable with a mutation log and snapshots.
+
+    Every write is applied in memory and appended to the current log segment
+    (flushed to the OS, so it survives a process crash). After
+    ``snapshot_every`` writes the log is rotated and the state at that point
+    is written as a compact binary snapshot on a background thread; segments
+    the snapshot covers are then deleted. Startup maps the snapshot into
+    memory and replays the log tail past the snapshot's sequence number.
+    """
+
+    def __init__(self, data_dir: str, *, snapshot_every: int = 100_000) -> None:
+        super().__init__()
+        self._dir = Path(data_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._snapshot_every = snapshot_every
+        self._seq = 0
+        self._since_snapshot = 0
+        self._snapshot_thread: threading.Thread | None = None
+        self._recover()
+        self._segment = self._open_segment()
+
+    # Writes: every record-level mutation is logged once it has been applied.
+
+    def _insert_user(self, record: UserRecord) -> None:
+        super()._insert_user(record)
+        self._append_record(_OP_ADD_USER, _encode_user, record)
+
+    def _bulk_insert_users(self, records: list[UserRecord]) -> list[UserRecord]:
+        inserted = super()._bulk_insert_users(records)
+        self._append_records(_OP_ADD_USER, _encode_user, inserted)
+        return inserted
+
+    def _swap_user(self, record: UserRecord) -> None:
+        super()._swap_user(record)
+        self._append_record(_OP_REPLACE_USER, _encode_user, record)
+
+    def _remove_user(self, user_id: int) -> None:
+        super()._remove_user(user_id)
+        self._append(_OP_DELETE_USER, user_id.to_bytes(16))
+
+    def _insert_item(self, record: ItemRecord) -> None:
+        super()._insert_item(record)
+        self._append_record(_OP_ADD_ITEM, _encode_item, record)
+
+    def _swap_item(self, record: ItemRecord) -> None:
+        super()._swap_item(record)
+        self._append_record(_OP_REPLACE_ITEM, _encode_item, record)
+
+    def _remove_item(self, item_id: int) -> None:
+        super()._remove_item(item_id)
+        self._append(_OP_DELETE_ITEM, item_id.to_bytes(16))
+
+    def _remove_items_by_owner(self, owner_id: int) -> int:
+        deleted = super()._remove_items_by_owner(owner_id)
+        if deleted:
+            self._append(_OP_DELETE_ITEMS_BY_OWNER, owner_id.to_bytes(16))
+        return deleted
+
+    def clear(self) -> None:
+        with self._write_lock:
+            super().clear()
+            self._append(_OP_CLEAR, b"")
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self._write_lock:
+            try:
+                with super().batch():
+                    yield
+            finally:
+                self._segment.flush()
+
+    # Log
+
+    def _append_record(self, op: int, encode, record) -> None:
+        self._append_records(op, encode, (record,))
+
+    def _append_records(self, op: int, encode, records) -> None:
+        payloads = []
+        for record in records:
+            payload = bytearray()
+            encode(payload, record)
+            payloads.append(payload)
+        self._append_all(op, payloads)
+
+    def _append(self, op: int, payload: bytes | bytearray) -> None:
+        self._append_all(op, (payload,))
+
+    def _append_all(self, op: int, payloads) -> None:
+        for payload in payloads:
+            self._seq += 1
+            crc = _checksum(self._seq, op, payload)
+            self._segment.write(_LOG_HEADER.pack(len(payload), crc, self._seq, op))
+            self._segment.write(payload)
+            self._since_snapshot += 1
+        if self._write_depth <= 1:
+            # Inside a batch the flush waits for the batch to end.
+            self._segment.flush()
+        # Checked once every record of an applied change is logged: a snapshot
+        # taken partway through would copy records its seq does not cover.
+        if self._since_snapshot >= self._snapshot_every:
+            self._start_snapshot()
+
+    def _segment_paths(self) -> list[Path]:
+        return sorted(self._dir.glob("wal-*.log"))
+
+    def _open_segment(self):
+        path = self._dir / f"wal-{self._seq + 1:020d}.log"
+        segment = open(path, "ab")
+        _fsync_dir(self._dir)
+        return segment
+
+    def _owner_id(self, raw: bytes) -> int:
+        return self._intern_owner(UUID(bytes=raw))
+
+    def _apply(self, op: int, payload: memoryview) -> None:
+        # Replay goes straight to MemoryStorage so nothing is re-logged.
+        if op == _OP_ADD_USER:
+            MemoryStorage._insert_user(self, _decode_user(payload, 0)[0])
+        elif op == _OP_REPLACE_USER:
+            MemoryStorage._swap_user(self, _decode_user(payload, 0)[0])
+        elif op == _OP_DELETE_USER:
+            MemoryStorage._remove_user(self, int.from_bytes(payload))
+        elif op == _OP_ADD_ITEM:
+            item = _decode_item(payload, 0, self._owner_id)[0]
+            MemoryStorage._insert_item(self, item)
+        elif op == _OP_REPLACE_ITEM:
+            item = _decode_item(payload, 0, self._owner_id)[0]
+            MemoryStorage._swap_item(self, item)
+        elif op == _OP_DELETE_ITEM:
+            MemoryStorage._remove_item(self, int.from_bytes(payload))
+        elif op == _OP_DELETE_ITEMS_BY_OWNER:
+            MemoryStorage._remove_items_by_owner(self, int.from_bytes(payload))
+        elif op == _OP_CLEAR:
+            MemoryStorage.clear(self)
+
+    def _replay_segment(self, path: Path, after_seq: int) -> int:
+        """Apply records newer than ``after_seq``; returns how many were applied.
+
+        A torn or corrupt record ends the segment: it is truncated there so
+        new appends never follow garbage.
+        """
+        applied = 0
+        with open(path, "r+b") as f:
+            data = f.read()
+            view = memoryview(data)
+            offset = 0
+            while offset + _LOG_HEADER.size <= len(data):
+                length, crc, seq, op = _LOG_HEADER.unpack_from(data, offset)
+                start = offset + _LOG_HEADER.size
+                payload = view[start : start + length]
+                if len(payload) < length or crc != _checksum(seq, op, payload):
+                    break
+                if seq > after_seq:
+                    self._apply(op, payload)
+                    applied += 1
+                self._seq = max(self._seq, seq)
+                offset = start + length
+            if offset < len(data):
+                logger.warning("Truncating torn log tail in %s at %d", path, offset)
+                f.truncate(offset)
+        return applied
+
+    # Snapshots
+
+    def _load_snapshot(self) -> int:
+        path = self._dir / _SNAPSHOT_NAME
+        if not path.exists() or path.stat().st_size == 0:
+            return 0
+        with (
+            open(path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m,
+        ):
+            magic, seq, n_users, n_items = _SNAPSHOT_HEADER.unpack_from(m, 0)
+            if magic != _SNAPSHOT_MAGIC:
+                raise RuntimeError(f"{path} is not a snapshot file")
+            offset = _SNAPSHOT_HEADER.size
+            users = []
+            for _ in range(n_users):
+                user, offset = _decode_user(m, offset)
+                users.append(user)
+            # Into an empty store, so the indexes are built in one pass.
+            MemoryStorage._bulk_insert_users(self, users)
+            # Most items share a few owners: intern each one once.
+            owners: dict[bytes, int] = {}
+
+            def owner_id(raw: bytes) -> int:
+                interned = owners.get(raw)
+                if interned is None:
+                    interned = owners[raw] = self._owner_id(raw)
+                return interned
+
+            for _ in range(n_items):
+                item, offset = _decode_item(m, offset, owner_id)
+                MemoryStorage._insert_item(self, item)
+        return seq
+
+    def _recover(self) -> None:
+        snapshot_seq = self._load_snapshot()
+        self._seq = snapshot_seq
+        replayed = 0
+        for path in self._segment_paths():
+            replayed += self._replay_segment(path, snapshot_seq)
+        self._since_snapshot = replayed
+        if snapshot_seq or replayed:
+            logger.info(
+                "Recovered store at seq %d (%d log records replayed)",
+                self._seq,
+                replayed,
+            )
+
+    def _start_snapshot(self) -> None:
+        """Rotate the log and write the current state in the background.
+
+        Must be called with ``_write_lock`` held. Records are replaced rather than
+        mutated, so the copied lists stay a consistent view after the lock
+        is released.
+        """
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        self._segment.close()
+        self._segment = self._open_segment()
+        self._since_snapshot = 0
+        seq = self._seq
+        users = self.user_records()
+        items = self.item_records()
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot,
+            args=(seq, users, items),
+            name="store-snapshot",
+            daemon=True,
+        )
+        self._snapshot_thread.start()
+
+    def _write_snapshot(
+        self, seq: int, users: list[UserRecord], items: list[ItemRecord]
+    ) -> None:
+        try:
+            self._write_snapshot_file(seq, users, items)
+        except Exception:
+            logger.exception("Snapshot at seq %d failed; keeping the log", seq)
+            return
+
+        # Segments that start at or before ``seq`` are fully covered.
+        for segment in self._segment_paths():
+            if int(segment.stem.removeprefix("wal-")) <= seq:
+                segment.unlink()
+        logger.info("Wrote snapshot at seq %d", seq)
+
+    def _write_snapshot_file(
+        self, seq: int, users: list[UserRecord], items: list[ItemRecord]
+    ) -> None:
+        path = self._dir / _SNAPSHOT_NAME
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, seq, len(users), len(items)))
+            buf = bytearray()
+            for encode, batch in ((_encode_user, users), (_encode_item, items)):
+                for record in batch:
+                    encode(buf, record)
+                    if len(buf) >= 1 << 20:
+                        f.write(buf)
+                        buf.clear()
+            f.write(buf)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self._dir)
+
+    def snapshot(self) -> None:
+        """Take a snapshot now and wait for it to be written."""
+        with self._write_lock:
+            self._start_snapshot()
+            thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+
+    # Lifecycle
+
+    def flush(self) -> None:
+        """Flush the log to stable storage."""
+        with self._write_lock:
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+
+    def close(self) -> None:
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._write_lock:
+            if self._segment.closed:
+                return
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            self._segment.close()
@@ -0,0 +1,612 @@
+import secrets
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from typing import Any
+from uuid import UUID
+
+from app.crud.backends.base import (
+    NO_USER_FILTER,
+    EmailAlreadyExists,
+    Storage,
+    UserFilter,
+    email_key,
+    optional_micros,
+    to_micros,
+)
+from app.crud.backends.records import ItemRecord, UserRecord, uuid_from_int
+from app.crud.indexes import (
+    Bitset,
+    CreationIndex,
+    CreationKey,
+    RecordKey,
+    SortedKeys,
+    count_bits,
+    iter_bits,
+    record_key,
+    select_bits,
+)
+from app.crud.search import SearchIndex
+from app.models import Item, ItemOrder, User, UserOrder, UserStats
+
+# Sorts after every string that starts with a given prefix.
+_PREFIX_END = "\U0010ffff"
+
+
+class MemoryStorage(Storage):
+    """Dict-backed store with secondary indexes; the default backend.
+
+    Records are kept in the compact form from ``records.py`` and only turned
+    back into models on the way out.
+
+    Routes are sync ``def`` functions, so FastAPI runs them concurrently on
+    the anyio threadpool. Writers serialize on a short lock and never mutate
+    a stored record in place (they swap in a replacement), so a reader that
+    grabs a record always sees a whole version of it. Reads that combine
+    several structures (a bisect plus a slice, or several counters) run as
+    a seqlock: they take no lock and simply retry if a write overlapped.
+    """
+
+    def __init__(self) -> None:
+        # Reentrant so subclasses can wrap a write and its side effects.
+        self._write_lock = threading.RLock()
+        # Even while idle, odd while a write (or a batch of them) is in progress.
+        self._version = 0
+        self._write_depth = 0
+        self._writer: int | None = None
+        self._reset()
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        with self._write_lock:
+            self._write_depth += 1
+            if self._write_depth == 1:
+                self._writer = threading.get_ident()
+                self._version += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    self._version += 1
+                    self._writer = None
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        # One lock hold for the whole batch; combined reads wait for its end.
+        with self._writing():
+            yield
+
+    def _read[R](self, fn: Callable[[], R]) -> R:
+        if self._writer == threading.get_ident():
+            return fn()  # reading back inside our own batch
+        while True:
+            version = self._version
+            if not version & 1:
+                try:
+                    result = fn()
+                except (IndexError, KeyError):
+                    # Structures torn by an overlapping write can fail a
+                    # lookup; that is only a bug if no write happened.
+                    if self._version == version:
+                        raise
+                else:
+                    if self._version == version:
+                        return result
+            # A write overlapped: let the writer finish, then retry.
+            with self._write_lock:
+                pass
+
+    def _reset(self) -> None:
+        self._users_by_id: dict[int, UserRecord] = {}
+        # Case-folded email -> user id.
+        self._user_id_by_email: dict[str, int] = {}
+        self._users_by_creation: CreationIndex[UserRecord] = CreationIndex()
+        # Flags of the users in ``_users_by_creation``, bit i for position i.
+        self._active_bits = Bitset()
+        self._superuser_bits = Bitset()
+        # The keys of ``_user_id_by_email``, sorted for prefix ranges.
+        self._emails = SortedKeys()
+        # Running totals so stats never have to walk the user records.
+        self._active_users = 0
+        self._superusers = 0
+
+        self._items_by_id: dict[int, ItemRecord] = {}
+        self._items_by_creation: CreationIndex[ItemRecord] = CreationIndex()
+        # Owner id -> that owner's items in creation order.
+        self._items_by_owner: dict[int, CreationIndex[ItemRecord]] = {}
+        # Owner id -> its UUID. Item records share ``owner.int`` from here, and
+        # models get the shared UUID back, so neither is boxed per item.
+        self._owners: dict[int, UUID] = {}
+        self._search = SearchIndex()
+
+        # Change counters: the last number of the sequence stamped on each
+        # list scope and each updated record (by id), and the epoch that
+        # tells them apart from the numbers of an earlier store.
+        self._epoch = secrets.token_hex(4)
+        self._sequence = 0
+        self._generations: dict[str, int] = {}
+        self._record_versions: dict[int, int] = {}
+
+    def clear(self) -> None:
+        with self._writing():
+            self._reset()
+
+    # Record-level mutations. Callers hold ``_writing()``; subclasses extend
+    # these to observe every change, including ones made during recovery.
+
+    def _insert_user(self, record: UserRecord) -> None:
+        key = email_key(record.email)
+        self._check_email(key, record.id)
+        self._users_by_id[record.id] = record
+        self._claim_email(key, record.id)
+        pos = self._users_by_creation.add(record)
+        self._active_bits.insert(pos, record.is_active)
+        self._superuser_bits.insert(pos, record.is_superuser)
+        self._tally(record, 1)
+
+    def _insert_users(self, records: list[UserRecord]) -> list[UserRecord]:
+        """Insert the records whose emails are free; return those inserted.
+
+        One at a time when the store already holds more users than are
+        coming, otherwise in bulk.
+        """
+        if len(records) >= len(self._users_by_id):
+            return self._bulk_insert_users(records)
+        inserted = []
+        for record in records:
+            try:
+                self._insert_user(record)
+            except EmailAlreadyExists:
+                continue
+            inserted.append(record)
+        return inserted
+
+    def _bulk_insert_users(self, records: list[UserRecord]) -> list[UserRecord]:
+        """``_insert_users`` that fills the dicts and creation index first,
+        then rebuilds the email and flag indexes once: a single sort and one
+        pass over the creation order, instead of an index update per user.
+        """
+        by_id, id_by_email = self._users_by_id, self._user_id_by_email
+        inserted = []
+        for record in records:
+            key = email_key(record.email)
+            if key in id_by_email or record.id in by_id:
+                continue
+            by_id[record.id] = record
+            id_by_email[key] = record.id
+            self._users_by_creation.add(record)
+            self._tally(record, 1)
+            inserted.append(record)
+        self._emails = SortedKeys.from_sorted(sorted(id_by_email))
+        users = self._users_by_creation
+        self._active_bits = Bitset.from_flags(user.is_active for user in users)
+        self._superuser_bits = Bitset.from_flags(user.is_superuser for user in users)
+        return inserted
+
+    def _swap_user(self, record: UserRecord) -> None:
+        old = self._users_by_id.get(record.id)
+        if old is None:
+            return
+        old_key, new_key = email_key(old.email), email_key(record.email)
+        if old_key != new_key:
+            self._check_email(new_key, record.id)
+            self._release_email(old_key, record.id)
+            self._claim_email(new_key, record.id)
+        self._tally(old, -1)
+        self._tally(record, 1)
+        self._users_by_id[record.id] = record
+        pos = self._users_by_creation.replace(record)
+        if pos >= 0:
+            self._active_bits.set(pos, record.is_active)
+            self._superuser_bits.set(pos, record.is_superuser)
+
+    def _remove_user(self, user_id: int) -> None:
+        record = self._users_by_id.pop(user_id, None)
+        if record is None:
+            return
+        pos = self._users_by_creation.remove(record)
+        if pos >= 0:
+            self._active_bits.delete(pos)
+            self._superuser_bits.delete(pos)
+        self._tally(record, -1)
+        self._release_email(email_key(record.email), user_id)
+        self._record_versions.pop(user_id, None)
+
+    def _check_email(self, key: str, user_id: int) -> None:
+        # Runs before anything changes, so a refused write leaves no trace.
+        holder = self._user_id_by_email.get(key)
+        if holder is not None and holder != user_id:
+            raise EmailAlreadyExists(key)
+
+    def _claim_email(self, key: str, user_id: int) -> None:
+        if key not in self._user_id_by_email:
+            self._emails.add(key)
+        self._user_id_by_email[key] = user_id
+
+    def _release_email(self, key: str, user_id: int) -> None:
+        if self._user_id_by_email.get(key) == user_id:
+            del self._user_id_by_email[key]
+            self._emails.remove(key)
+
+    def _insert_item(self, record: ItemRecord) -> None:
+        self._items_by_id[record.id] = record
+        self._items_by_creation.add(record)
+        owner_items = self._items_by_owner.get(record.owner_id)
+        if owner_items is None:
+            owner_items = self._items_by_owner[record.owner_id] = CreationIndex()
+        owner_items.add(record)
+        self._index_text(record)
+
+    def _swap_item(self, record: ItemRecord) -> None:
+        if record.id not in self._items_by_id:
+            return
+        self._items_by_id[record.id] = record
+        self._items_by_creation.replace(record)
+        self._items_by_owner[record.owner_id].replace(record)
+        self._index_text(record)
+
+    def _remove_item(self, item_id: int) -> None:
+        record = self._items_by_id.pop(item_id, None)
+        if record is None:
+            return
+        self._items_by_creation.remove(record)
+        self._search.remove(item_id)
+        self._record_versions.pop(item_id, None)
+        owner_items = self._items_by_owner.get(record.owner_id)
+        if owner_items is not None:
+            owner_items.remove(record)
+            if not owner_items:
+                del self._items_by_owner[record.owner_id]
+                self._owners.pop(record.owner_id, None)
+
+    def _remove_items_by_owner(self, owner_id: int) -> int:
+        owner_items = self._items_by_owner.pop(owner_id, None)
+        if owner_items is None:
+            return 0
+        self._owners.pop(owner_id, None)
+        for record in owner_items:
+            self._items_by_id.pop(record.id, None)
+            self._items_by_creation.remove(record)
+            self._search.remove(record.id)
+            self._record_versions.pop(record.id, None)
+        return len(owner_items)
+
+    def _index_text(self, record: ItemRecord) -> None:
+        self._search.add(record.id, record.owner_id, record.title, record.description)
+
+    # Conversions
+
+    def _intern_owner(self, owner_id: UUID) -> int:
+        owner = self._owners.setdefault(owner_id.int, owner_id)
+        return owner.int
+
+    def _item_model(self, record: ItemRecord) -> Item:
+        owner_id = self._owners.get(record.owner_id)
+        if owner_id is None:
+            # The owner's last item was deleted after this record was read.
+            owner_id = uuid_from_int(record.owner_id)
+        return record.to_model(owner_id)
+
+    # Users
+
+    def _tally(self, user: UserRecord, delta: int) -> None:
+        if user.is_active:
+            self._active_users += delta
+        if user.is_superuser:
+            self._superusers += delta
+
+    def get_user(self, user_id: UUID) -> User | None:
+        record = self._users_by_id.get(user_id.int)
+        return None if record is None else record.to_model()
+
+    def get_user_by_email(self, email: str) -> User | None:
+        user_id = self._user_id_by_email.get(email_key(email))
+        if user_id is None:
+            return None
+        record = self._users_by_id.get(user_id)
+        return None if record is None else record.to_model()
+
+    def add_user(self, user: User) -> None:
+        record = UserRecord.from_model(user)
+        with self._writing():
+            self._insert_user(record)
+
+    def add_users(self, users: list[User]) -> list[User]:
+        records = [UserRecord.from_model(user) for user in users]
+        with self._writing():
+            inserted = {record.id for record in self._insert_users(records)}
+        return [user for user in users if user.id.int in inserted]
+
+    def update_user(self, user_id: UUID, changes: dict[str, Any]) -> User | None:
+        with self._writing():
+            old = self._users_by_id.get(user_id.int)
+            if old is None:
+                return None
+            user = old.to_model().model_copy(update=changes)
+            self._swap_user(UserRecord.from_model(user))
+        return user
+
+    def delete_user(self, user_id: UUID) -> None:
+        with self._writing():
+            self._remove_user(user_id.int)
+
+    def page_users(
+        self,
+        *,
+        skip: int,
+        limit: int,
+        after: CreationKey | None,
+        filters: UserFilter = NO_USER_FILTER,
+        order_by: UserOrder = "-created_at",
+    ) -> list[User]:
+        key = _record_key(after)
+
+        def read() -> list[UserRecord]:
+            records = self._find_users(filters, order_by, key)
+            return list(islice(records, skip, skip + limit))
+
+        return [record.to_model() for record in self._read(read)]
+
+    def count_users(self, filters: UserFilter = NO_USER_FILTER) -> int:
+        if filters == NO_USER_FILTER:
+            return len(self._users_by_id)
+
+        def read() -> int:
+            if filters.email_prefix is not None:
+                return sum(1 for _ in self._users_by_prefix(filters))
+            span = self._users_by_creation.span(
+                optional_micros(filters.since), optional_micros(filters.until)
+            )
+            flags = self._flag_bits(filters)
+            return len(span) if flags is None else count_bits(flags, span)
+
+        return self._read(read)
+
+    def _flag_bits(self, filters: UserFilter) -> Bitset | None:
+        """Creation positions of users with the wanted flags, as bits."""
+        wanted = [
+            (flags, value)
+            for value, flags in (
+                (filters.is_active, self._active_bits),
+                (filters.is_superuser, self._superuser_bits),
+            )
+            if value is not None
+        ]
+        if not wanted:
+            return None
+        return select_bits(wanted, len(self._users_by_creation))
+
+    def _matches(self, filters: UserFilter) -> Callable[[UserRecord], bool]:
+        since, until = optional_micros(filters.since), optional_micros(filters.until)
+
+        def matches(record: UserRecord) -> bool:
+            return (
+                (filters.is_active is None or record.is_active == filters.is_active)
+                and (
+                    filters.is_superuser is None
+                    or record.is_superuser == filters.is_superuser
+                )
+                and (since is None or record.created_at >= since)
+                and (until is None or record.created_at < until)
+            )
+
+        return matches
+
+    def _users_by_prefix(self, filters: UserFilter) -> Iterator[UserRecord]:
+        """Users matching ``filters``, in email order, via the sorted emails."""
+        prefix = email_key(filters.email_prefix or "")
+        keys = self._emails.range(prefix, prefix + _PREFIX_END)
+        by_id, id_by_email = self._users_by_id, self._user_id_by_email
+        records = (by_id[id_by_email[key]] for key in keys)
+        return filter(self._matches(filters), records)
+
+    def _find_users(
+        self, filters: UserFilter, order_by: UserOrder, after: RecordKey | None
+    ) -> Iterator[UserRecord]:
+        """Users matching ``filters`` in listing order, lazily.
+
+        An email prefix narrows the candidates most, so it goes first;
+        otherwise creation orders walk the flag bitsets over a bisected
+        window and email orders walk the sorted emails.
+        """
+        descending = order_by.startswith("-")
+        if filters.email_prefix is not None:
+            records = list(self._users_by_prefix(filters))
+            if order_by.endswith("email"):
+                return reversed(records) if descending else iter(records)
+            records.sort(key=record_key, reverse=descending)
+            if after is not None:
+                records = [
+                    record
+                    for record in records
+                    if (
+                        record_key(record) < after
+                        if descending
+                        else record_key(record) > after
+                    )
+                ]
+            return iter(records)
+        if order_by.endswith("email"):
+            emails = reversed(self._emails) if descending else iter(self._emails)
+            by_id, id_by_email = self._users_by_id, self._user_id_by_email
+            records = (by_id[id_by_email[key]] for key in emails)
+            return filter(self._matches(filters), records)
+        index = self._users_by_creation
+        positions = index.window(
+            after=after,
+            since=optional_micros(filters.since),
+            until=optional_micros(filters.until),
+            descending=descending,
+        )
+        flags = self._flag_bits(filters)
+        if flags is not None:
+            return map(index.__getitem__, iter_bits(flags, positions))
+        return map(index.__getitem__, positions)
+
+    def user_stats(self) -> UserStats:
+        total, active, superusers = self._read(
+            lambda: (len(self._users_by_id), self._active_users, self._superusers)
+        )
+        return UserStats(total=total, active=active, superusers=superusers)
+
+    def list_users(self) -> list[User]:
+        return [record.to_model() for record in self.user_records()]
+
+    def export_users(
+        self, *, since: datetime | None, until: datetime | None
+    ) -> Iterator[User]:
+        # The snapshot is the list of record references (8 bytes a user);
+        # records are never mutated, so they are safe to read after the lock.
+        index = self._users_by_creation
+        start, stop = optional_micros(since), optional_micros(until)
+        records = self._read(lambda: index.range(start, stop))
+        return map(UserRecord.to_model, records)
+
+    # Items
+
+    def get_item(self, item_id: UUID) -> Item | None:
+        record = self._items_by_id.get(item_id.int)
+        return None if record is None else self._item_model(record)
+
+    def add_item(self, item: Item) -> None:
+        with self._writing():
+            record = ItemRecord.from_model(item, self._intern_owner(item.owner_id))
+            self._insert_item(record)
+
+    def update_item(self, item_id: UUID, changes: dict[str, Any]) -> Item | None:
+        with self._writing():
+            old = self._items_by_id.get(item_id.int)
+            if old is None:
+                return None
+            item = self._item_model(old).model_copy(update=changes)
+            # Items never change owner, so the stored record's id is interned.
+            self._swap_item(ItemRecord.from_model(item, old.owner_id))
+        return item
+
+    def delete_item(self, item_id: UUID) -> None:
+        with self._writing():
+            self._remove_item(item_id.int)
+
+    def delete_items_by_owner(self, owner_id: UUID) -> int:
+        with self._writing():
+            return self._remove_items_by_owner(owner_id.int)
+
+    def page_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        skip: int,
+        limit: int,
+        after: CreationKey | None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        order_by: ItemOrder = "-created_at",
+    ) -> list[Item]:
+        if owner_id is None:
+            index = self._items_by_creation
+        else:
+            index = self._items_by_owner.get(owner_id.int)
+            if index is None:
+                return []
+        key = _record_key(after)
+        start, stop = optional_micros(since), optional_micros(until)
+        records = self._read(
+            lambda: index.page(
+                skip=skip,
+                limit=limit,
+                after=key,
+                since=start,
+                until=stop,
+                descending=order_by == "-created_at",
+            )
+        )
+        return [self._item_model(record) for record in records]
+
+    def search_items(
+        self, query: str, *, owner_id: UUID | None, skip: int, limit: int
+    ) -> tuple[list[Item], int]:
+        ids, count = self._search.search(
+            query,
+            owner_id=None if owner_id is None else owner_id.int,
+            limit=skip + limit,
+        )
+        # An item deleted since the search ran is simply left out.
+        items = [self.get_item(uuid_from_int(item_id)) for item_id in ids[skip:]]
+        return [item for item in items if item is not None], count
+
+    def count_items(
+        self,
+        owner_id: UUID | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> int:
+        if owner_id is None:
+            index = self._items_by_creation
+        else:
+            index = self._items_by_owner.get(owner_id.int)
+            if index is None:
+                return 0
+        if since is None and until is None:
+            return len(index)
+        start, stop = optional_micros(since), optional_micros(until)
+        return self._read(lambda: len(index.span(start, stop)))
+
+    def list_items(self) -> list[Item]:
+        return [self._item_model(record) for record in self.item_records()]
+
+    def export_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Iterator[Item]:
+        if owner_id is None:
+            index = self._items_by_creation
+        else:
+            index = self._items_by_owner.get(owner_id.int)
+            if index is None:
+                return iter(())
+        start, stop = optional_micros(since), optional_micros(until)
+        records = self._read(lambda: index.range(start, stop))
+        return map(self._item_model, records)
+
+    # Change counters
+
+    def version_epoch(self) -> str:
+        return self._epoch
+
+    def record_version(self, record_id: UUID) -> int:
+        return self._record_versions.get(record_id.int, 0)
+
+    def generation(self, scope: str) -> int:
+        return self._generations.get(scope, 0)
+
+    def bump_versions(self, scopes: Iterable[str], updated: Iterable[UUID]) -> None:
+        with self._writing():
+            self._sequence += 1
+            for scope in scopes:
+                self._generations[scope] = self._sequence
+            for record_id in updated:
+                self._record_versions[record_id.int] = self._sequence
+
+    # Raw records, for subclasses that persist the store
+
+    def user_records(self) -> list[UserRecord]:
+        # Copying a dict's values is one C-level call under the GIL, so it
+        # cannot observe a concurrent resize.
+        return list(self._users_by_id.values())
+
+    def item_records(self) -> list[ItemRecord]:
+        return list(self._items_by_id.values())
+
+
+def _record_key(key: CreationKey | None) -> RecordKey | None:
+    if key is None:
+        return None
+    created_at, record_id = key
+    return (to_micros(created_at), record_id.int)
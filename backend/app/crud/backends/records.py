@@ -0,0 +1,147 @@
+"""Compact at-rest records for the memory backends.
+
+A stored pydantic model costs several times the size of its data: a
+per-instance ``__dict__`` and fields-set, a boxed ``UUID`` and an aware
+``datetime``. ``MemoryStorage`` keeps these slotted records instead, with
+ids as ``UUID.int`` and timestamps as integer microseconds, and only builds
+models when a record leaves the store.
+"""
+
+from typing import Any
+from uuid import UUID, SafeUUID
+
+from pydantic import BaseModel
+
+from app.crud.backends.base import from_micros, to_micros
+from app.models import Item, User
+
+_new = object.__new__
+_set = object.__setattr__
+
+
+def uuid_from_int(value: int) -> UUID:
+    """``UUID(int=value)`` without re-checking a value that came from a UUID."""
+    uuid = _new(UUID)
+    _set(uuid, "int", value)
+    _set(uuid, "is_safe", SafeUUID.unknown)
+    return uuid
+
+
+def _construct[M: BaseModel](cls: type[M], values: dict[str, Any]) -> M:
+    """``cls.model_construct(**values)`` for values that set every field.
+
+    Skips the per-field alias and default pass, which dominates the cost of
+    building a model from stored data.
+    """
+    model = _new(cls)
+    _set(model, "__dict__", values)
+    _set(model, "__pydantic_fields_set__", set(values))
+    _set(model, "__pydantic_extra__", None)
+    _set(model, "__pydantic_private__", None)
+    return model
+
+
+class UserRecord:
+    __slots__ = (
+        "id",
+        "email",
+        "full_name",
+        "hashed_password",
+        "is_active",
+        "is_superuser",
+        "created_at",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        email: str,
+        full_name: str | None,
+        hashed_password: str,
+        is_active: bool,
+        is_superuser: bool,
+        created_at: int,
+    ) -> None:
+        self.id = id
+        self.email = email
+        self.full_name = full_name
+        self.hashed_password = hashed_password
+        self.is_active = is_active
+        self.is_superuser = is_superuser
+        self.created_at = created_at
+
+    @classmethod
+    def from_model(cls, user: User) -> "UserRecord":
+        return cls(
+            user.id.int,
+            user.email,
+            user.full_name,
+            user.hashed_password,
+            user.is_active,
+            user.is_superuser,
+            to_micros(user.created_at),
+        )
+
+    def to_model(self) -> User:
+        return _construct(
+            User,
+            {
+                "email": self.email,
+                "full_name": self.full_name,
+                "is_active": self.is_active,
+                "is_superuser": self.is_superuser,
+                "id": uuid_from_int(self.id),
+                "hashed_password": self.hashed_password,
+                "created_at": from_micros(self.created_at),
+            },
+        )
+
+
+class ItemRecord:
+    __slots__ = ("id", "owner_id", "created_at", "title", "description")
+
+    def __init__(
+        self,
+        id: int,
+        owner_id: int,
+        created_at: int,
+        title: str,
+        description: str | None,
+    ) -> None:
+        self.id = id
+        self.owner_id = owner_id
+        self.created_at = created_at
+        self.title = title
+        self.description = description
+
+    @classmethod
+    def from_model(cls, item: Item, owner_id: int) -> "ItemRecord":
+        """Build a record; ``owner_id`` is the store's interned ``owner_id.int``."""
+        return cls(
+            item.id.int,
+            owner_id,
+            to_micros(item.created_at),
+            item.title,
+            item.description,
+        )
+
+    def to_model(self, owner_id: UUID) -> Item:
+        return item_model(
+            self.id, owner_id, self.created_at, self.title, self.description
+        )
+
+
+def item_model(
+    id: int, owner_id: UUID, created_at: int, title: str, description: str | None
+) -> Item:
+    """Build an ``Item`` from stored fields, for stores without ``ItemRecord``s."""
+    return _construct(
+        Item,
+        {
+            "title": title,
+            "description": description,
+            "id": uuid_from_int(id),
+            "owner_id": owner_id,
+            "created_at": from_micros(created_at),
+        },
+    )
@@ -0,0 +1,691 @@
+import sqlite3
+import threading
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from app.crud.backends.base import (
+    NO_USER_FILTER,
+    EmailAlreadyExists,
+    Storage,
+    UserFilter,
+    email_key,
+    from_micros,
+    optional_micros,
+    to_micros,
+)
+from app.crud.indexes import CreationKey
+from app.crud.search import MIN_PREFIX, tokenize
+from app.models import Item, ItemOrder, User, UserOrder, UserStats
+
+# Ids are stored as their 16 raw bytes so that BLOB ordering matches UUID
+# ordering, and timestamps as integer microseconds since the epoch.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id BLOB PRIMARY KEY,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL,
+    full_name TEXT,
+    is_active INTEGER NOT NULL,
+    is_superuser INTEGER NOT NULL,
+    hashed_password TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_key ON users (email_key);
+CREATE INDEX IF NOT EXISTS ix_users_created ON users (created_at, id);
+-- Each flag index carries the other flag, so filtering on both stays covered.
+CREATE INDEX IF NOT EXISTS ix_users_active_created
+ON users (is_active, created_at, id, is_superuser);
+CREATE INDEX IF NOT EXISTS ix_users_superuser_created
+ON users (is_superuser, created_at, id, is_active);
+
+CREATE TABLE IF NOT EXISTS items (
+    id BLOB PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    owner_id BLOB NOT NULL,
+    created_at INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_items_owner_created ON items (owner_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_items_created ON items (created_at, id);
+
+-- Counters kept by triggers so stats stay O(1).
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value)
+VALUES ('users', 0), ('active', 0), ('superusers', 0), ('items', 0);
+
+CREATE TRIGGER IF NOT EXISTS tr_users_insert AFTER INSERT ON users BEGIN
+    UPDATE counters SET value = value + 1 WHERE name = 'users';
+    UPDATE counters SET value = value + NEW.is_active WHERE name = 'active';
+    UPDATE counters SET value = value + NEW.is_superuser WHERE name = 'superusers';
+END;
+CREATE TRIGGER IF NOT EXISTS tr_users_update AFTER UPDATE ON users BEGIN
+    UPDATE counters SET value = value - OLD.is_active + NEW.is_active
+    WHERE name = 'active';
+    UPDATE counters SET value = value - OLD.is_superuser + NEW.is_superuser
+    WHERE name = 'superusers';
+END;
+CREATE TRIGGER IF NOT EXISTS tr_users_delete AFTER DELETE ON users BEGIN
+    UPDATE counters SET value = value - 1 WHERE name = 'users';
+    UPDATE counters SET value = value - OLD.is_active WHERE name = 'active';
+    UPDATE counters SET value = value - OLD.is_superuser WHERE name = 'superusers';
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_insert AFTER INSERT ON items BEGIN
+    UPDATE counters SET value = value + 1 WHERE name = 'items';
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_delete AFTER DELETE ON items BEGIN
+    UPDATE counters SET value = value - 1 WHERE name = 'items';
+END;
+
+-- Change counters behind conditional requests (see app.crud.versions): the
+-- sequence and the epoch sit in counters, the last number stamped on each
+-- list scope and each updated record in their own tables. A deleted record
+-- takes its version with it.
+CREATE TABLE IF NOT EXISTS generations (
+    scope TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS record_versions (
+    id BLOB PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO counters (name, value)
+VALUES ('version_sequence', 0), ('version_epoch', random() & 4294967295);
+CREATE TRIGGER IF NOT EXISTS tr_users_delete_version AFTER DELETE ON users BEGIN
+    DELETE FROM record_versions WHERE id = OLD.id;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_delete_version AFTER DELETE ON items BEGIN
+    DELETE FROM record_versions WHERE id = OLD.id;
+END;
+
+-- Keyword search. FTS5 rows need integer rowids and items has none, so
+-- item_docs numbers the items; triggers keep both tables in step. The owner
+-- is indexed as a hex token, so an owner filter is one more posting list
+-- to intersect rather than a lookup per match.
+CREATE TABLE IF NOT EXISTS item_docs (
+    doc INTEGER PRIMARY KEY,
+    item_id BLOB NOT NULL UNIQUE
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, description, owner,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+-- Titles weigh double, as in SearchIndex.
+INSERT INTO items_fts (items_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0, 0.0)');
+CREATE TRIGGER IF NOT EXISTS tr_items_fts_insert AFTER INSERT ON items BEGIN
+    INSERT INTO item_docs (item_id) VALUES (NEW.id);
+    INSERT INTO items_fts (rowid, title, description, owner)
+    VALUES (last_insert_rowid(), NEW.title, NEW.description, hex(NEW.owner_id));
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_fts_update
+AFTER UPDATE OF title, description ON items BEGIN
+    UPDATE items_fts SET title = NEW.title, description = NEW.description
+    WHERE rowid = (SELECT doc FROM item_docs WHERE item_id = NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_fts_delete AFTER DELETE ON items BEGIN
+    DELETE FROM items_fts
+    WHERE rowid = (SELECT doc FROM item_docs WHERE item_id = OLD.id);
+    DELETE FROM item_docs WHERE item_id = OLD.id;
+END;
+"""
+
+# Indexes items stored before the search tables existed.
+_BACKFILL_SEARCH = """
+BEGIN;
+INSERT INTO item_docs (item_id) SELECT id FROM items ORDER BY created_at, id;
+INSERT INTO items_fts (rowid, title, description, owner)
+SELECT d.doc, i.title, i.description, hex(i.owner_id)
+FROM item_docs AS d JOIN items AS i ON i.id = d.item_id;
+COMMIT;
+"""
+
+# Statements are module constants so each connection's statement cache
+# (sqlite3's ``cached_statements``) prepares them once and reuses them.
+_USER_COLUMNS = (
+    "id, email, full_name, is_active, is_superuser, hashed_password, created_at"
+)
+_SELECT_USER = f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?"
+_SELECT_USER_BY_EMAIL = f"SELECT {_USER_COLUMNS} FROM users WHERE email_key = ?"
+_INSERT_USER = (
+    "INSERT INTO users (id, email, email_key, full_name, is_active, is_superuser, "
+    "hashed_password, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_UPDATABLE_USER_COLUMNS = frozenset(
+    {"email", "email_key", "full_name", "is_active", "is_superuser", "hashed_password"}
+)
+_DELETE_USER = "DELETE FROM users WHERE id = ?"
+_LIST_USERS = f"SELECT {_USER_COLUMNS} FROM users"
+
+_ITEM_COLUMNS = "id, title, description, owner_id, created_at"
+_SELECT_ITEM = f"SELECT {_ITEM_COLUMNS} FROM items WHERE id = ?"
+_INSERT_ITEM = (
+    "INSERT INTO items (id, title, description, owner_id, created_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_UPDATABLE_ITEM_COLUMNS = frozenset({"title", "description"})
+_DELETE_ITEM = "DELETE FROM items WHERE id = ?"
+_DELETE_ITEMS_BY_OWNER = "DELETE FROM items WHERE owner_id = ?"
+_LIST_ITEMS = f"SELECT {_ITEM_COLUMNS} FROM items"
+# Matches are ranked and paged inside FTS5; only the page is joined to items.
+_SEARCH_PAGE = (
+    "SELECT rowid AS doc, rank FROM items_fts WHERE items_fts MATCH ? "
+    "ORDER BY rank, rowid DESC LIMIT ? OFFSET ?"
+)
+_SEARCH_COLUMNS = ", ".join(f"i.{column}" for column in _ITEM_COLUMNS.split(", "))
+_SEARCH_ITEMS = (
+    f"SELECT {_SEARCH_COLUMNS} FROM ({_SEARCH_PAGE}) AS hit "
+    "JOIN item_docs AS d ON d.doc = hit.doc JOIN items AS i ON i.id = d.item_id "
+    "ORDER BY hit.rank, hit.doc DESC"
+)
+_COUNT_SEARCH_ITEMS = "SELECT COUNT(*) FROM items_fts WHERE items_fts MATCH ?"
+
+# Rows fetched per step while streaming an export.
+_EXPORT_CHUNK = 1000
+
+_SELECT_COUNTERS = "SELECT name, value FROM counters"
+_SELECT_COUNTER = "SELECT value FROM counters WHERE name = ?"
+
+_SELECT_GENERATION = "SELECT version FROM generations WHERE scope = ?"
+_SELECT_RECORD_VERSION = "SELECT version FROM record_versions WHERE id = ?"
+_NEXT_VERSION = (
+    "UPDATE counters SET value = value + 1 WHERE name = 'version_sequence' "
+    "RETURNING value"
+)
+_SET_GENERATION = "INSERT OR REPLACE INTO generations (scope, version) VALUES (?, ?)"
+_SET_RECORD_VERSION = (
+    "INSERT OR REPLACE INTO record_versions (id, version) VALUES (?, ?)"
+)
+
+
+# Upper bound for an email prefix range; sorts after any real character.
+_PREFIX_END = "\U0010ffff"
+# Filtered listings are assembled from these parts. Each combination always
+# yields the same text, so the statement cache still prepares it once.
+_ORDER_SQL = {
+    "-created_at": "created_at DESC, id DESC",
+    "created_at": "created_at, id",
+    "email": "email_key",
+    "-email": "email_key DESC",
+}
+
+
+class _Where:
+    """Conditions and their parameters for a filtered listing."""
+
+    def __init__(self) -> None:
+        self.conditions: list[str] = []
+        self.params: list[Any] = []
+
+    def add(self, condition: str, *params: Any) -> None:
+        self.conditions.append(condition)
+        self.params.extend(params)
+
+    def created(self, since: datetime | None, until: datetime | None) -> "_Where":
+        if since is not None:
+            self.add("created_at >= ?", to_micros(since))
+        if until is not None:
+            self.add("created_at < ?", to_micros(until))
+        return self
+
+    def after(self, key: CreationKey | None, descending: bool) -> "_Where":
+        if key is not None:
+            created_at, record_id = key
+            op = "<" if descending else ">"
+            self.add(
+                f"(created_at, id) {op} (?, ?)", to_micros(created_at), record_id.bytes
+            )
+        return self
+
+    def sql(self) -> str:
+        return f" WHERE {' AND '.join(self.conditions)}" if self.conditions else ""
+
+
+def _user_filter(filters: UserFilter) -> _Where:
+    where = _Where().created(filters.since, filters.until)
+    if filters.is_active is not None:
+        where.add("is_active = ?", filters.is_active)
+    if filters.is_superuser is not None:
+        where.add("is_superuser = ?", filters.is_superuser)
+    if filters.email_prefix is not None:
+        key = email_key(filters.email_prefix)
+        where.add("email_key >= ? AND email_key < ?", key, key + _PREFIX_END)
+    return where
+
+
+def _item_filter(
+    owner_id: UUID | None, since: datetime | None, until: datetime | None
+) -> _Where:
+    where = _Where().created(since, until)
+    if owner_id is not None:
+        where.add("owner_id = ?", owner_id.bytes)
+    return where
+
+
+def _row_to_user(row: tuple) -> User:
+    # Rows were validated on the way in, so skip validation on the way out.
+    return User.model_construct(
+        id=UUID(bytes=row[0]),
+        email=row[1],
+        full_name=row[2],
+        is_active=bool(row[3]),
+        is_superuser=bool(row[4]),
+        hashed_password=row[5],
+        created_at=from_micros(row[6]),
+    )
+
+
+def _row_to_item(row: tuple) -> Item:
+    return Item.model_construct(
+        id=UUID(bytes=row[0]),
+        title=row[1],
+        description=row[2],
+        owner_id=UUID(bytes=row[3]),
+        created_at=from_micros(row[4]),
+    )
+
+
+def _match_expression(query: str, owner_id: UUID | None) -> str | None:
+    """FTS5 query matching the same items as ``SearchIndex`` would."""
+    terms = dict.fromkeys(tokenize(query))
+    if not terms:
+        return None
+    # Tokens are bare letters and digits, so quoting them is enough escaping.
+    phrases = " ".join(
+        f'"{term}"*' if len(term) >= MIN_PREFIX else f'"{term}"' for term in terms
+    )
+    match = f"{{title description}} : ({phrases})"
+    if owner_id is None:
+        return match
+    return f'owner : "{owner_id.hex}" AND {match}'  # the tokenizer folds case
+
+
+def _stream[T](
+    conn: sqlite3.Connection,
+    cursor: sqlite3.Cursor,
+    row_to_model: Callable[[tuple], T],
+) -> Iterator[T]:
+    try:
+        while rows := cursor.fetchmany(_EXPORT_CHUNK):
+            yield from map(row_to_model, rows)
+    finally:
+        conn.close()  # ends the read transaction
+
+
+class _ConnectionOwner:
+    """Held only by a thread's ``_local``, so it dies with the thread."""
+
+    __slots__ = ("__weakref__", "conn")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+
+def _release(
+    connections: list[sqlite3.Connection],
+    lock: threading.Lock,
+    conn: sqlite3.Connection,
+) -> None:
+    """Close an exited thread's connection, so that threadpools replacing
+    their workers do not pile up connections and file descriptors."""
+    with lock:
+        for i, live in enumerate(connections):
+            if live is conn:
+                del connections[i]
+                break
+    conn.close()
+
+
+class SQLiteStorage(Storage):
+    """Embedded SQLite store shared by every worker process on one host.
+
+    Each thread gets its own connection (sqlite3 connections must not be
+    shared across threads); the database runs in WAL mode so readers never
+    block the single writer.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        conn = self._conn()
+        searchable = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'items_fts'"
+        ).fetchone()
+        conn.executescript(_SCHEMA)
+        if searchable is None:
+            conn.executescript(_BACKFILL_SEARCH)
+
+    def _conn(self) -> sqlite3.Connection:
+        try:
+            return self._local.owner.conn
+        except AttributeError:
+            conn = sqlite3.connect(
+                self._path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=128,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            owner = self._local.owner = _ConnectionOwner(conn)
+            weakref.finalize(
+                owner, _release, self._connections, self._connections_lock, conn
+            )
+            with self._connections_lock:
+                self._connections.append(conn)
+            return conn
+
+    def _export[T](
+        self,
+        table: str,
+        columns: str,
+        row_to_model: Callable[[tuple], T],
+        since: datetime | None,
+        until: datetime | None,
+        owner_id: UUID | None = None,
+    ) -> Iterator[T]:
+        """Stream rows from a read transaction on a connection of its own.
+
+        WAL gives the transaction a fixed snapshot without blocking writers,
+        and the private connection lets the iterator move between threads.
+        """
+        clauses, params = [], []
+        if owner_id is not None:
+            clauses.append("owner_id = ?")
+            params.append(owner_id.bytes)
+        for clause, micros in (
+            ("created_at >= ?", optional_micros(since)),
+            ("created_at < ?", optional_micros(until)),
+        ):
+            if micros is not None:
+                clauses.append(clause)
+                params.append(micros)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {columns} FROM {table}{where} ORDER BY created_at, id"
+
+        conn = sqlite3.connect(
+            self._path, isolation_level=None, check_same_thread=False
+        )
+        try:
+            conn.execute("BEGIN")
+            # The first step of the query fixes the snapshot, so it is taken
+            # now rather than when the caller starts iterating.
+            cursor = conn.execute(sql, params)
+        except BaseException:
+            conn.close()
+            raise
+        return _stream(conn, cursor, row_to_model)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        if conn.in_transaction:
+            # Nested in a batch: the outer transaction commits.
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # Users
+
+    def get_user(self, user_id: UUID) -> User | None:
+        row = self._conn().execute(_SELECT_USER, (user_id.bytes,)).fetchone()
+        return None if row is None else _row_to_user(row)
+
+    def get_user_by_email(self, email: str) -> User | None:
+        row = (
+            self._conn().execute(_SELECT_USER_BY_EMAIL, (email_key(email),)).fetchone()
+        )
+        return None if row is None else _row_to_user(row)
+
+    @contextmanager
+    def _unique_email(self, email: str) -> Iterator[None]:
+        """Turn a clash on the unique email index into ``EmailAlreadyExists``.
+
+        Only the failed statement is undone; a batch around it carries on.
+        """
+        try:
+            yield
+        except sqlite3.IntegrityError as e:
+            if "users.email_key" not in str(e):
+                raise
+            raise EmailAlreadyExists(email_key(email)) from None
+
+    def add_user(self, user: User) -> None:
+        with self._unique_email(user.email):
+            self._conn().execute(
+                _INSERT_USER,
+                (
+                    user.id.bytes,
+                    user.email,
+                    email_key(user.email),
+                    user.full_name,
+                    user.is_active,
+                    user.is_superuser,
+                    user.hashed_password,
+                    to_micros(user.created_at),
+                ),
+            )
+
+    def update_user(self, user_id: UUID, changes: dict[str, Any]) -> User | None:
+        columns = dict(sorted(changes.items()))
+        if "email" in columns:
+            columns["email_key"] = email_key(columns["email"])
+        unknown = columns.keys() - _UPDATABLE_USER_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update users.{', '.join(sorted(unknown))}")
+        # One text per set of columns, so the statement cache still applies.
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with self._transaction() as conn, self._unique_email(changes.get("email", "")):
+            if columns:
+                conn.execute(
+                    f"UPDATE users SET {assignments} WHERE id = ?",
+                    (*columns.values(), user_id.bytes),
+                )
+            row = conn.execute(_SELECT_USER, (user_id.bytes,)).fetchone()
+        return None if row is None else _row_to_user(row)
+
+    def delete_user(self, user_id: UUID) -> None:
+        self._conn().execute(_DELETE_USER, (user_id.bytes,))
+
+    def page_users(
+        self,
+        *,
+        skip: int,
+        limit: int,
+        after: CreationKey | None,
+        filters: UserFilter = NO_USER_FILTER,
+        order_by: UserOrder = "-created_at",
+    ) -> list[User]:
+        where = _user_filter(filters).after(after, order_by.startswith("-"))
+        sql = (
+            f"SELECT {_USER_COLUMNS} FROM users{where.sql()} "
+            f"ORDER BY {_ORDER_SQL[order_by]} LIMIT ? OFFSET ?"
+        )
+        cursor = self._conn().execute(sql, (*where.params, limit, skip))
+        return [_row_to_user(row) for row in cursor]
+
+    def count_users(self, filters: UserFilter = NO_USER_FILTER) -> int:
+        conn = self._conn()
+        if filters == NO_USER_FILTER:
+            return conn.execute(_SELECT_COUNTER, ("users",)).fetchone()[0]
+        where = _user_filter(filters)
+        sql = f"SELECT COUNT(*) FROM users{where.sql()}"
+        return conn.execute(sql, where.params).fetchone()[0]
+
+    def user_stats(self) -> UserStats:
+        counters = dict(self._conn().execute(_SELECT_COUNTERS).fetchall())
+        return UserStats(
+            total=counters["users"],
+            active=counters["active"],
+            superusers=counters["superusers"],
+        )
+
+    def list_users(self) -> list[User]:
+        return [_row_to_user(row) for row in self._conn().execute(_LIST_USERS)]
+
+    def export_users(
+        self, *, since: datetime | None, until: datetime | None
+    ) -> Iterator[User]:
+        return self._export("users", _USER_COLUMNS, _row_to_user, since, until)
+
+    # Items
+
+    def get_item(self, item_id: UUID) -> Item | None:
+        row = self._conn().execute(_SELECT_ITEM, (item_id.bytes,)).fetchone()
+        return None if row is None else _row_to_item(row)
+
+    def add_item(self, item: Item) -> None:
+        self._conn().execute(
+            _INSERT_ITEM,
+            (
+                item.id.bytes,
+                item.title,
+                item.description,
+                item.owner_id.bytes,
+                to_micros(item.created_at),
+            ),
+        )
+
+    def update_item(self, item_id: UUID, changes: dict[str, Any]) -> Item | None:
+        columns = dict(sorted(changes.items()))
+        unknown = columns.keys() - _UPDATABLE_ITEM_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update items.{', '.join(sorted(unknown))}")
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with self._transaction() as conn:
+            if columns:
+                conn.execute(
+                    f"UPDATE items SET {assignments} WHERE id = ?",
+                    (*columns.values(), item_id.bytes),
+                )
+            row = conn.execute(_SELECT_ITEM, (item_id.bytes,)).fetchone()
+        return None if row is None else _row_to_item(row)
+
+    def delete_item(self, item_id: UUID) -> None:
+        self._conn().execute(_DELETE_ITEM, (item_id.bytes,))
+
+    def delete_items_by_owner(self, owner_id: UUID) -> int:
+        return self._conn().execute(_DELETE_ITEMS_BY_OWNER, (owner_id.bytes,)).rowcount
+
+    def page_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        skip: int,
+        limit: int,
+        after: CreationKey | None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        order_by: ItemOrder = "-created_at",
+    ) -> list[Item]:
+        where = _item_filter(owner_id, since, until)
+        where.after(after, order_by == "-created_at")
+        sql = (
+            f"SELECT {_ITEM_COLUMNS} FROM items{where.sql()} "
+            f"ORDER BY {_ORDER_SQL[order_by]} LIMIT ? OFFSET ?"
+        )
+        cursor = self._conn().execute(sql, (*where.params, limit, skip))
+        return [_row_to_item(row) for row in cursor]
+
+    def search_items(
+        self, query: str, *, owner_id: UUID | None, skip: int, limit: int
+    ) -> tuple[list[Item], int]:
+        match = _match_expression(query, owner_id)
+        if match is None:
+            return [], 0
+        conn = self._conn()
+        rows = conn.execute(_SEARCH_ITEMS, (match, limit, skip)).fetchall()
+        count = conn.execute(_COUNT_SEARCH_ITEMS, (match,)).fetchone()[0]
+        return [_row_to_item(row) for row in rows], count
+
+    def count_items(
+        self,
+        owner_id: UUID | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> int:
+        conn = self._conn()
+        if owner_id is None and since is None and until is None:
+            return conn.execute(_SELECT_COUNTER, ("items",)).fetchone()[0]
+        where = _item_filter(owner_id, since, until)
+        sql = f"SELECT COUNT(*) FROM items{where.sql()}"
+        return conn.execute(sql, where.params).fetchone()[0]
+
+    def list_items(self) -> list[Item]:
+        return [_row_to_item(row) for row in self._conn().execute(_LIST_ITEMS)]
+
+    def export_items(
+        self,
+        *,
+        owner_id: UUID | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Iterator[Item]:
+        return self._export(
+            "items", _ITEM_COLUMNS, _row_to_item, since, until, owner_id
+        )
+
+    # Change counters
+
+    def version_epoch(self) -> str:
+        conn = self._conn()
+        return f"{conn.execute(_SELECT_COUNTER, ('version_epoch',)).fetchone()[0]:08x}"
+
+    def record_version(self, record_id: UUID) -> int:
+        conn = self._conn()
+        row = conn.execute(_SELECT_RECORD_VERSION, (record_id.bytes,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def generation(self, scope: str) -> int:
+        row = self._conn().execute(_SELECT_GENERATION, (scope,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def bump_versions(self, scopes: Iterable[str], updated: Iterable[UUID]) -> None:
+        with self._transaction() as conn:
+            (sequence,) = conn.execute(_NEXT_VERSION).fetchone()
+            conn.executemany(_SET_GENERATION, [(scope, sequence) for scope in scopes])
+            conn.executemany(
+                _SET_RECORD_VERSION,
+                [(record_id.bytes, sequence) for record_id in updated],
+            )
+
+    # Lifecycle
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self._transaction():
+            yield
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM items")
+            conn.execute("DELETE FROM users")
+            conn.execute("DELETE FROM generations")
+            conn.execute("DELETE FROM record_versions")
+            conn.execute(
+                "UPDATE counters SET value = CASE name"
+                " WHEN 'version_sequence' THEN 0 ELSE random() & 4294967295 END"
+                " WHERE name IN ('version_sequence', 'version_epoch')"
+            )
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
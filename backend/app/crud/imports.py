@@ -0,0 +1,326 @@
+"""Streaming imports of items and users from NDJSON or CSV.
+
+Input is consumed incrementally and settled in chunks of
+``IMPORT_CHUNK_SIZE`` records: each chunk is validated in one adapter call,
+then committed in one storage batch before more input is read, so memory
+stays flat and a slow store pushes back on the sender. ``committed`` in the
+progress counts settled records, so an interrupted import resumes by
+sending the same input again with ``skip=committed``.
+"""
+
+import codecs
+import csv
+from collections import OrderedDict
+from collections.abc import AsyncIterable, Awaitable, Callable
+from functools import partial
+from operator import attrgetter
+from typing import Any, Literal
+from uuid import UUID
+
+import anyio
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.core.config import settings
+from app.core.hashing import hasher_pool
+from app.crud.backends.base import email_key
+from app.crud.items import insert_items
+from app.crud.users import create_users, get_user, get_user_by_email
+from app.models import (
+    ImportFailure,
+    ImportProgress,
+    Item,
+    ItemImport,
+    UserCreate,
+)
+
+type ImportFormat = Literal["ndjson", "csv"]
+type _Chunk[M] = list[tuple[int, M]]
+
+# Progress of recent imports by client-chosen id, for resuming after a drop.
+_MAX_TRACKED = 1000
+_progress: OrderedDict[str, ImportProgress] = OrderedDict()
+
+
+def track_import(progress: ImportProgress) -> None:
+    if progress.import_id is None:
+        return
+    _progress[progress.import_id] = progress
+    _progress.move_to_end(progress.import_id)
+    while len(_progress) > _MAX_TRACKED:
+        _progress.popitem(last=False)
+
+
+def get_import_progress(import_id: str) -> ImportProgress | None:
+    return _progress.get(import_id)
+
+
+# Parsing
+
+
+class _NDJSONParser:
+    """Splits a byte stream into non-blank lines, each one record."""
+
+    def __init__(self) -> None:
+        self._pending = b""
+
+    def feed(self, data: bytes, *, final: bool = False) -> list[bytes]:
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        if final:
+            lines.append(self._pending)
+        return [line for line in lines if line.strip()]
+
+
+class _CSVParser:
+    """Splits a byte stream into CSV rows, keeping quoted newlines intact.
+
+    Only whole records are handed to ``csv.reader``: a physical line that
+    leaves an odd number of quotes open is held back with the next one.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._pending = ""
+        self._open: list[str] = []  # lines of a record still inside quotes
+        self._quotes = 0
+
+    def feed(self, data: bytes, *, final: bool = False) -> list[list[str]]:
+        *lines, self._pending = (
+            self._pending + self._decoder.decode(data, final=final)
+        ).split("\n")
+        if final and self._pending:
+            lines.append(self._pending)
+        complete: list[str] = []
+        for line in lines:
+            self._open.append(line + "\n")
+            self._quotes += line.count('"')
+            if not self._quotes & 1:
+                complete.extend(self._open)
+                self._open.clear()
+                self._quotes = 0
+        if final:
+            complete.extend(self._open)  # unterminated quote: let csv report it
+        return [row for row in csv.reader(complete) if row]
+
+
+# Validation
+
+
+def _describe(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    field = ".".join(map(str, error["loc"]))
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def _renumber[M](raw: _Chunk[Any], values: list[M]) -> _Chunk[M]:
+    return [(n, value) for (n, _), value in zip(raw, values, strict=True)]
+
+
+class _Rows[M: BaseModel]:
+    """Validates a chunk of raw records into ``M`` in one adapter call.
+
+    On a validation error the chunk is re-validated record by record to
+    attribute each failure to its record.
+    """
+
+    def __init__(self, model: type[M]) -> None:
+        self._one = TypeAdapter(model)
+        self._many = TypeAdapter(list[model])
+
+    def from_json(self, raw: _Chunk[bytes]) -> tuple[_Chunk[M], list[ImportFailure]]:
+        lines = [line for _, line in raw]
+        try:
+            # Records are non-blank lines, so an array that parses to as many
+            # elements as there are lines has exactly one element per line.
+            values = self._many.validate_json(b"[" + b",".join(lines) + b"]")
+            if len(values) == len(raw):
+                return _renumber(raw, values), []
+        except ValidationError:
+            pass
+        return self._each(raw, self._one.validate_json)
+
+    def from_python(
+        self, raw: _Chunk[dict[str, Any]]
+    ) -> tuple[_Chunk[M], list[ImportFailure]]:
+        try:
+            values = self._many.validate_python([row for _, row in raw])
+        except ValidationError:
+            return self._each(raw, self._one.validate_python)
+        return _renumber(raw, values), []
+
+    def _each[R](
+        self, raw: _Chunk[R], validate: Callable[[R], M]
+    ) -> tuple[_Chunk[M], list[ImportFailure]]:
+        valid: _Chunk[M] = []
+        failures: list[ImportFailure] = []
+        for n, record in raw:
+            try:
+                valid.append((n, validate(record)))
+            except ValidationError as exc:
+                failures.append(ImportFailure(record=n, detail=_describe(exc)))
+        return valid, failures
+
+
+_item_rows = _Rows(ItemImport)
+_user_rows = _Rows(UserCreate)
+
+
+# Driver
+
+
+async def _run[M: BaseModel](
+    body: AsyncIterable[bytes],
+    *,
+    fmt: ImportFormat,
+    rows: _Rows[M],
+    commit: Callable[[_Chunk[M]], Awaitable[list[ImportFailure]]],
+    progress: ImportProgress,
+    skip: int,
+    on_commit: Callable[[ImportProgress], None] | None,
+) -> ImportProgress:
+    parser = _NDJSONParser() if fmt == "ndjson" else _CSVParser()
+    validate = rows.from_json if fmt == "ndjson" else rows.from_python
+    header: list[str] | None = None
+    record = 0
+    raw: list[tuple[int, Any]] = []
+    rejected: list[ImportFailure] = []  # failed before validation
+    progress.committed = max(progress.committed, skip)
+    track_import(progress)
+
+    async def settle() -> None:
+        valid, failures = await anyio.to_thread.run_sync(validate, raw)
+        refused = await commit(valid)
+        failures += rejected + refused
+        progress.imported += len(valid) - len(refused)
+        progress.failed += len(failures)
+        room = settings.IMPORT_MAX_ERRORS - len(progress.errors)
+        if room > 0:
+            failures.sort(key=attrgetter("record"))
+            progress.errors.extend(failures[:room])
+        progress.committed = record
+        raw.clear()
+        rejected.clear()
+        if on_commit is not None:
+            on_commit(progress)
+
+    async def take(records: list) -> None:
+        nonlocal header, record
+        for value in records:
+            if fmt == "csv" and header is None:
+                header = value
+                continue
+            record += 1
+            if record <= skip:
+                continue
+            if header is None:
+                raw.append((record, value))
+            elif len(value) != len(header):
+                detail = f"Expected {len(header)} columns, got {len(value)}"
+                rejected.append(ImportFailure(record=record, detail=detail))
+            else:
+                # Empty cells mean "not given", so optional fields get defaults.
+                cells = zip(header, value, strict=True)
+                raw.append((record, {name: cell for name, cell in cells if cell}))
+            if len(raw) + len(rejected) >= settings.IMPORT_CHUNK_SIZE:
+                await settle()
+
+    async for data in body:
+        await take(parser.feed(data))
+    await take(parser.feed(b"", final=True))
+    if raw or rejected:
+        await settle()
+    progress.done = True
+    if on_commit is not None:
+        on_commit(progress)
+    return progress
+
+
+async def import_items(
+    body: AsyncIterable[bytes],
+    *,
+    fmt: ImportFormat,
+    owner_id: UUID,
+    skip: int = 0,
+    import_id: str | None = None,
+    on_commit: Callable[[ImportProgress], None] | None = None,
+) -> ImportProgress:
+    """Import items; rows without an ``owner_id`` belong to ``owner_id``."""
+    known_owners = {owner_id}
+
+    def insert(rows: _Chunk[ItemImport]) -> list[ImportFailure]:
+        items: list[Item] = []
+        failures: list[ImportFailure] = []
+        for n, row in rows:
+            owner = row.owner_id or owner_id
+            if owner not in known_owners:
+                if get_user(user_id=owner) is None:
+                    failures.append(ImportFailure(record=n, detail="Owner not found"))
+                    continue
+                known_owners.add(owner)
+            items.append(
+                Item(title=row.title, description=row.description, owner_id=owner)
+            )
+        insert_items(items=items)
+        return failures
+
+    async def commit(rows: _Chunk[ItemImport]) -> list[ImportFailure]:
+        return await anyio.to_thread.run_sync(insert, rows)
+
+    return await _run(
+        body,
+        fmt=fmt,
+        rows=_item_rows,
+        commit=commit,
+        progress=ImportProgress(import_id=import_id, kind="items"),
+        skip=skip,
+        on_commit=on_commit,
+    )
+
+
+async def import_users(
+    body: AsyncIterable[bytes],
+    *,
+    fmt: ImportFormat,
+    skip: int = 0,
+    import_id: str | None = None,
+    on_commit: Callable[[ImportProgress], None] | None = None,
+) -> ImportProgress:
+    """Import users, hashing their passwords on the shared hashing pool."""
+
+    def new_users(
+        rows: _Chunk[UserCreate],
+    ) -> tuple[_Chunk[UserCreate], list[ImportFailure]]:
+        fresh: _Chunk[UserCreate] = []
+        failures: list[ImportFailure] = []
+        seen: set[str] = set()
+        for n, row in rows:
+            key = email_key(row.email)
+            if key in seen or get_user_by_email(email=row.email) is not None:
+                failures.append(ImportFailure(record=n, detail="Email already exists"))
+                continue
+            seen.add(key)
+            fresh.append((n, row))
+        return fresh, failures
+
+    async def commit(rows: _Chunk[UserCreate]) -> list[ImportFailure]:
+        fresh, failures = await anyio.to_thread.run_sync(new_users, rows)
+        users_in = [row for _, row in fresh]
+        hashed = await hasher_pool.hash_many([row.password for row in users_in])
+        created = await anyio.to_thread.run_sync(
+            partial(create_users, users_in=users_in, hashed_passwords=hashed)
+        )
+        # Emails another request took while this chunk was being hashed.
+        stored = {email_key(user.email) for user in created}
+        for n, row in fresh:
+            if email_key(row.email) not in stored:
+                failures.append(ImportFailure(record=n, detail="Email already exists"))
+        return failures
+
+    return await _run(
+        body,
+        fmt=fmt,
+        rows=_user_rows,
+        commit=commit,
+        progress=ImportProgress(import_id=import_id, kind="users"),
+        skip=skip,
+        on_commit=on_commit,
+    )
@@ -0,0 +1,385 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Protocol
+from uuid import UUID
+
+
+class _Record(Protocol):
+    id: int
+    created_at: int
+
+
+# Public cursor position: a record's creation time and id.
+type CreationKey = tuple[datetime, UUID]
+# The same position over compact records: (created_at micros, id as an int).
+type RecordKey = tuple[int, int]
+
+
+def record_key(record: _Record) -> RecordKey:
+    return (record.created_at, record.id)
+
+
+class CreationIndex[T: _Record]:
+    """Records kept sorted by ``(created_at, id)``.
+
+    Inserts append in the common case (records are created in time order) and
+    newest-first pages are a single slice, so reading a page costs O(limit)
+    regardless of how many records the index holds. Keys are computed from
+    the records during bisection rather than stored alongside them.
+    """
+
+    __slots__ = ("_records",)
+
+    def __init__(self) -> None:
+        self._records: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __getitem__(self, pos: int) -> T:
+        return self._records[pos]
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def add(self, record: T) -> int:
+        """Insert ``record`` and return its position."""
+        records = self._records
+        key = record_key(record)
+        if not records or record_key(records[-1]) <= key:
+            records.append(record)
+            return len(records) - 1
+        pos = bisect_right(records, key, key=record_key)
+        records.insert(pos, record)
+        return pos
+
+    def _find(self, record: T) -> int:
+        key = record_key(record)
+        pos = bisect_left(self._records, key, key=record_key)
+        if pos < len(self._records) and record_key(self._records[pos]) == key:
+            return pos
+        return -1
+
+    def remove(self, record: T) -> int:
+        """Remove ``record``; return the position it had, or -1."""
+        pos = self._find(record)
+        if pos >= 0:
+            del self._records[pos]
+        return pos
+
+    def replace(self, record: T) -> int:
+        """Swap in a new version of a record with the same creation key."""
+        pos = self._find(record)
+        if pos >= 0:
+            self._records[pos] = record
+        return pos
+
+    def span(self, since: int | None = None, until: int | None = None) -> range:
+        """Positions of the records created in ``[since, until)`` (micros)."""
+        records = self._records
+        # Ids are non-negative, so (t, -1) sorts before every record at ``t``.
+        start = (
+            0 if since is None else bisect_left(records, (since, -1), key=record_key)
+        )
+        stop = (
+            len(records)
+            if until is None
+            else bisect_left(records, (until, -1), key=record_key)
+        )
+        return range(start, max(start, stop))
+
+    def window(
+        self,
+        *,
+        after: RecordKey | None = None,
+        since: int | None = None,
+        until: int | None = None,
+        descending: bool = True,
+    ) -> range:
+        """Positions a listing walks, in order: ``span`` cut at a cursor.
+
+        ``after`` is the key of the last record of the previous page; the
+        window holds what comes after it in the listing order.
+        """
+        span = self.span(since, until)
+        start, stop = span.start, span.stop
+        if after is not None:
+            if descending:
+                stop = min(stop, bisect_left(self._records, after, key=record_key))
+            else:
+                start = max(start, bisect_right(self._records, after, key=record_key))
+        if descending:
+            return range(stop - 1, start - 1, -1)
+        return range(start, max(start, stop))
+
+    def range(self, since: int | None = None, until: int | None = None) -> list[T]:
+        """Records created in ``[since, until)`` (micros), oldest first.
+
+        Returns a new list of the stored records, so it stays a consistent
+        snapshot while writers keep changing the index.
+        """
+        span = self.span(since, until)
+        return self._records[span.start : span.stop]
+
+    def page(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: RecordKey | None = None,
+        since: int | None = None,
+        until: int | None = None,
+        descending: bool = True,
+    ) -> list[T]:
+        """Return up to ``limit`` records after skipping ``skip``, newest first
+        unless ``descending`` is false.
+
+        The window is located by bisection, so deep pages cost
+        O(log n + limit).
+        """
+        positions = self.window(
+            after=after, since=since, until=until, descending=descending
+        )[skip : skip + limit]
+        if not positions:
+            return []
+        if descending:
+            return self._records[positions.stop + 1 : positions.start + 1][::-1]
+        return self._records[positions.start : positions.stop]
+
+
+class SortedKeys:
+    """Distinct strings in sorted order, kept in chunks of bounded size.
+
+    A flat sorted list makes every insert move half the list; here an insert
+    bisects the chunk maxima, then moves at most ``2 * _LOAD`` entries of one
+    chunk, splitting it when it grows too large. Ranges and iteration walk
+    the chunks in order.
+    """
+
+    __slots__ = ("_chunks", "_maxes", "_len")
+
+    def __init__(self) -> None:
+        self._chunks: list[list[str]] = []
+        # Last (largest) key of each chunk, for locating a key's chunk.
+        self._maxes: list[str] = []
+        self._len = 0
+
+    @classmethod
+    def from_sorted(cls, keys: list[str]) -> "SortedKeys":
+        """Build from keys already sorted and distinct, in one pass."""
+        self = cls()
+        self._chunks = [keys[i : i + _LOAD] for i in range(0, len(keys), _LOAD)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(keys)
+        return self
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __reversed__(self) -> Iterator[str]:
+        for chunk in reversed(self._chunks):
+            yield from reversed(chunk)
+
+    def add(self, key: str) -> None:
+        chunks, maxes = self._chunks, self._maxes
+        if not chunks:
+            chunks.append([key])
+            maxes.append(key)
+            self._len = 1
+            return
+        c = min(bisect_left(maxes, key), len(chunks) - 1)
+        chunk = chunks[c]
+        insort(chunk, key)
+        maxes[c] = chunk[-1]
+        if len(chunk) > 2 * _LOAD:
+            chunks.insert(c + 1, chunk[_LOAD:])
+            del chunk[_LOAD:]
+            maxes.insert(c, chunk[-1])
+        self._len += 1
+
+    def remove(self, key: str) -> None:
+        chunks, maxes = self._chunks, self._maxes
+        c = bisect_left(maxes, key)
+        if c == len(chunks):
+            return
+        chunk = chunks[c]
+        pos = bisect_left(chunk, key)
+        if chunk[pos] != key:
+            return
+        del chunk[pos]
+        if chunk:
+            maxes[c] = chunk[-1]
+        else:
+            del chunks[c]
+            del maxes[c]
+        self._len -= 1
+
+    def range(self, start: str, stop: str, limit: int | None = None) -> list[str]:
+        """Keys in ``[start, stop)``, in order; the first ``limit`` if given."""
+        chunks, maxes = self._chunks, self._maxes
+        keys: list[str] = []
+        for c in range(bisect_left(maxes, start), len(chunks)):
+            chunk = chunks[c]
+            end = bisect_left(chunk, stop)
+            keys += chunk[bisect_left(chunk, start) : end]
+            if end < len(chunk) or (limit is not None and len(keys) >= limit):
+                break
+        return keys if limit is None else keys[:limit]
+
+
+# Target chunk length of a ``SortedKeys``; chunks split at twice this.
+_LOAD = 1024
+
+
+class Bitset:
+    """One flag per position of a ``CreationIndex``, in fixed-size chunks.
+
+    Position ``p`` is bit ``p % _BIT_CHUNK`` of ``chunks[p // _BIT_CHUNK]``,
+    and missing trailing chunks read as zeros. Appends and ``set``, the
+    common cases, rewrite one chunk (8 KB) whatever the size of the set.
+    Inserting or deleting in the middle shifts the bits above it by one,
+    carrying a bit across each later chunk, rather than copying every bit.
+    Chunks are large so that combining and counting flags, done chunk by
+    chunk, stay a few C-level operations.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: list[int] | None = None) -> None:
+        self.chunks = [] if chunks is None else chunks
+
+    @classmethod
+    def from_flags(cls, flags: Iterable[bool]) -> "Bitset":
+        """Build from the flags of positions 0, 1, ... in one pass."""
+        flags = list(flags)
+        return cls(
+            [
+                int("".join("1" if f else "0" for f in reversed(part)) or "0", 2)
+                for part in (
+                    flags[i : i + _BIT_CHUNK] for i in range(0, len(flags), _BIT_CHUNK)
+                )
+            ]
+        )
+
+    def insert(self, pos: int, value: bool) -> None:
+        chunks = self.chunks
+        c, offset = divmod(pos, _BIT_CHUNK)
+        if c >= len(chunks) - 1 and not (c < len(chunks) and chunks[c] >> offset):
+            # No set bit at or above ``pos``, as after an append: nothing moves.
+            if value:
+                self.set(pos, True)
+            return
+        chunk = chunks[c]
+        low = chunk & ((1 << offset) - 1)
+        chunk = (chunk >> offset << (offset + 1)) | value << offset | low
+        for later in range(c + 1, len(chunks)):
+            chunks[later - 1] = chunk & _CHUNK_MASK
+            chunk = chunks[later] << 1 | chunk >> _BIT_CHUNK
+        chunks[-1] = chunk & _CHUNK_MASK
+        if chunk >> _BIT_CHUNK:
+            chunks.append(1)
+
+    def delete(self, pos: int) -> None:
+        chunks = self.chunks
+        c, offset = divmod(pos, _BIT_CHUNK)
+        if c >= len(chunks):
+            return
+        chunk = chunks[c]
+        low = chunk & ((1 << offset) - 1)
+        chunk = chunk >> (offset + 1) << offset | low
+        for later in range(c + 1, len(chunks)):
+            following = chunks[later]
+            chunks[later - 1] = chunk | (following & 1) << (_BIT_CHUNK - 1)
+            chunk = following >> 1
+        chunks[-1] = chunk
+
+    def set(self, pos: int, value: bool) -> None:
+        chunks = self.chunks
+        c, offset = divmod(pos, _BIT_CHUNK)
+        if c >= len(chunks):
+            if not value:
+                return
+            chunks.extend([0] * (c + 1 - len(chunks)))
+        if value:
+            chunks[c] |= 1 << offset
+        else:
+            chunks[c] &= ~(1 << offset)
+
+
+# Bits per ``Bitset`` chunk.
+_BIT_CHUNK = 1 << 16
+_CHUNK_MASK = (1 << _BIT_CHUNK) - 1
+# Bits examined per step when walking a bitset; divides ``_BIT_CHUNK``.
+_BIT_WINDOW = 4096
+
+
+def select_bits(wanted: list[tuple[Bitset, bool]], size: int) -> Bitset:
+    """Positions below ``size`` where each bitset has its wanted value."""
+    chunks = []
+    for c in range(0, -(-size // _BIT_CHUNK)):
+        bits = _CHUNK_MASK
+        if size < (c + 1) * _BIT_CHUNK:
+            bits = (1 << (size - c * _BIT_CHUNK)) - 1
+        for flags, value in wanted:
+            chunk = flags.chunks[c] if c < len(flags.chunks) else 0
+            bits &= chunk if value else ~chunk
+        chunks.append(bits)
+    return Bitset(chunks)
+
+
+def _windows(positions: range, width: int) -> Iterator[tuple[int, int, int]]:
+    """``(chunk, lo, hi)`` pieces of a step-1 range, none crossing a
+    multiple of ``width`` (a divisor of ``_BIT_CHUNK``)."""
+    lo, stop = positions.start, positions.stop
+    while lo < stop:
+        hi = min(stop, (lo // width + 1) * width)
+        yield lo // _BIT_CHUNK, lo, hi
+        lo = hi
+
+
+def _window(bits: Bitset, c: int, lo: int, hi: int) -> int:
+    """Bits ``lo`` to ``hi`` of chunk ``c``, shifted down to bit 0."""
+    chunk = bits.chunks[c] if c < len(bits.chunks) else 0
+    if hi - lo == _BIT_CHUNK:
+        return chunk
+    return chunk >> (lo - c * _BIT_CHUNK) & ((1 << (hi - lo)) - 1)
+
+
+def count_bits(bits: Bitset, positions: range) -> int:
+    """Set bits of ``bits`` among ``positions`` (a step-1 range)."""
+    return sum(
+        _window(bits, c, lo, hi).bit_count()
+        for c, lo, hi in _windows(positions, _BIT_CHUNK)
+    )
+
+
+def iter_bits(bits: Bitset, positions: range) -> Iterator[int]:
+    """Positions in ``positions`` whose bit is set, in the range's order.
+
+    ``positions`` is a ``CreationIndex.window``, stepping by 1 or -1. The
+    bitset is cut into small windows, so each found position costs O(1)
+    big-int work rather than a shift of a whole chunk.
+    """
+    if positions.step > 0:
+        for c, lo, hi in _windows(positions, _BIT_WINDOW):
+            window = _window(bits, c, lo, hi)
+            while window:
+                low = window & -window
+                yield lo + low.bit_length() - 1
+                window ^= low
+    else:
+        ascending = range(positions.stop + 1, positions.start + 1)
+        for c, lo, hi in reversed(list(_windows(ascending, _BIT_WINDOW))):
+            window = _window(bits, c, lo, hi)
+            while window:
+                top = window.bit_length() - 1
+                yield lo + top
+                window ^= 1 << top
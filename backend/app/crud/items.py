@@ -1,8 +1,12 @@
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from app.models import Item, ItemCreate, ItemUpdate
-
-_ITEMS_BY_ID: dict[UUID, Item] = {}
+from app.crud.backends import get_storage
+from app.crud.indexes import CreationKey
+from app.crud.versions import ITEMS, Scope, versions
+from app.models import Item, ItemCreate, ItemOrder, ItemUpdate
 
 
 def create_item(*, item_in: ItemCreate, owner_id: UUID) -> Item:
@@ -11,54 +15,171 @@ def create_item(*, item_in: ItemCreate, owner_id: UUID) -> Item:
         description=item_in.description,
         owner_id=owner_id,
     )
-    _ITEMS_BY_ID[item.id] = item
+    with versions.writing((ITEMS, owner_id)):
+        get_storage().add_item(item)
     return item
 
 
+def create_items(*, items_in: list[ItemCreate], owner_id: UUID) -> list[Item]:
+    items = [
+        Item(title=item_in.title, description=item_in.description, owner_id=owner_id)
+        for item_in in items_in
+    ]
+    insert_items(items=items)
+    return items
+
+
+def insert_items(*, items: list[Item]) -> None:
+    storage = get_storage()
+    with versions.writing(_scopes(items)), storage.batch():
+        for item in items:
+            storage.add_item(item)
+
+
 def get_item(*, item_id: UUID) -> Item | None:
-    return _ITEMS_BY_ID.get(item_id)
+    return get_storage().get_item(item_id)
 
 
-def get_items(*, skip: int = 0, limit: int = 100) -> tuple[list[Item], int]:
-    items = list(_ITEMS_BY_ID.values())
-    items.sort(key=lambda i: i.created_at, reverse=True)
-    total = len(items)
-    return items[skip : skip + limit], total
+def get_items(
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    after: CreationKey | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    order_by: ItemOrder = "-created_at",
+) -> tuple[list[Item], int]:
+    return _page_items(None, skip, limit, after, since, until, order_by)
 
 
 def get_items_by_owner(
-    *, owner_id: UUID, skip: int = 0, limit: int = 100
+    *,
+    owner_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: CreationKey | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    order_by: ItemOrder = "-created_at",
 ) -> tuple[list[Item], int]:
-    items = [i for i in _ITEMS_BY_ID.values() if i.owner_id == owner_id]
-    items.sort(key=lambda i: i.created_at, reverse=True)
-    total = len(items)
-    return items[skip : skip + limit], total
+    return _page_items(owner_id, skip, limit, after, since, until, order_by)
+
+
+def _page_items(
+    owner_id: UUID | None,
+    skip: int,
+    limit: int,
+    after: CreationKey | None,
+    since: datetime | None,
+    until: datetime | None,
+    order_by: ItemOrder,
+) -> tuple[list[Item], int]:
+    storage = get_storage()
+    page = storage.page_items(
+        owner_id=owner_id,
+        skip=skip,
+        limit=limit,
+        after=after,
+        since=since,
+        until=until,
+        order_by=order_by,
+    )
+    return page, storage.count_items(owner_id, since=since, until=until)
+
+
+def search_items(
+    *, query: str, owner_id: UUID | None = None, skip: int = 0, limit: int = 20
+) -> tuple[list[Item], int]:
+    return get_storage().search_items(query, owner_id=owner_id, skip=skip, limit=limit)
+
+
+def get_item_version(*, item_id: UUID) -> int:
+    return versions.record(item_id)
 
 
-def update_item(*, item: Item, item_in: ItemUpdate) -> Item:
+def get_items_generation(*, owner_id: UUID | None = None) -> int:
+    """Counter that moves with every write to the items ``get_items`` (or, for
+    an owner, ``get_items_by_owner``) lists."""
+    return versions.generation(ITEMS if owner_id is None else owner_id)
+
+
+def update_item(
+    *, item: Item, item_in: ItemUpdate, expected_version: int | None = None
+) -> Item:
+    """Apply ``item_in`` to the stored item and return it as stored.
+
+    Only the changed fields are written, onto the record as it is now:
+    ``item`` may have been read before another update, whose fields must
+    not be reverted. With ``expected_version``, raises ``VersionConflict``
+    instead if the item was updated since that version was read.
+    """
+    changes = _item_changes(item_in)
+    expected = None if expected_version is None else {item.id: expected_version}
+    with versions.writing((ITEMS, item.owner_id), updated=[item.id], expected=expected):
+        stored = get_storage().update_item(item.id, changes)
+    # Deleted meanwhile: there is nothing to return but the caller's view.
+    return stored or item.model_copy(update=changes)
+
+
+def _item_changes(item_in: ItemUpdate) -> dict[str, Any]:
     update_data = item_in.model_dump(exclude_unset=True)
+    changes = {}
 
     if "title" in update_data and update_data["title"] is not None:
-        item.title = update_data["title"]
+        changes["title"] = update_data["title"]
     if "description" in update_data:
-        item.description = update_data["description"]
+        changes["description"] = update_data["description"]
+
+    return changes
 
-    _ITEMS_BY_ID[item.id] = item
-    return item
+
+def update_items(*, updates: list[tuple[Item, ItemUpdate]]) -> list[Item]:
+    items = [item for item, _ in updates]
+    storage = get_storage()
+    updated = [item.id for item in items]
+    stored = []
+    with versions.writing(_scopes(items), updated=updated), storage.batch():
+        for item, item_in in updates:
+            changes = _item_changes(item_in)
+            now = storage.update_item(item.id, changes)
+            stored.append(now or item.model_copy(update=changes))
+    return stored
 
 
 def delete_item(*, item: Item) -> None:
-    _ITEMS_BY_ID.pop(item.id, None)
+    with versions.writing((ITEMS, item.owner_id)):
+        get_storage().delete_item(item.id)
+
+
+def delete_items(*, items: list[Item]) -> None:
+    storage = get_storage()
+    with versions.writing(_scopes(items)), storage.batch():
+        for item in items:
+            storage.delete_item(item.id)
 
 
 def delete_items_by_owner(*, owner_id: UUID) -> int:
-    to_delete = [
-        item_id for item_id, item in _ITEMS_BY_ID.items() if item.owner_id == owner_id
-    ]
-    for item_id in to_delete:
-        _ITEMS_BY_ID.pop(item_id, None)
-    return len(to_delete)
+    with versions.writing((ITEMS, owner_id)):
+        return get_storage().delete_items_by_owner(owner_id)
+
+
+def _scopes(items: list[Item]) -> set[Scope]:
+    """Generations a write to ``items`` moves."""
+    return {ITEMS, *(item.owner_id for item in items)}
+
+
+def count_items(*, owner_id: UUID | None = None) -> int:
+    return get_storage().count_items(owner_id)
 
 
 def list_all_items() -> list[Item]:
-    return list(_ITEMS_BY_ID.values())
+    return get_storage().list_items()
+
+
+def export_items(
+    *,
+    owner_id: UUID | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Iterator[Item]:
+    return get_storage().export_items(owner_id=owner_id, since=since, until=until)
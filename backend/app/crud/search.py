@@ -0,0 +1,247 @@
+"""Keyword search over item titles and descriptions.
+
+``SearchIndex`` is the inverted index behind the memory backends; SQLite
+uses FTS5 instead. Both split text with ``tokenize`` so that a query
+matches the same words whichever backend serves it.
+"""
+
+import math
+import re
+import unicodedata
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import is_not
+
+from app.crud.indexes import SortedKeys
+
+_WORD = re.compile(r"[^\W_]+")
+# Query terms at least this long also match longer words they start with.
+MIN_PREFIX = 2
+# Most words one prefix expands to; the shortest prefixes stop here.
+_MAX_EXPANSIONS = 256
+_TITLE_WEIGHT = 2.0
+_DESCRIPTION_WEIGHT = 1.0
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lower-cased words of ``text`` with accents stripped, in order."""
+    if not text:
+        return []
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(
+            c
+            for c in unicodedata.normalize("NFKD", text)
+            if not unicodedata.combining(c)
+        )
+    return _WORD.findall(text)
+
+
+class SearchIndex:
+    """Inverted index from words to items, ranked by weighted IDF.
+
+    Each indexed item gets a document number in insertion order, and every
+    word keeps two ascending arrays of document numbers (title and
+    description hits), 4 bytes per entry; so does every owner, so that an
+    owner's search only scores that owner's postings. Removing an item only
+    tombstones its number; an update is a removal plus a fresh insert. Once
+    tombstones outnumber live items the postings are renumbered in one pass.
+
+    A query term matches its word exactly and, from ``MIN_PREFIX``
+    characters, any word it is a prefix of. Items must match every term;
+    each term scores its best word by IDF over the items searched, title
+    hits counting double and prefix hits scaled by how much of the word they
+    cover. Ties go to the newest item.
+
+    Writers are serialized by the owning store. Readers take no lock: they
+    copy the postings they need (C-level copies, atomic under the GIL) and
+    retry if a renumbering happened while they scored.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._title: dict[str, array] = {}
+        self._description: dict[str, array] = {}
+        self._words = SortedKeys()  # the vocabulary, for prefix ranges
+        self._doc_ids: list[int | None] = []  # doc number -> item id
+        self._owner_docs: dict[int, array] = {}
+        self._docs: dict[int, int] = {}  # item id -> doc number
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # Writes
+
+    def add(
+        self, item_id: int, owner_id: int, title: str, description: str | None
+    ) -> None:
+        self.remove(item_id)
+        doc = len(self._doc_ids)
+        self._doc_ids.append(item_id)
+        self._docs[item_id] = doc
+        owner_docs = self._owner_docs.get(owner_id)
+        if owner_docs is None:
+            owner_docs = self._owner_docs[owner_id] = array("I")
+        owner_docs.append(doc)
+        self._post(self._title, tokenize(title), doc)
+        self._post(self._description, tokenize(description), doc)
+
+    def _post(self, postings: dict[str, array], words: list[str], doc: int) -> None:
+        for word in dict.fromkeys(words):
+            posting = postings.get(word)
+            if posting is None:
+                if word not in self._title and word not in self._description:
+                    self._words.add(word)
+                posting = postings[word] = array("I")
+            posting.append(doc)
+
+    def remove(self, item_id: int) -> None:
+        doc = self._docs.pop(item_id, None)
+        if doc is None:
+            return
+        self._doc_ids[doc] = None
+        if len(self._doc_ids) - len(self._docs) > max(1024, len(self._docs)):
+            self._compact()
+
+    def _compact(self) -> None:
+        renumber = array("i", [-1]) * len(self._doc_ids)
+        doc_ids: list[int | None] = []
+        for doc, item_id in enumerate(self._doc_ids):
+            if item_id is not None:
+                renumber[doc] = len(doc_ids)
+                doc_ids.append(item_id)
+
+        def remap[K](postings: dict[K, array]) -> dict[K, array]:
+            remapped = {}
+            for word, posting in postings.items():
+                live = array("I", [renumber[d] for d in posting if renumber[d] >= 0])
+                if live:
+                    remapped[word] = live
+            return remapped
+
+        title, description = remap(self._title), remap(self._description)
+        owner_docs = remap(self._owner_docs)
+        # Swap everything in before bumping the generation readers check.
+        self._title, self._description = title, description
+        self._words = SortedKeys.from_sorted(sorted(title.keys() | description.keys()))
+        self._doc_ids, self._owner_docs = doc_ids, owner_docs
+        self._docs = {item_id: doc for doc, item_id in enumerate(doc_ids)}
+        self._generation += 1
+
+    # Reads
+
+    def search(
+        self, query: str, *, owner_id: int | None, limit: int
+    ) -> tuple[list[int], int]:
+        """Ids of the ``limit`` best matches, best first, and the match count."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+        while True:
+            generation = self._generation
+            try:
+                result = self._search(terms, owner_id, limit)
+            except (IndexError, KeyError):
+                # Only possible when a renumbering swapped structures mid-read.
+                if self._generation == generation:
+                    raise
+                continue
+            if self._generation == generation:
+                return result
+
+    def _expand(self, term: str) -> list[str]:
+        if len(term) < MIN_PREFIX:
+            return [term]
+        return self._words.range(term, term + "\U0010ffff", _MAX_EXPANSIONS)
+
+    def _search(
+        self, terms: list[str], owner_id: int | None, limit: int
+    ) -> tuple[list[int], int]:
+        # Common words hit a large share of the store, so per-document work
+        # stays in C: dict.fromkeys, key-set algebra and filter/compress.
+        title, description = self._title, self._description
+        doc_ids = self._doc_ids
+        # Tombstones still sit in the postings, so count them in the total.
+        total = len(doc_ids)
+        owned: set[int] | None = None
+        if owner_id is not None:
+            owned = set(self._owner_docs.get(owner_id, array("I"))[:])
+            total = len(owned)
+
+        def postings(index: dict[str, array], word: str) -> dict[int, None]:
+            posting = index.get(word, array("I"))[:]
+            if owned is None:
+                return dict.fromkeys(posting)
+            return dict.fromkeys(filter(owned.__contains__, posting))
+
+        scores: dict[int, float] | None = None
+        for term in terms:
+            term_scores: dict[int, float] = {}
+            for word in self._expand(term):
+                in_title = postings(title, word)
+                in_description = postings(description, word)
+                in_both = in_title.keys() & in_description.keys()
+                hits = len(in_title) + len(in_description) - len(in_both)
+                if not hits:
+                    continue
+                weight = math.log(1 + (total - hits + 0.5) / (hits + 0.5))
+                weight *= len(term) / len(word)
+                word_scores = dict.fromkeys(
+                    in_description, weight * _DESCRIPTION_WEIGHT
+                )
+                word_scores.update(dict.fromkeys(in_title, weight * _TITLE_WEIGHT))
+                word_scores.update(
+                    dict.fromkeys(
+                        in_both, weight * (_TITLE_WEIGHT + _DESCRIPTION_WEIGHT)
+                    )
+                )
+                # A document matching several expansions keeps its best one.
+                for doc in word_scores.keys() & term_scores.keys():
+                    word_scores[doc] = max(word_scores[doc], term_scores[doc])
+                term_scores.update(word_scores)
+            if scores is None:
+                scores = term_scores
+            else:
+                both = scores.keys() & term_scores.keys()
+                scores = {doc: scores[doc] + term_scores[doc] for doc in both}
+            if not scores:
+                return [], 0
+
+        assert scores is not None
+        if len(self._docs) < len(doc_ids):
+            live = map(is_not, map(doc_ids.__getitem__, scores), repeat(None))
+            scores = {doc: scores[doc] for doc in compress(scores, live)}
+        ids = [doc_ids[doc] for doc in _top(scores, limit)]
+        # A concurrent removal may have tombstoned a match since the filter.
+        return [item_id for item_id in ids if item_id is not None], len(scores)
+
+
+def _top(scores: dict[int, float], limit: int) -> list[int]:
+    """The ``limit`` best-scoring documents, ties going to the newest.
+
+    Scores take few distinct values (one per word and field combination),
+    so the cut-off score is found from their counts; documents above it are
+    few, and those tied at it only need their numbers sorted.
+    """
+    counts = Counter(scores.values())
+    threshold, above = 0.0, 0
+    for score in sorted(counts, reverse=True):
+        if above + counts[score] >= limit:
+            threshold = score
+            break
+        above += counts[score]
+    best = sorted(
+        (
+            (scores[doc], doc)
+            for doc in compress(scores, map(threshold.__lt__, scores.values()))
+        ),
+        reverse=True,
+    )
+    tied = sorted(
+        compress(scores, map(threshold.__eq__, scores.values())), reverse=True
+    )
+    return [doc for _, doc in best] + tied[: limit - above]
@@ -1,13 +1,13 @@
 import os
 
 from app.core.security import get_password_hash
-from app.crud.items import _ITEMS_BY_ID
-from app.crud.users import _USERS_BY_ID
+from app.crud.backends import get_storage
 from app.models import Item, User
 
 
 def seed_mock_data() -> None:
-    if _USERS_BY_ID:
+    storage = get_storage()
+    if storage.count_users():
         return
 
     if os.getenv("ENVIRONMENT", "local") != "local":
@@ -32,8 +32,8 @@ def seed_mock_data() -> None:
         ),
     )
 
-    _USERS_BY_ID[admin.id] = admin
-    _USERS_BY_ID[alice.id] = alice
+    storage.add_user(admin)
+    storage.add_user(alice)
 
     item1 = Item(
         title="Camping Tent",
@@ -51,6 +51,6 @@ def seed_mock_data() -> None:
         owner_id=admin.id,
     )
 
-    _ITEMS_BY_ID[item1.id] = item1
-    _ITEMS_BY_ID[item2.id] = item2
-    _ITEMS_BY_ID[item3.id] = item3
+    storage.add_item(item1)
+    storage.add_item(item2)
+    storage.add_item(item3)
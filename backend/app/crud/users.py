@@ -1,81 +1,177 @@
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
 from app.core.security import get_password_hash, verify_password
+from app.core.token_cache import token_cache
+from app.crud.backends import get_storage
+from app.crud.backends.base import UserFilter
+from app.crud.indexes import CreationKey
 from app.crud.items import delete_items_by_owner
-from app.models import User, UserCreate, UserUpdate, UserUpdateMe
-
-_USERS_BY_ID: dict[UUID, User] = {}
+from app.crud.versions import USERS, versions
+from app.models import (
+    User,
+    UserCreate,
+    UserOrder,
+    UserStats,
+    UserUpdate,
+    UserUpdateMe,
+)
 
 
 def get_user_by_email(*, email: str) -> User | None:
-    return next(
-        (u for u in _USERS_BY_ID.values() if u.email.lower() == email.lower()), None
-    )
+    return get_storage().get_user_by_email(email)
 
 
 def get_user(*, user_id: UUID) -> User | None:
-    return _USERS_BY_ID.get(user_id)
-
+    return get_storage().get_user(user_id)
+
+
+def get_users(
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    after: CreationKey | None = None,
+    is_active: bool | None = None,
+    is_superuser: bool | None = None,
+    email_prefix: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    order_by: UserOrder = "-created_at",
+) -> tuple[list[User], int]:
+    storage = get_storage()
+    filters = UserFilter(is_active, is_superuser, email_prefix, since, until)
+    page = storage.page_users(
+        skip=skip, limit=limit, after=after, filters=filters, order_by=order_by
+    )
+    return page, storage.count_users(filters)
 
-def get_users(*, skip: int = 0, limit: int = 100) -> tuple[list[User], int]:
-    users = list(_USERS_BY_ID.values())
-    users.sort(key=lambda u: u.created_at, reverse=True)
-    total = len(users)
-    return users[skip : skip + limit], total
 
+def create_user(*, user_create: UserCreate, hashed_password: str | None = None) -> User:
+    """Store a new user; raises ``EmailAlreadyExists`` if the email is taken.
 
-def create_user(*, user_create: UserCreate) -> User:
+    ``hashed_password`` is a precomputed hash of ``user_create.password``
+    (e.g. from the hashing pool); without it the password is hashed inline.
+    """
     user = User(
         email=user_create.email,
         full_name=user_create.full_name,
         is_active=user_create.is_active,
         is_superuser=user_create.is_superuser,
-        hashed_password=get_password_hash(user_create.password),
+        hashed_password=hashed_password or get_password_hash(user_create.password),
     )
-    _USERS_BY_ID[user.id] = user
+    with versions.writing((USERS,)):
+        get_storage().add_user(user)
     return user
 
 
-def update_user(*, user: User, user_update: UserUpdate) -> User:
+def create_users(
+    *, users_in: list[UserCreate], hashed_passwords: list[str]
+) -> list[User]:
+    """Store several new users in one batch and return the ones stored.
+
+    ``hashed_passwords`` lines up with ``users_in``. Callers check that the
+    emails are free; a user whose email was taken since is left out.
+    """
+    users = [
+        User(
+            email=user_in.email,
+            full_name=user_in.full_name,
+            is_active=user_in.is_active,
+            is_superuser=user_in.is_superuser,
+            hashed_password=hashed_password,
+        )
+        for user_in, hashed_password in zip(users_in, hashed_passwords, strict=True)
+    ]
+    with versions.writing((USERS,)):
+        return get_storage().add_users(users)
+
+
+def get_user_version(*, user_id: UUID) -> int:
+    return versions.record(user_id)
+
+
+def get_users_generation() -> int:
+    """Counter that moves with every write to the users ``get_users`` lists."""
+    return versions.generation(USERS)
+
+
+def update_user(
+    *,
+    user: User,
+    user_update: UserUpdate,
+    hashed_password: str | None = None,
+    expected_version: int | None = None,
+) -> User:
     update_data = user_update.model_dump(exclude_unset=True)
+    changes = {}
 
     if "email" in update_data and update_data["email"] is not None:
-        user.email = update_data["email"]
+        changes["email"] = update_data["email"]
     if "full_name" in update_data:
-        user.full_name = update_data["full_name"]
+        changes["full_name"] = update_data["full_name"]
     if "is_active" in update_data and update_data["is_active"] is not None:
-        user.is_active = update_data["is_active"]
+        changes["is_active"] = update_data["is_active"]
     if "is_superuser" in update_data and update_data["is_superuser"] is not None:
-        user.is_superuser = update_data["is_superuser"]
+        changes["is_superuser"] = update_data["is_superuser"]
     if "password" in update_data and update_data["password"]:
-        user.hashed_password = get_password_hash(update_data["password"])
+        changes["hashed_password"] = hashed_password or get_password_hash(
+            update_data["password"]
+        )
 
-    _USERS_BY_ID[user.id] = user
+    user = _update_user(user, changes, expected_version)
+    if changes.get("is_active") is False or "hashed_password" in changes:
+        token_cache.invalidate_user(user.id)
     return user
 
 
-def update_user_me(*, user: User, user_update: UserUpdateMe) -> User:
+def update_user_me(
+    *, user: User, user_update: UserUpdateMe, expected_version: int | None = None
+) -> User:
     update_data = user_update.model_dump(exclude_unset=True)
+    changes = {}
 
     if "email" in update_data and update_data["email"] is not None:
-        user.email = update_data["email"]
+        changes["email"] = update_data["email"]
     if "full_name" in update_data:
-        user.full_name = update_data["full_name"]
+        changes["full_name"] = update_data["full_name"]
 
-    _USERS_BY_ID[user.id] = user
-    return user
+    return _update_user(user, changes, expected_version)
 
 
-def update_user_password(*, user: User, new_password: str) -> User:
-    user.hashed_password = get_password_hash(new_password)
-    _USERS_BY_ID[user.id] = user
+def update_user_password(
+    *, user: User, new_password: str, hashed_password: str | None = None
+) -> User:
+    hashed_password = hashed_password or get_password_hash(new_password)
+    user = _update_user(user, {"hashed_password": hashed_password})
+    token_cache.invalidate_user(user.id)
     return user
 
 
+def _update_user(
+    user: User, changes: dict[str, Any], expected_version: int | None = None
+) -> User:
+    """Apply ``changes`` to the stored user and return it as stored.
+
+    Only the changed fields are written, onto the record as it is now:
+    ``user`` may have been read before another update, whose fields must
+    not be reverted. With ``expected_version``, raise ``VersionConflict``
+    instead if the user was updated since that version.
+    """
+    expected = None if expected_version is None else {user.id: expected_version}
+    with versions.writing((USERS,), updated=[user.id], expected=expected):
+        stored = get_storage().update_user(user.id, changes)
+    # Deleted meanwhile: there is nothing to return but the caller's view.
+    return stored or user.model_copy(update=changes)
+
+
 def delete_user(*, user: User, cascade_items: bool = True) -> None:
     if cascade_items:
         delete_items_by_owner(owner_id=user.id)
-    _USERS_BY_ID.pop(user.id, None)
+    with versions.writing((USERS,)):
+        get_storage().delete_user(user.id)
+    token_cache.invalidate_user(user.id)
 
 
 def authenticate(*, email: str, password: str) -> User | None:
@@ -87,5 +183,19 @@ def authenticate(*, email: str, password: str) -> User | None:
     return user
 
 
+def count_users() -> int:
+    return get_storage().count_users()
+
+
+def get_user_stats() -> UserStats:
+    return get_storage().user_stats()
+
+
 def list_all_users() -> list[User]:
-    return list(_USERS_BY_ID.values())
+    return get_storage().list_users()
+
+
+def export_users(
+    *, since: datetime | None = None, until: datetime | None = None
+) -> Iterator[User]:
+    return get_storage().export_users(since=since, until=until)
@@ -0,0 +1,83 @@
+"""Change counters behind conditional requests.
+
+Every write made through ``app.crud`` takes the next number of the store's
+sequence and stamps it on what it touched: the record itself when it is
+updated, and the generation of each list it shows up in (all users, all
+items, one owner's items). A tag built from these numbers changes whenever
+the data behind it does, so a client can revalidate without the server
+rebuilding the response.
+
+The counters are kept by the store, and moved in the same batch (for
+SQLite, the same transaction) as the write they count, so every worker
+sharing a store hands out the same tags. The memory stores keep theirs in
+memory and draw a new ``epoch`` at startup; every store draws one on
+``clear``, so tags handed out before then never match again. Records
+created fresh and never updated since sit at version 0: ids are never
+reused, so that cannot alias another representation.
+"""
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from uuid import UUID
+
+from app.crud.backends import get_storage
+
+# Generation scopes besides per-owner item lists, which use the owner id.
+USERS = "users"
+ITEMS = "items"
+
+type Scope = str | UUID
+
+
+class VersionConflict(Exception):
+    """A conditional write found the record at another version."""
+
+
+class Versions:
+    """The current store's counters, with scopes named as the store keeps them."""
+
+    @property
+    def epoch(self) -> str:
+        return get_storage().version_epoch()
+
+    def record(self, record_id: UUID) -> int:
+        return get_storage().record_version(record_id)
+
+    def generation(self, scope: Scope) -> int:
+        return get_storage().generation(_scope_name(scope))
+
+    @contextmanager
+    def writing(
+        self,
+        scopes: Iterable[Scope],
+        *,
+        updated: Iterable[UUID] = (),
+        expected: dict[UUID, int] | None = None,
+    ) -> Iterator[None]:
+        """Run a write in a store batch, then bump ``scopes`` and the
+        ``updated`` records in the same batch.
+
+        The batch holds the store's write lock (or transaction) from check
+        to bump, so a conditional write sees every earlier write counted,
+        whichever process made it. Counters move only after the write, so a
+        reader that saw an old number can at worst pair it with newer data
+        and refetch later, never the reverse. ``expected`` maps record ids
+        to the versions a conditional write was based on;
+        ``VersionConflict`` is raised before the block runs if any moved.
+        """
+        storage = get_storage()
+        with storage.batch():
+            for record_id, version in (expected or {}).items():
+                if storage.record_version(record_id) != version:
+                    raise VersionConflict(record_id)
+            try:
+                yield
+            finally:
+                storage.bump_versions(map(_scope_name, scopes), updated)
+
+
+def _scope_name(scope: Scope) -> str:
+    return scope.hex if isinstance(scope, UUID) else scope
+
+
+versions = Versions()
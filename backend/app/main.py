@@ -1,14 +1,24 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.routes import metrics
 from app.core.config import settings
+from app.core.hashing import HashingQueueFull, hasher_pool
 from app.core.logging import get_logger, setup_logging
+from app.core.middleware import MetricsMiddleware, SecurityHeadersMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.crud.backends import get_storage
 
-setup_logging()
+setup_logging(
+    log_format=settings.LOG_FORMAT,
+    access_sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    repeat_limit=settings.LOG_REPEAT_LIMIT,
+)
 logger = get_logger("app.main")
 
 
@@ -29,6 +39,9 @@ async def lifespan(app: FastAPI):
     )
     yield
     logger.info("Shutting down application")
+    hasher_pool.shutdown()
+    # Flushes and fsyncs the mutation log when the memory store is journaled.
+    get_storage().close()
 
 
 app = FastAPI(
@@ -47,23 +60,35 @@ if settings.all_cors_origins:
         allow_headers=["Authorization", "Content-Type"],
     )
 
+# Added after CORS, so outside it: preflight answers get the headers as well.
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    hsts=not settings.is_local,
+    log_requests=settings.is_local or settings.LOG_FORMAT == "json",
+)
+
+# Opt-in (local/staging): nothing is installed when profiling is off.
+if settings.PROFILING_DIR:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.PROFILING_DIR,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+    )
+
+# Outermost, so request latency covers every other middleware.
+app.add_middleware(MetricsMiddleware, route_id=custom_generate_unique_id)
 
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    if not settings.is_local:
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=63072000; includeSubDomains"
-        )
-    if settings.is_local:
-        logger.info(
-            "%s %s -> %s", request.method, request.url.path, response.status_code
-        )
-    return response
+
+@app.exception_handler(HashingQueueFull)
+async def hashing_queue_full_handler(request: Request, exc: HashingQueueFull):
+    # Fail fast instead of queueing behind a burst of password hashing.
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+# Unprefixed: /metrics is where scrapers look by default.
+app.include_router(metrics.router)
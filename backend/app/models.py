@@ -1,6 +1,6 @@
 # backend/app/models.py
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
@@ -21,6 +21,7 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: str | None = None
+    exp: int | None = None
 
 
 # -------------------------
@@ -85,6 +86,11 @@ class UserPublic(BaseModel):
 class UsersPublic(BaseModel):
     data: list[UserPublic]
     count: int
+    next_cursor: str | None = None
+
+
+# List orders; a leading "-" sorts descending.
+UserOrder = Literal["-created_at", "created_at", "email", "-email"]
 
 
 # Optional future-friendly shape (not required yet)
@@ -130,6 +136,89 @@ class ItemPublic(ItemBase):
 class ItemsPublic(BaseModel):
     data: list[ItemPublic]
     count: int
+    next_cursor: str | None = None
+
+
+ItemOrder = Literal["-created_at", "created_at"]
+
+
+class ItemBulkUpdate(ItemUpdate):
+    id: UUID
+
+
+class BulkItemStatus(BaseModel):
+    index: int  # position of the element in the request body
+    status: int  # the HTTP status the single-item route would have returned
+    id: UUID | None = None
+    detail: str | None = None
+
+
+class BulkItemsResult(BaseModel):
+    results: list[BulkItemStatus]
+    succeeded: int
+    failed: int
+
+
+# -------------------------
+# Import models
+# -------------------------
+
+
+class ItemImport(ItemCreate):
+    owner_id: UUID | None = None  # defaults to the importing user
+
+
+class ImportFailure(BaseModel):
+    record: int  # 1-based position in the input, not counting a CSV header
+    detail: str
+
+
+class ImportProgress(BaseModel):
+    import_id: str | None = None
+    kind: Literal["items", "users"]
+    committed: int = 0  # records read and settled; resume with skip=committed
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportFailure] = []  # the first IMPORT_MAX_ERRORS failures
+    done: bool = False
+
+
+# -------------------------
+# Stats models
+# -------------------------
+
+
+class UserStats(BaseModel):
+    total: int
+    active: int
+    superusers: int
+
+
+class StatsPublic(BaseModel):
+    items: int  # items visible to the caller: all for superusers, else own
+    own_items: int
+    users: UserStats | None = None  # superusers only
+
+
+class HashingStats(BaseModel):
+    workers: int
+    queue_limit: int
+    pending: int
+    completed: int
+    rejected: int
+    avg_latency_ms: float
+    max_latency_ms: float
+
+
+class ResponseCacheStats(BaseModel):
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int  # includes the stale lookups
+    stale: int  # entries found under an older ETag, dropped
+    evictions: int
+    hit_ratio: float
 
 
 class PaginatedResponse(BaseModel):
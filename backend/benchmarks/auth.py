@@ -0,0 +1,41 @@
+"""Per-request authentication overhead with and without the token cache.
+
+Run from ``backend/``::
+
+    uv run python -m benchmarks.auth --repeat 10000
+"""
+
+import argparse
+from datetime import timedelta
+from functools import partial
+
+from app.api.deps import get_current_user
+from app.core.security import create_access_token
+from app.core.token_cache import token_cache
+from app.crud import get_user_by_email
+from benchmarks.common import measure
+
+
+def cold(token: str) -> None:
+    token_cache.clear()
+    get_current_user(token)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10_000)
+    args = parser.parse_args()
+
+    user = get_user_by_email(email="alice@example.com")
+    assert user is not None
+    token = create_access_token(str(user.id), timedelta(hours=1))
+
+    uncached = measure(partial(cold, token), args.repeat)
+    get_current_user(token)
+    cached = measure(partial(get_current_user, token), args.repeat)
+    print(f"{'verify every request (us)':>28} {'cached (us)':>12} {'speedup':>8}")
+    print(f"{uncached:>28.2f} {cached:>12.2f} {uncached / cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
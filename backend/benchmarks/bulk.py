@@ -0,0 +1,95 @@
+"""Importing items over HTTP: one request per item vs /items/bulk.
+
+Each backend gets a fresh store; the batched import sends
+``--items / --batch`` requests. Run from ``backend/``::
+
+    uv run python -m benchmarks.bulk --items 10000 --batch 1000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app import crud
+from app.core.security import create_access_token
+from app.crud.backends import (
+    ColumnarStorage,
+    JournaledMemoryStorage,
+    MemoryStorage,
+    SQLiteStorage,
+    Storage,
+    set_storage,
+)
+from app.main import app
+
+
+def one_by_one(client: TestClient, headers: dict, n: int, _batch: int) -> None:
+    for i in range(n):
+        res = client.post("/api/v1/items/", headers=headers, json={"title": f"{i}"})
+        assert res.status_code == 201
+
+
+def batched(client: TestClient, headers: dict, n: int, batch: int) -> None:
+    for start in range(0, n, batch):
+        body = [{"title": f"{i}"} for i in range(start, min(n, start + batch))]
+        res = client.post("/api/v1/items/bulk", headers=headers, json=body)
+        assert res.json()["failed"] == 0
+
+
+def run(
+    storage: Storage,
+    client: TestClient,
+    load: Callable[[TestClient, dict, int, int], None],
+    n: int,
+    batch: int,
+) -> float:
+    previous = set_storage(storage)
+    try:
+        crud.reset_mock_data()
+        user = crud.get_user_by_email(email="alice@example.com")
+        assert user is not None
+        token = create_access_token(str(user.id), timedelta(hours=1))
+        headers = {"Authorization": f"Bearer {token}"}
+        start = time.perf_counter()
+        load(client, headers, n, batch)
+        return n / (time.perf_counter() - start)
+    finally:
+        set_storage(previous)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # one access-log line per request
+
+    with tempfile.TemporaryDirectory() as tmp, TestClient(app) as client:
+        backends: dict[str, Callable[[], Storage]] = {
+            "memory": MemoryStorage,
+            "journal": lambda: JournaledMemoryStorage(
+                tempfile.mkdtemp(dir=tmp), snapshot_every=10**9
+            ),
+            "columnar": ColumnarStorage,
+            "sqlite": lambda: SQLiteStorage(
+                os.path.join(tempfile.mkdtemp(dir=tmp), "bench.db")
+            ),
+        }
+        print(
+            f"{'backend':>9} {'one by one (items/s)':>21} {'bulk (items/s)':>15}"
+            f" {'speedup':>8}"
+        )
+        for name, factory in backends.items():
+            slow = run(factory(), client, one_by_one, args.items, args.batch)
+            fast = run(factory(), client, batched, args.items, args.batch)
+            print(f"{name:>9} {slow:>21,.0f} {fast:>15,.0f} {fast / slow:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
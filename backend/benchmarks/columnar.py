@@ -0,0 +1,84 @@
+"""Dict-of-records store versus columnar store on sort, filter and count.
+
+Run from ``backend/``::
+
+    uv run python -m benchmarks.columnar --items 100000 1000000 5000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from functools import partial
+from uuid import uuid4
+
+from app.crud.backends import ColumnarStorage, MemoryStorage
+from app.crud.backends.base import Storage
+from app.models import Item
+from benchmarks.common import measure
+
+OWNERS = 100
+
+
+def populate(storage: Storage, n: int) -> list:
+    owners = [uuid4() for _ in range(OWNERS)]
+    for i in range(n):
+        storage.add_item(Item(title=f"Item {i}", owner_id=owners[i % OWNERS]))
+    return owners
+
+
+def run(storage: Storage, n: int, repeat: int) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    owners = populate(storage, n)
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    owner = owners[0]
+    middle = storage.page_items(owner_id=None, skip=n // 2, limit=1, after=None)[0]
+    cursor = (middle.created_at, middle.id)
+
+    results = {
+        "memory: bytes/item": used / n,
+        # Newest-first order: a cursor page from the middle of the store.
+        "sort: page at cursor": measure(
+            partial(storage.page_items, owner_id=None, skip=0, limit=100, after=cursor),
+            repeat,
+        ),
+        # One owner's items (1% of the store), deep into their history.
+        "filter: owner page": measure(
+            partial(
+                storage.page_items, owner_id=owner, skip=0, limit=100, after=cursor
+            ),
+            repeat,
+        ),
+        "count: owner": measure(partial(storage.count_items, owner), repeat),
+    }
+    # The whole store in order, as behind /private/all-items.
+    results["sort: list all"] = measure(storage.list_items, 1)
+    start = time.perf_counter()
+    storage.delete_items_by_owner(owner)
+    results["filter: delete owner"] = (time.perf_counter() - start) * 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--items", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'items':>10} {'operation (us)':>22} {'dict':>12} {'columnar':>12}")
+    for n in args.items:
+        dict_results = run(MemoryStorage(), n, args.repeat)
+        columnar_results = run(ColumnarStorage(), n, args.repeat)
+        for name, dict_us in dict_results.items():
+            print(
+                f"{n:>10} {name:>22} {dict_us:>12.1f} {columnar_results[name]:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Mixed read/write throughput of the storage backends under threads.
+
+Mirrors the anyio threadpool running sync routes side by side. Run from
+``backend/``::
+
+    uv run python -m benchmarks.concurrency --threads 1 4 16 --read-ratio 0.9 0.5
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from uuid import uuid4
+
+from app.crud.backends import MemoryStorage, SQLiteStorage, Storage
+from app.models import Item
+
+OWNERS = 50
+
+
+def _worker(
+    storage: Storage,
+    owners: list,
+    read_ratio: float,
+    stop: threading.Event,
+    counts: list[int],
+) -> None:
+    rng = random.Random()
+    ops = 0
+    mine: list[Item] = []
+    while not stop.is_set():
+        owner_id = rng.choice(owners)
+        if rng.random() < read_ratio or not mine:
+            storage.page_items(owner_id=owner_id, skip=0, limit=20, after=None)
+            storage.count_items(owner_id)
+        elif rng.random() < 0.5:
+            item = Item(title="bench", owner_id=owner_id)
+            storage.add_item(item)
+            mine.append(item)
+        else:
+            storage.delete_item(mine.pop().id)
+        ops += 1
+    counts.append(ops)
+
+
+def run(storage: Storage, threads: int, read_ratio: float, seconds: float) -> float:
+    owners = [uuid4() for _ in range(OWNERS)]
+    for i in range(10_000):
+        storage.add_item(Item(title=f"Item {i}", owner_id=owners[i % OWNERS]))
+    stop = threading.Event()
+    counts: list[int] = []
+    workers = [
+        threading.Thread(
+            target=_worker, args=(storage, owners, read_ratio, stop, counts)
+        )
+        for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--read-ratio", type=float, nargs="+", default=[0.9, 0.5])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'reads':>6} {'memory ops/s':>14} {'sqlite ops/s':>14}")
+    for read_ratio in args.read_ratio:
+        for threads in args.threads:
+            memory = run(MemoryStorage(), threads, read_ratio, args.seconds)
+            with tempfile.TemporaryDirectory() as tmp:
+                sqlite_storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+                sqlite = run(sqlite_storage, threads, read_ratio, args.seconds)
+                sqlite_storage.close()
+            print(f"{threads:>8} {read_ratio:>6.0%} {memory:>14,.0f} {sqlite:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Refetch latency of list and record GETs: full response vs 304.
+
+Each route is requested through the app with a fresh tag in
+``If-None-Match`` (answered 304 from the change counters) and without one
+(page read, encoded and sent). Alice owns a share of ``--items``. Run from
+``backend/``::
+
+    uv run python -m benchmarks.conditional --items 100000
+"""
+
+import argparse
+import logging
+from datetime import timedelta
+from functools import partial
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app import crud
+from app.core.security import create_access_token
+from app.crud.backends import get_storage
+from app.main import app
+from app.models import Item
+from benchmarks.common import measure
+
+OWNERS = 100
+
+
+def populate(n: int, alice_id) -> Item:
+    owners = [alice_id] + [uuid4() for _ in range(OWNERS - 1)]
+    storage = get_storage()
+    items = [
+        Item(title=f"Item {i}", description="x" * 40, owner_id=owners[i % OWNERS])
+        for i in range(n)
+    ]
+    with storage.batch():
+        for item in items:
+            storage.add_item(item)
+    return items[0]
+
+
+def get(client: TestClient, url: str, headers: dict, status: int) -> None:
+    response = client.get(url, headers=headers)
+    assert response.status_code == status, response.status_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    crud.reset_mock_data()
+    admin = crud.get_user_by_email(email="admin@example.com")
+    alice = crud.get_user_by_email(email="alice@example.com")
+    assert admin is not None and alice is not None
+    item = populate(args.items, alice.id)
+    client = TestClient(app)
+
+    routes = [
+        ("items (admin)", "/api/v1/items/?limit=100", admin),
+        ("items (owner)", "/api/v1/items/?limit=100", alice),
+        ("users", "/api/v1/users/?limit=100", admin),
+        ("users/me", "/api/v1/users/me", alice),
+        ("item", f"/api/v1/items/{item.id}", alice),
+    ]
+    print(f"{args.items:,} items; latencies in us (median)")
+    print(f"{'route':>14} {'200':>10} {'304':>10} {'speedup':>8}")
+    for name, url, user in routes:
+        token = create_access_token(str(user.id), timedelta(hours=1))
+        headers = {"Authorization": f"Bearer {token}"}
+        etag = client.get(url, headers=headers).headers["etag"]
+        full = measure(partial(get, client, url, headers, 200), args.repeat)
+        cached = measure(
+            partial(get, client, url, {**headers, "If-None-Match": etag}, 304),
+            args.repeat,
+        )
+        print(f"{name:>14} {full:>10.1f} {cached:>10.1f} {full / cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Peak memory and time to first byte of a full item export.
+
+Compares ``/private/all-items`` (one dict, then one JSON document) with the
+streamed NDJSON of ``/items/export``. Run from ``backend/``::
+
+    uv run python -m benchmarks.export --sizes 100000 1000000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from uuid import uuid4
+
+from app import crud
+from app.api.routes.private import all_items
+from app.api.serialization import items_ndjson
+from app.crud.backends import get_storage
+from app.models import Item
+
+OWNERS = 100
+
+
+def populate(n: int) -> None:
+    crud.reset_mock_data()
+    storage = get_storage()
+    owners = [uuid4() for _ in range(OWNERS)]
+    with storage.batch():
+        for i in range(n):
+            storage.add_item(Item(title=f"Item {i}", owner_id=owners[i % OWNERS]))
+
+
+def whole_document() -> Iterator[bytes]:
+    yield json.dumps(all_items()).encode()
+
+
+def streamed() -> Iterator[bytes]:
+    return items_ndjson(crud.export_items())
+
+
+def run(export: Callable[[], Iterator[bytes]]) -> tuple[float, float, float]:
+    """Return (first chunk s, total s, peak MiB) for one full export."""
+    start = time.perf_counter()
+    chunks = export()
+    first = None
+    for _ in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in export():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first or total, total, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'items':>9} {'export':>9} {'first byte (ms)':>16} {'total (s)':>10}"
+        f" {'peak (MiB)':>11}"
+    )
+    for n in args.sizes:
+        populate(n)
+        for name, export in (("document", whole_document), ("ndjson", streamed)):
+            first, total, peak = run(export)
+            print(
+                f"{n:>9,} {name:>9} {first * 1e3:>16.1f} {total:>10.2f} {peak:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Filtered list pages on the memory and SQLite stores, against a full scan.
+
+Users are 2% inactive and 0.5% superusers, with random emails; items are
+spread evenly over a year. Each filter is timed through ``Storage.page_users``
+or ``Storage.page_items`` (first page of 100) plus the matching count, the
+two calls behind ``GET /users/`` and ``GET /items/``; ``scan`` answers the
+same page by filtering ``list_users``/``list_items``, as a client pulling
+every page would. Run from ``backend/``::
+
+    uv run python -m benchmarks.filters --records 1000000
+"""
+
+import argparse
+import random
+import tempfile
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from pathlib import Path
+from uuid import uuid4
+
+from app.crud.backends import MemoryStorage, SQLiteStorage
+from app.crud.backends.base import Storage, UserFilter
+from app.models import Item, User
+from benchmarks.common import measure
+
+START = datetime(2030, 1, 1, tzinfo=UTC)
+YEAR = timedelta(days=365)
+OWNERS = 100
+
+
+def populate(storage: Storage, n: int) -> None:
+    rng = random.Random(1)
+    owners = [uuid4() for _ in range(OWNERS)]
+    step = YEAR / n
+    for start in range(0, n, 10_000):
+        with storage.batch():
+            for i in range(start, min(n, start + 10_000)):
+                name = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=10))
+                storage.add_user(
+                    User(
+                        email=f"{name}{i}@example.com",
+                        is_active=rng.random() >= 0.02,
+                        is_superuser=rng.random() < 0.005,
+                        hashed_password="x",
+                        created_at=START + i * step,
+                    )
+                )
+                storage.add_item(
+                    Item(
+                        title=f"Item {i}",
+                        owner_id=owners[i % OWNERS],
+                        created_at=START + i * step,
+                    )
+                )
+
+
+def user_page(storage: Storage, filters: UserFilter, order_by: str = "-created_at"):
+    page = storage.page_users(
+        skip=0, limit=100, after=None, filters=filters, order_by=order_by
+    )
+    return page, storage.count_users(filters)
+
+
+def item_page(storage: Storage, since: datetime, until: datetime, order_by: str):
+    page = storage.page_items(
+        owner_id=None,
+        skip=0,
+        limit=100,
+        after=None,
+        since=since,
+        until=until,
+        order_by=order_by,
+    )
+    return page, storage.count_items(since=since, until=until)
+
+
+def scan_users(storage: Storage) -> list[User]:
+    matches = [user for user in storage.list_users() if not user.is_active]
+    matches.sort(key=lambda user: (user.created_at, user.id), reverse=True)
+    return matches[:100]
+
+
+def run(storage: Storage, n: int, repeat: int) -> dict[str, float]:
+    populate(storage, n)
+    last_week = (START + YEAR - timedelta(days=7), START + YEAR)
+    march = (START + timedelta(days=59), START + timedelta(days=90))
+    users = {
+        "inactive users": UserFilter(is_active=False),
+        "superusers": UserFilter(is_superuser=True),
+        "active, not superuser": UserFilter(is_active=True, is_superuser=False),
+        "inactive in March": UserFilter(is_active=False, since=march[0]),
+        "email prefix (3 chars)": UserFilter(email_prefix="abc"),
+    }
+    results = {
+        name: measure(partial(user_page, storage, filters), repeat)
+        for name, filters in users.items()
+    }
+    results["all users by email"] = measure(
+        partial(user_page, storage, UserFilter(), "email"), repeat
+    )
+    results["items last week"] = measure(
+        partial(item_page, storage, *last_week, "-created_at"), repeat
+    )
+    results["items in March, oldest"] = measure(
+        partial(item_page, storage, *march, "created_at"), repeat
+    )
+    results["scan: inactive users"] = measure(partial(scan_users, storage), 1)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    memory = run(MemoryStorage(), args.records, args.repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(str(Path(tmp, "filters.db")))
+        sqlite = run(storage, args.records, args.repeat)
+        storage.close()
+
+    print(f"{args.records:,} users and items; latencies in us (median)")
+    print(f"{'page + count':>28} {'memory':>14} {'sqlite':>14}")
+    for name, value in memory.items():
+        print(f"{name:>28} {value:>14,.1f} {sqlite[name]:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
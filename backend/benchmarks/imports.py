@@ -0,0 +1,154 @@
+"""Rows per second and peak RSS of a streaming import.
+
+Each mode runs in a fresh process so its peak RSS is its own:
+
+- ``store``: items added straight to the store, the RSS floor;
+- ``loop``: one ``crud.create_item`` per NDJSON line;
+- ``import``: the chunked ``crud.import_items`` pipeline behind ``/import``;
+- ``http``: the file streamed to ``POST /import/items`` through the app.
+
+Users compare one ``crud.create_user`` per row (inline Argon2) with
+``crud.import_users`` on the hashing pool. Run from ``backend/``::
+
+    uv run python -m benchmarks.imports --items 1000000 --users 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app import crud
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.crud.backends import get_storage
+from app.main import app
+from app.models import Item, ItemCreate, UserCreate
+
+_BLOCK_SIZE = 1 << 16
+
+
+async def _blocks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while block := f.read(_BLOCK_SIZE):
+            yield block
+
+
+def write_items(path: Path, n: int) -> None:
+    with path.open("w") as f:
+        for i in range(n):
+            f.write(json.dumps({"title": f"Item {i}", "description": "imported"}))
+            f.write("\n")
+
+
+def write_users(path: Path, n: int) -> None:
+    with path.open("w") as f:
+        f.write("email,password,full_name\n")
+        for i in range(n):
+            f.write(f"import{i}@example.com,password{i:04d},User {i}\n")
+
+
+def run_mode(mode: str, path: Path) -> dict:
+    """Run one mode in this process; return its rate and peak RSS."""
+    owner = crud.get_user_by_email(email="alice@example.com")
+    assert owner is not None
+    start = time.perf_counter()
+    if mode == "store":
+        storage = get_storage()
+        with storage.batch(), path.open() as f:
+            for line in f:
+                storage.add_item(Item(**json.loads(line), owner_id=owner.id))
+    elif mode == "loop":
+        with path.open() as f:
+            for line in f:
+                item_in = ItemCreate.model_validate_json(line)
+                crud.create_item(item_in=item_in, owner_id=owner.id)
+    elif mode == "import":
+        asyncio.run(crud.import_items(_blocks(path), fmt="ndjson", owner_id=owner.id))
+    elif mode == "http":
+        admin = crud.get_user_by_email(email="admin@example.com")
+        assert admin is not None
+        token = create_access_token(str(admin.id), timedelta(hours=1))
+        with TestClient(app) as client, path.open("rb") as f:
+            response = client.post(
+                f"{settings.API_V1_STR}/import/items?owner_id={owner.id}",
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/x-ndjson",
+                },
+                content=iter(partial(f.read, _BLOCK_SIZE), b""),
+            )
+            assert response.json()["failed"] == 0
+    elif mode == "users-loop":
+        with path.open() as f:
+            next(f)
+            for line in f:
+                email, password, full_name = line.rstrip("\n").split(",")
+                user_in = UserCreate(
+                    email=email, password=password, full_name=full_name
+                )
+                crud.create_user(user_create=user_in)
+    elif mode == "users-import":
+        asyncio.run(crud.import_users(_blocks(path), fmt="csv"))
+    elapsed = time.perf_counter() - start
+    rows = sum(1 for _ in path.open()) - mode.startswith("users")
+    # ru_maxrss is in KiB on Linux.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"rows_per_s": rows / elapsed, "peak_rss_mib": peak}
+
+
+def measure_mode(mode: str, path: Path) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.imports", "--run", mode, str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--run", nargs=2, metavar=("MODE", "FILE"), help="internal")
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_mode(args.run[0], Path(args.run[1]))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        items, users = Path(tmp, "items.ndjson"), Path(tmp, "users.csv")
+        write_items(items, args.items)
+        write_users(users, args.users)
+        print(f"workers={os.environ.get('HASHING_WORKERS', 'default')}")
+        print(f"{'mode':>13} {'rows':>10} {'rows/s':>10} {'peak RSS (MiB)':>15}")
+        for mode, path, rows in (
+            ("store", items, args.items),
+            ("loop", items, args.items),
+            ("import", items, args.items),
+            ("http", items, args.items),
+            ("users-loop", users, args.users),
+            ("users-import", users, args.users),
+        ):
+            result = measure_mode(mode, path)
+            print(
+                f"{mode:>13} {rows:>10,} {result['rows_per_s']:>10,.0f}"
+                f" {result['peak_rss_mib']:>15.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
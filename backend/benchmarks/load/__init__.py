@@ -0,0 +1,15 @@
+"""Load test: a configurable traffic mix driven through the app under a ramp.
+
+Virtual users log in as generated users (a few as the superuser) and then
+loop over the mix's actions, picked by weight: paging ``/items/``,
+reading, creating, patching and deleting their items, searching, and for
+superusers paging ``/users/``. The number of users follows ``--ramp``, a
+list of ``duration:users`` stages ramped linearly like k6's. Requests go
+through httpx's ASGI transport, or to a uvicorn server on a loopback
+socket with ``--transport uvicorn``; nothing leaves the machine. Run from
+``backend/``::
+
+    uv run python -m benchmarks.load --size 10000 --ramp 10s:20 30s:20 10s:0
+    uv run python -m benchmarks.load --transport uvicorn \\
+        --mix list_items=60,read_item=20,create_item=10,delete_item=10
+"""
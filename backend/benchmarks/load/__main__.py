@@ -0,0 +1,214 @@
+import argparse
+import asyncio
+import logging
+import socket
+import tempfile
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+from app.core.hashing import hasher_pool
+from app.crud.backends import set_storage
+from app.main import app
+from benchmarks.load import __doc__ as load_doc
+from benchmarks.load.mix import DEFAULT_MIX, Mix, Stage, parse_mix, parse_stage
+from benchmarks.load.report import Recorder, print_table
+from benchmarks.load.users import VirtualUser, route_ids
+from benchmarks.suite import results
+from benchmarks.suite.data import ADMIN_EMAIL, generate, make_storage, user_email
+
+# How often the number of running users is brought back to the ramp.
+TICK = 0.1
+
+
+@contextmanager
+def serve() -> Iterator[str]:
+    """Run the app under uvicorn in a thread, on a free loopback port.
+
+    Lifespan events are off: the runner owns the store and the hashing
+    pool, which the app's shutdown would close.
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    config = uvicorn.Config(app, lifespan="off", log_config=None, access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]})
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.01)
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+
+@asynccontextmanager
+async def connect(transport: str, users: int) -> AsyncIterator[httpx.AsyncClient]:
+    if transport == "asgi":
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://load"
+        ) as http:
+            yield http
+        return
+    # A connection per user, as separate clients would have, and no timeout
+    # short enough to turn a slow response into a failure.
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    with serve() as url:
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as http:
+            yield http
+
+
+async def drive(
+    http: httpx.AsyncClient, recorder: Recorder, args: argparse.Namespace
+) -> list[float]:
+    """Run the stages, returning how long each took."""
+    ids = route_ids(app)
+    mixes = {role: args.mix.for_user(role) for role in (False, True)}
+    running: list[VirtualUser] = []
+    tasks: list[asyncio.Task] = []
+
+    def resize(target: int) -> None:
+        while len(running) < target:
+            n = len(tasks)
+            # One in every 1 / superusers users, spread through the ramp.
+            superuser = int((n + 1) * args.superusers) > int(n * args.superusers)
+            user = VirtualUser(
+                http,
+                ids,
+                recorder,
+                email=ADMIN_EMAIL if superuser else user_email(1 + n % (args.size - 1)),
+                mix=mixes[superuser],
+                think=args.think_ms / 1000,
+                seed=args.seed + n,
+            )
+            running.append(user)
+            tasks.append(asyncio.create_task(user.run()))
+        while len(running) > target:
+            running.pop().stopping = True
+
+    durations = []
+    level = 0
+    loop = asyncio.get_running_loop()
+    for index, stage in enumerate(args.ramp):
+        recorder.stage = index
+        started = loop.time()
+        while (elapsed := loop.time() - started) < stage.seconds:
+            resize(round(level + (stage.users - level) * elapsed / stage.seconds))
+            await asyncio.sleep(TICK)
+        resize(level := stage.users)
+        durations.append(loop.time() - started)
+    resize(0)
+    await asyncio.gather(*tasks)
+    return durations
+
+
+def _type(parse):
+    def convert(value: str):
+        try:
+            return parse(value)
+        except (ValueError, OSError) as e:
+            raise argparse.ArgumentTypeError(str(e)) from None
+
+    convert.__name__ = parse.__name__
+    return convert
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=load_doc.splitlines()[0],
+        epilog=f"actions: {', '.join(DEFAULT_MIX)}",
+    )
+    parser.add_argument("--size", type=int, default=10_000, help="users and items")
+    parser.add_argument(
+        "--backend", choices=("memory", "columnar", "sqlite"), default="memory"
+    )
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument(
+        "--mix",
+        type=_type(parse_mix),
+        default=Mix(DEFAULT_MIX),
+        help="name=weight,... or a .json file (default: a read-heavy mix)",
+    )
+    parser.add_argument(
+        "--ramp",
+        type=_type(parse_stage),
+        nargs="+",
+        default=[Stage(10, 20), Stage(30, 20), Stage(5, 0)],
+        help="duration:users stages (default: 10s:20 30s:20 5s:0)",
+    )
+    parser.add_argument(
+        "--superusers", type=float, default=0.05, help="share of users (0..1)"
+    )
+    parser.add_argument("--think-ms", type=float, default=100.0, help="mean pause")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON")
+    args = parser.parse_args()
+    if args.size < 2:
+        parser.error("--size must be at least 2")
+    if not 0 <= args.superusers <= 1:
+        parser.error("--superusers must be between 0 and 1")
+    if args.superusers < 1 and args.mix.for_user(False) is None:
+        parser.error("only superusers can follow this mix; use --superusers 1")
+    logging.disable(logging.INFO)
+
+    recorder = Recorder()
+    peak = max(stage.users for stage in args.ramp)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = make_storage(args.backend, tmp)
+            previous = set_storage(storage)
+            try:
+                generate(storage, args.size)
+
+                async def run() -> list[float]:
+                    async with connect(args.transport, max(peak, 1)) as http:
+                        return await drive(http, recorder, args)
+
+                durations = asyncio.run(run())
+            finally:
+                set_storage(previous)
+                storage.close()
+    finally:
+        hasher_pool.shutdown()
+
+    seconds = sum(durations)
+    by_route = recorder.by_route(seconds)
+    stages = {
+        f"{i + 1}: {stage.seconds:g}s to {stage.users} users": summary
+        for i, (stage, summary) in enumerate(
+            zip(args.ramp, recorder.by_stage(durations), strict=True)
+        )
+    }
+    print(
+        f"{args.size:,} users and items, {args.backend} store, {args.transport},"
+        f" peak {peak} users, {args.think_ms:g} ms think time"
+    )
+    print_table("route", {**by_route, "all": recorder.total(seconds)})
+    print()
+    print_table("stage", stages)
+    if args.output is not None:
+        results.save(
+            args.output,
+            by_route,
+            backend=args.backend,
+            transport=args.transport,
+            size=args.size,
+            mix=args.mix.weights,
+            ramp=[[stage.seconds, stage.users] for stage in args.ramp],
+            superusers=args.superusers,
+            think_ms=args.think_ms,
+            stages=stages,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""The traffic mix and the ramp schedule, parsed from the command line."""
+
+import json
+import random
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+# What a run does unless ``--mix`` says otherwise: mostly reads, as a
+# dashboard-heavy client would, with some churn and the odd login.
+DEFAULT_MIX = {
+    "login": 2,
+    "me": 5,
+    "list_items": 40,
+    "read_item": 20,
+    "search": 5,
+    "create_item": 10,
+    "patch_item": 8,
+    "delete_item": 5,
+    "list_users": 5,
+}
+# Actions only a superuser may take; other users leave them out of their mix.
+SUPERUSER_ACTIONS = frozenset({"list_users"})
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m)?")
+_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, None: 1.0}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Move linearly from the previous stage's user count to ``users``."""
+
+    seconds: float
+    users: int
+
+
+class Mix:
+    """Weighted actions, drawn independently for every step of a user."""
+
+    def __init__(self, weights: dict[str, float]) -> None:
+        unknown = sorted(set(weights) - set(DEFAULT_MIX))
+        if unknown:
+            raise ValueError(f"Unknown actions: {', '.join(unknown)}")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Weights cannot be negative")
+        self.weights = {name: w for name, w in weights.items() if w > 0}
+        if not self.weights:
+            raise ValueError("The mix has no actions")
+
+    def for_user(self, superuser: bool) -> "Mix | None":
+        """The mix a user may follow, or ``None`` when nothing is left."""
+        if superuser:
+            return self
+        allowed = {
+            name: weight
+            for name, weight in self.weights.items()
+            if name not in SUPERUSER_ACTIONS
+        }
+        return Mix(allowed) if allowed else None
+
+    def draw(self, rng: random.Random) -> str:
+        return rng.choices(list(self.weights), list(self.weights.values()))[0]
+
+
+def parse_mix(value: str) -> Mix:
+    """``name=weight,...`` or the path of a JSON object of the same."""
+    if value.endswith(".json"):
+        weights = json.loads(Path(value).read_text())
+    else:
+        weights = {}
+        for pair in filter(None, value.split(",")):
+            name, _, weight = pair.partition("=")
+            weights[name.strip()] = float(weight)
+    return Mix(weights)
+
+
+def parse_stage(value: str) -> Stage:
+    """``30s:50`` is 30 seconds ending at 50 users; ``2m``, ``500ms`` work too."""
+    duration, _, users = value.partition(":")
+    match = _DURATION.fullmatch(duration)
+    if match is None or not users.isdigit():
+        raise ValueError(f"Expected duration:users, got {value!r}")
+    seconds = float(match[1]) * _SECONDS[match[2]]
+    if seconds <= 0:
+        raise ValueError(f"Stage {value!r} has no duration")
+    return Stage(seconds, int(users))
@@ -0,0 +1,94 @@
+"""Recorded requests and their percentiles, per route id and per stage."""
+
+import math
+from collections import defaultdict
+
+type Summary = dict[str, float]
+
+
+class Recorder:
+    """Latencies and failures, filed under the stage running when recorded.
+
+    Everything happens on the event loop, so plain lists will do.
+    """
+
+    def __init__(self) -> None:
+        self.stage = 0
+        self.latencies: defaultdict[tuple[int, str], list[float]] = defaultdict(list)
+        self.errors: defaultdict[tuple[int, str], int] = defaultdict(int)
+
+    def record(self, route: str, seconds: float | None, *, ok: bool) -> None:
+        """``seconds`` is ``None`` when no response came back at all."""
+        key = (self.stage, route)
+        if seconds is not None:
+            self.latencies[key].append(seconds)
+        if not ok:
+            self.errors[key] += 1
+
+    def _merge(
+        self, *, stage: int | None = None, route: str | None = None
+    ) -> tuple[list[float], int]:
+        def keep(key: tuple[int, str]) -> bool:
+            return stage in (None, key[0]) and route in (None, key[1])
+
+        latencies = [
+            value
+            for key, values in self.latencies.items()
+            if keep(key)
+            for value in values
+        ]
+        errors = sum(count for key, count in self.errors.items() if keep(key))
+        return latencies, errors
+
+    def routes(self) -> list[str]:
+        return sorted({route for _, route in [*self.latencies, *self.errors]})
+
+    def by_route(self, seconds: float) -> dict[str, Summary]:
+        """Every route over the whole run of ``seconds``."""
+        return {
+            route: summarize(*self._merge(route=route), seconds)
+            for route in self.routes()
+        }
+
+    def by_stage(self, durations: list[float]) -> list[Summary]:
+        """All routes together, stage by stage."""
+        return [
+            summarize(*self._merge(stage=stage), seconds)
+            for stage, seconds in enumerate(durations)
+        ]
+
+    def total(self, seconds: float) -> Summary:
+        return summarize(*self._merge(), seconds)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return math.nan
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> Summary:
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": percentile(latencies, 1.0) * 1000,
+    }
+
+
+def print_table(title: str, rows: dict[str, Summary]) -> None:
+    print(
+        f"{title:<32} {'requests':>9} {'errors':>7} {'req/s':>8}"
+        f" {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    for name, row in rows.items():
+        print(
+            f"{name:<32} {row['requests']:>9,} {row['errors']:>7,} {row['rps']:>8.1f}"
+            f" {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}"
+            f" {row['max_ms']:>9.1f}"
+        )
@@ -0,0 +1,185 @@
+"""Virtual users: one logged-in client each, stepping through the mix."""
+
+import asyncio
+import random
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import settings
+from benchmarks.load.mix import Mix
+from benchmarks.load.report import Recorder
+from benchmarks.suite.data import PASSWORD, WORDS
+
+API = settings.API_V1_STR
+PAGE = 100
+# Items a user remembers to read back; older ones are forgotten.
+KNOWN_ITEMS = 200
+
+
+def route_ids(app: FastAPI) -> dict[tuple[str, str], str]:
+    """``(method, path template)`` to the route id the app reports it by.
+
+    Read from the OpenAPI schema, whose operation ids are the route ids
+    ``/metrics`` uses too.
+    """
+    return {
+        (method.upper(), path): operation["operationId"]
+        for path, operations in app.openapi()["paths"].items()
+        for method, operation in operations.items()
+    }
+
+
+class VirtualUser:
+    """Logs in as ``email``, then runs one drawn action after another.
+
+    A user pages through ``/items/`` (and ``/users/``) with the returned
+    cursors, starting over after the last page, and remembers the ids of
+    items it saw or made: reads go to those, patches and deletes to the
+    ones it created itself. Between actions it waits a random think time
+    averaging ``think``. Setting ``stopping`` ends the loop after the
+    action in progress, so no request is cut short.
+    """
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        ids: dict[tuple[str, str], str],
+        recorder: Recorder,
+        *,
+        email: str,
+        mix: Mix,
+        think: float,
+        seed: int,
+    ) -> None:
+        self.http = http
+        self.ids = ids
+        self.recorder = recorder
+        self.email = email
+        self.mix = mix
+        self.think = think
+        self.rng = random.Random(seed)
+        self.stopping = False
+        self.headers: dict[str, str] = {}
+        self.seen: list[str] = []
+        self.created: list[str] = []
+        self.cursors: dict[str, str | None] = {}
+
+    async def run(self) -> None:
+        await self.login()
+        while not self.stopping:
+            await getattr(self, self.mix.draw(self.rng))()
+            if self.think:
+                await asyncio.sleep(self.rng.expovariate(1 / self.think))
+
+    async def _send(
+        self,
+        method: str,
+        template: str,
+        *,
+        path: str | None = None,
+        missing_ok: bool = False,
+        **kwargs,
+    ) -> httpx.Response | None:
+        """Send one request and record it under the route it targets.
+
+        Returns the response if it succeeded. ``missing_ok`` counts a 404 as
+        a success, for reads that may race another user's delete.
+        """
+        route = self.ids[method, API + template]
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(
+                method, API + (path or template), headers=self.headers, **kwargs
+            )
+        except httpx.HTTPError:
+            self.recorder.record(route, None, ok=False)
+            return None
+        ok = response.is_success or (missing_ok and response.status_code == 404)
+        self.recorder.record(route, time.perf_counter() - started, ok=ok)
+        return response if response.is_success else None
+
+    def _remember(self, item_id: str) -> None:
+        self.seen.append(item_id)
+        if len(self.seen) > KNOWN_ITEMS:
+            del self.seen[: KNOWN_ITEMS // 2]
+
+    async def login(self) -> None:
+        response = await self._send(
+            "POST",
+            "/login/access-token",
+            data={"username": self.email, "password": PASSWORD},
+        )
+        if response is not None:
+            token = response.json()["access_token"]
+            self.headers = {"Authorization": f"Bearer {token}"}
+
+    async def me(self) -> None:
+        await self._send("GET", "/users/me")
+
+    async def _page(self, template: str) -> list[dict]:
+        params: dict[str, str | int] = {"limit": PAGE}
+        if cursor := self.cursors.get(template):
+            params["after"] = cursor
+        response = await self._send("GET", template, params=params)
+        if response is None:
+            self.cursors[template] = None
+            return []
+        page = response.json()
+        self.cursors[template] = page["next_cursor"]
+        return page["data"]
+
+    async def list_items(self) -> None:
+        items = await self._page("/items/")
+        for item in self.rng.sample(items, min(5, len(items))):
+            self._remember(item["id"])
+
+    async def list_users(self) -> None:
+        await self._page("/users/")
+
+    async def read_item(self) -> None:
+        if not self.seen:
+            await self.list_items()
+            return
+        item_id = self.rng.choice(self.seen)
+        await self._send(
+            "GET", "/items/{item_id}", path=f"/items/{item_id}", missing_ok=True
+        )
+
+    async def search(self) -> None:
+        await self._send(
+            "GET", "/items/search", params={"q": self.rng.choice(WORDS), "limit": 20}
+        )
+
+    async def create_item(self) -> None:
+        response = await self._send(
+            "POST",
+            "/items/",
+            json={"title": f"{self.rng.choice(WORDS)} load", "description": "Load"},
+        )
+        if response is not None:
+            item_id = response.json()["id"]
+            self.created.append(item_id)
+            self._remember(item_id)
+
+    async def patch_item(self) -> None:
+        if not self.created:
+            await self.create_item()
+            return
+        item_id = self.rng.choice(self.created)
+        await self._send(
+            "PATCH",
+            "/items/{item_id}",
+            path=f"/items/{item_id}",
+            json={"description": f"Patched {self.rng.random():.6f}"},
+        )
+
+    async def delete_item(self) -> None:
+        if not self.created:
+            await self.create_item()
+            return
+        item_id = self.created.pop(self.rng.randrange(len(self.created)))
+        if item_id in self.seen:
+            self.seen.remove(item_id)
+        await self._send("DELETE", "/items/{item_id}", path=f"/items/{item_id}")
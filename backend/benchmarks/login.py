@@ -0,0 +1,51 @@
+"""Login latency versus user count.
+
+Run from ``backend/``::
+
+    uv run python -m benchmarks.login --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+from functools import partial
+
+from app import crud
+from app.core.security import get_password_hash
+from app.crud.backends import get_storage
+from app.models import User
+from benchmarks.common import measure
+
+PASSWORD = "password123"
+
+
+def populate(n: int, hashed_password: str) -> None:
+    crud.reset_mock_data()
+    storage = get_storage()
+    for i in range(n):
+        storage.add_user(
+            User(email=f"user{i}@example.com", hashed_password=hashed_password)
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    hashed_password = get_password_hash(PASSWORD)
+    print(f"{'users':>10} {'get_user_by_email (us)':>24} {'authenticate (us)':>20}")
+    for n in args.sizes:
+        populate(n, hashed_password)
+        # Look up the most recently inserted user: the worst case for a scan.
+        email = f"USER{n - 1}@example.com"
+        lookup = measure(partial(crud.get_user_by_email, email=email), args.repeat)
+        login = measure(
+            partial(crud.authenticate, email=email, password=PASSWORD), args.repeat
+        )
+        print(f"{n:>10} {lookup:>24.2f} {login:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Resident bytes per item in the memory store, and list latency.
+
+Run from ``backend/``::
+
+    uv run python -m benchmarks.memory --items 100000 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from functools import partial
+from uuid import uuid4
+
+from app.api.serialization import items_page_response
+from app.crud.backends import MemoryStorage
+from app.models import Item
+from benchmarks.common import measure
+
+OWNERS = 100
+
+
+def populate(storage: MemoryStorage, n: int) -> list:
+    owners = [uuid4() for _ in range(OWNERS)]
+    for i in range(n):
+        storage.add_item(
+            Item(
+                title=f"Item {i}",
+                description="Seed item for the memory benchmark",
+                owner_id=owners[i % OWNERS],
+            )
+        )
+    return owners
+
+
+def list_page(storage: MemoryStorage, owner_id) -> bytes:
+    """A ``GET /items/`` page as the route builds it, minus HTTP."""
+    items = storage.page_items(owner_id=owner_id, skip=0, limit=100, after=None)
+    return items_page_response(items, len(items), None).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'items':>10} {'bytes/item':>11} {'page (us)':>10} {'owner page (us)':>16}")
+    for n in args.items:
+        gc.collect()
+        tracemalloc.start()
+        storage = MemoryStorage()
+        owners = populate(storage, n)
+        gc.collect()
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        page = measure(partial(list_page, storage, None), args.repeat)
+        owner_page = measure(partial(list_page, storage, owners[0]), args.repeat)
+        print(f"{n:>10} {used / n:>11.0f} {page:>10.1f} {owner_page:>16.1f}")
+        del storage
+
+
+if __name__ == "__main__":
+    main()
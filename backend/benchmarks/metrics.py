@@ -0,0 +1,94 @@
+"""Recording cost of the metrics: per-thread shards vs one shared lock.
+
+``observe`` is timed on one thread and on ``--threads`` threads at once,
+against the same histogram kept in one dict behind a lock, the usual way
+to make it thread-safe. The health check is then timed through the ASGI
+interface with the security headers alone and with ``MetricsMiddleware``
+outside them. Run from ``backend/``::
+
+    uv run python -m benchmarks.metrics --observations 1000000
+"""
+
+import argparse
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from app.core.metrics import REQUEST_BUCKETS, Histogram
+from benchmarks.middleware import make_app, time_requests
+
+
+class LockedHistogram:
+    """One dict for every thread, guarded by a lock."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._cells: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            cells = self._cells.get(labels)
+            if cells is None:
+                cells = self._cells[labels] = [0.0] * (len(self.buckets) + 2)
+            cells[bisect_left(self.buckets, value)] += 1
+            cells[-1] += value
+
+
+def ns_per_observation(histogram, n: int, threads: int) -> float:
+    values = [(i % 1000) / 10_000 for i in range(1000)]
+    per_thread = n // threads
+    start = threading.Barrier(threads + 1)
+
+    def work():
+        start.wait()
+        observe = histogram.observe
+        for i in range(per_thread):
+            observe(values[i % 1000], "items-read_items")
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    began = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - began) / (per_thread * threads) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--observations", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    sharded = Histogram("bench_seconds", "Benchmark.", ("route",))
+    locked = LockedHistogram(REQUEST_BUCKETS)
+    print("ns per observe (best of runs)")
+    print(f"{'threads':>8} {'sharded':>10} {'locked':>10}")
+    for threads in (1, args.threads):
+        best = {"sharded": float("inf"), "locked": float("inf")}
+        for _ in range(args.repeat):
+            for name, histogram in (("sharded", sharded), ("locked", locked)):
+                took = ns_per_observation(histogram, args.observations, threads)
+                best[name] = min(best[name], took)
+        print(f"{threads:>8} {best['sharded']:>10.0f} {best['locked']:>10.0f}")
+
+    apps = {name: make_app(name) for name in ("pure ASGI", "pure ASGI + metrics")}
+    best = dict.fromkeys(apps, float("inf"))
+    for _ in range(args.repeat):
+        for name, app in apps.items():
+            took = asyncio.run(time_requests(app, args.requests))
+            best[name] = min(best[name], took)
+    print("\nhealth check, us per request (best of runs)")
+    for name, took in best.items():
+        print(f"{name:>20} {took:>8.1f}   overhead {took - best['pure ASGI']:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Request throughput with request logging off, as text, and as queued JSON.
+
+The health check is served through the ASGI interface by an app whose only
+middleware is ``SecurityHeadersMiddleware``, logging one access line per
+request or not at all. Logs go to a file, standing in for stderr, so the
+terminal's cost stays out; ``--stall-us`` makes every write block that
+long, as a pipe to a busy log shipper would. JSON runs time the requests
+and the writer thread draining what they queued. Run from ``backend/``::
+
+    uv run python -m benchmarks.request_logging --requests 20000
+    uv run python -m benchmarks.request_logging --stall-us 200
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI
+
+from app.api.routes.utils import health_check
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.middleware import SecurityHeadersMiddleware
+from benchmarks.middleware import _SCOPE
+
+VARIANTS = {
+    "off": None,
+    "text": {"log_format": "text"},
+    "json": {"log_format": "json"},
+    "json, 10% sampled": {"log_format": "json", "access_sample_rate": 0.1},
+}
+
+
+def make_app(log_requests: bool) -> FastAPI:
+    app = FastAPI()
+    app.get("/health-check")(health_check)
+    app.add_middleware(SecurityHeadersMiddleware, hsts=False, log_requests=log_requests)
+    return app
+
+
+async def serve(app: FastAPI, n: int) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(n):
+        await app(dict(_SCOPE), receive, send)
+
+
+class StallingFile(io.TextIOWrapper):
+    stall = 0.0
+
+    def write(self, text: str) -> int:
+        if self.stall:
+            time.sleep(self.stall)
+        return super().write(text)
+
+
+def requests_per_second(name: str, n: int, log_path: str, stall: float) -> float:
+    options = VARIANTS[name]
+    app = make_app(log_requests=options is not None)
+    with StallingFile(open(log_path, "ab")) as log:
+        log.stall = stall
+        stderr, sys.stderr = sys.stderr, log
+        try:
+            setup_logging(**(options or {}))
+            asyncio.run(serve(app, 100))  # warm up: middleware stack gets built
+            start = time.perf_counter()
+            asyncio.run(serve(app, n))
+            shutdown_logging()
+            took = time.perf_counter() - start
+        finally:
+            sys.stderr = stderr
+            setup_logging()
+    return n / took
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stall-us", type=float, default=0.0)
+    args = parser.parse_args()
+
+    best = dict.fromkeys(VARIANTS, 0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "app.log")
+        # Interleaved so that drift in the machine hits every variant alike.
+        for _ in range(args.repeat):
+            for name in VARIANTS:
+                took = requests_per_second(
+                    name, args.requests, log_path, args.stall_us / 1e6
+                )
+                best[name] = max(best[name], took)
+        size = os.path.getsize(log_path)
+
+    print(
+        f"{args.requests:,} requests, {args.stall_us:g} us stall per write; "
+        f"req/s (best of runs); {size:,} log bytes"
+    )
+    for name, rate in best.items():
+        print(f"{name:>18} {rate:>10,.0f}   {rate / best['off'] - 1:>+7.1%}")
+
+
+if __name__ == "__main__":
+    main()
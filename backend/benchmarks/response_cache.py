@@ -0,0 +1,125 @@
+"""Hot list-page throughput with and without the response cache.
+
+The same ``/items/`` and ``/users/`` pages are requested over and over, as
+a dashboard polling them would, with the cache disabled and enabled.
+``route`` times the route function alone (page read and encoding, or a
+cache hit); ``http`` is requests per second through the app, including
+auth and middleware. Run from ``backend/``::
+
+    uv run python -m benchmarks.response_cache --items 100000
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app import crud
+from app.api.pagination import CreatedRange
+from app.api.routes.items import read_items
+from app.api.routes.users import read_users
+from app.core.response_cache import response_cache
+from app.core.security import create_access_token
+from app.crud.backends import MemoryStorage, SQLiteStorage, Storage, set_storage
+from app.main import app
+from app.models import Item, User
+from benchmarks.common import measure
+
+OWNERS = 100
+EVERYTHING = CreatedRange(None, None)
+
+
+def populate(storage: Storage, n: int, alice: User) -> None:
+    owners = [alice.id] + [uuid4() for _ in range(OWNERS - 1)]
+    with storage.batch():
+        for i in range(n):
+            storage.add_item(
+                Item(
+                    title=f"Item {i}", description="x" * 40, owner_id=owners[i % OWNERS]
+                )
+            )
+        for i in range(n // 10):
+            storage.add_user(User(email=f"user{i}@example.com", hashed_password="x"))
+
+
+def throughput(client: TestClient, url: str, headers: dict, seconds: float) -> float:
+    count, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        assert client.get(url, headers=headers).status_code == 200
+        count += 1
+    return count / elapsed
+
+
+def run(storage: Storage, n: int, repeat: int, seconds: float) -> dict[str, float]:
+    previous = set_storage(storage)
+    try:
+        crud.reset_mock_data()
+        admin = crud.get_user_by_email(email="admin@example.com")
+        alice = crud.get_user_by_email(email="alice@example.com")
+        assert admin is not None and alice is not None
+        populate(storage, n, alice)
+        client = TestClient(app)
+        pages = {
+            "items (admin)": (
+                partial(read_items, admin, None, EVERYTHING, limit=100),
+                "/api/v1/items/?limit=100",
+                admin,
+            ),
+            "items (owner)": (
+                partial(read_items, alice, None, EVERYTHING, limit=100),
+                "/api/v1/items/?limit=100",
+                alice,
+            ),
+            "users": (
+                partial(read_users, admin, None, EVERYTHING, limit=100),
+                "/api/v1/users/?limit=100",
+                admin,
+            ),
+        }
+        results = {}
+        max_bytes = response_cache.max_bytes
+        for name, (route, url, user) in pages.items():
+            token = create_access_token(str(user.id), timedelta(hours=1))
+            headers = {"Authorization": f"Bearer {token}"}
+            for label, cap in (("off", 0), ("on", max_bytes)):
+                response_cache.max_bytes = cap
+                response_cache.clear()
+                results[f"{name} route us, {label}"] = measure(route, repeat)
+                results[f"{name} http req/s, {label}"] = throughput(
+                    client, url, headers, seconds
+                )
+        response_cache.max_bytes = max_bytes
+        results["hit ratio"] = response_cache.stats().hit_ratio
+        return results
+    finally:
+        set_storage(previous)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    memory = run(MemoryStorage(), args.items, args.repeat, args.seconds)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(str(Path(tmp, "cache.db")))
+        sqlite = run(storage, args.items, args.repeat, args.seconds)
+        storage.close()
+
+    print(f"{args.items:,} items, {args.items // 10:,} users")
+    print(f"{'page':>30} {'memory':>12} {'sqlite':>12}")
+    for name, value in memory.items():
+        print(f"{name:>30} {value:>12,.2f} {sqlite[name]:>12,.2f}")
+
+
+if __name__ == "__main__":
+    main()
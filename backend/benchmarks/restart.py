@@ -0,0 +1,71 @@
+"""Restart time of the journaled memory store: log replay versus snapshot.
+
+Run from ``backend/``::
+
+    uv run python -m benchmarks.restart --items 100000 1000000 --users 100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from app.crud.backends import JournaledMemoryStorage
+from app.models import Item, User
+
+
+def _size_mb(data_dir: str, pattern: str) -> float:
+    return sum(p.stat().st_size for p in Path(data_dir).glob(pattern)) / 1e6
+
+
+def _reopen(data_dir: str) -> float:
+    start = time.perf_counter()
+    store = JournaledMemoryStorage(data_dir, snapshot_every=10**12)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument(
+        "--users", type=int, default=100_000, help="stored alongside the items"
+    )
+    args = parser.parse_args()
+
+    print(f"{args.users:,} users with each item count")
+    print(f"{'items':>10} {'source':>9} {'size (MB)':>10} {'restart (s)':>12}")
+    for n in args.items:
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = JournaledMemoryStorage(data_dir, snapshot_every=10**12)
+            with store.batch():
+                for i in range(args.users):
+                    store.add_user(
+                        User(email=f"user{i}@example.com", hashed_password="x")
+                    )
+            owners = [uuid4() for _ in range(100)]
+            for i in range(n):
+                store.add_item(
+                    Item(
+                        title=f"Item {i}",
+                        description="x" * 32,
+                        owner_id=owners[i % 100],
+                    )
+                )
+            store.close()
+            replay = _reopen(data_dir)
+            size = _size_mb(data_dir, "wal-*")
+            print(f"{n:>10} {'log':>9} {size:>10.1f} {replay:>12.2f}")
+
+            store = JournaledMemoryStorage(data_dir, snapshot_every=10**12)
+            store.snapshot()
+            store.close()
+            loaded = _reopen(data_dir)
+            size = _size_mb(data_dir, "snapshot.bin")
+            print(f"{n:>10} {'snapshot':>9} {size:>10.1f} {loaded:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Keyword search latency on the memory and SQLite stores.
+
+Items get a three-word title and an eight-word description drawn from a
+Zipf-distributed vocabulary, so some words hit a large share of the store
+and most hit a handful. Each query is timed through ``Storage.search_items``
+(first page of 20 plus the total count); ``scan`` is the same query answered
+without an index, by tokenizing every item. Run from ``backend/``::
+
+    uv run python -m benchmarks.search --items 1000000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from uuid import uuid4
+
+from app.crud.backends import MemoryStorage, SQLiteStorage
+from app.crud.backends.base import Storage
+from app.crud.search import tokenize
+from app.models import Item
+from benchmarks.common import measure
+
+OWNERS = 100
+VOCABULARY = 50_000
+
+
+def make_words(rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < VOCABULARY:
+        length = rng.randint(4, 10)
+        words.add("".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=length)))
+    # Shuffled so that word frequency is unrelated to spelling.
+    shuffled = sorted(words)
+    rng.shuffle(shuffled)
+    return shuffled
+
+
+def populate(storage: Storage, words: list[str], n: int, rng: random.Random) -> list:
+    owners = [uuid4() for _ in range(OWNERS)]
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    for start in range(0, n, 10_000):
+        count = min(10_000, n - start)
+        drawn = rng.choices(words, weights, k=count * 11)
+        with storage.batch():
+            for i in range(count):
+                text = drawn[i * 11 : i * 11 + 11]
+                storage.add_item(
+                    Item(
+                        title=" ".join(text[:3]),
+                        description=" ".join(text[3:]),
+                        owner_id=owners[(start + i) % OWNERS],
+                    )
+                )
+    return owners
+
+
+def queries(words: list[str]) -> dict[str, str]:
+    return {
+        "common word": words[0],
+        "rare word": words[-1],
+        "2-char prefix": words[1][:2],
+        "4-char prefix": words[2][:4],
+        "two words": f"{words[3]} {words[10]}",
+    }
+
+
+def scan(storage: Storage, query: str) -> list[Item]:
+    terms = tokenize(query)
+    matches = []
+    for item in storage.list_items():
+        words = tokenize(item.title) + tokenize(item.description)
+        if all(any(word.startswith(t) for word in words) for t in terms):
+            matches.append(item)
+    return matches[:20]
+
+
+def run(storage: Storage, n: int, repeat: int) -> dict[str, float]:
+    rng = random.Random(1)
+    words = make_words(rng)
+    start = time.perf_counter()
+    owners = populate(storage, words, n, rng)
+    results = {"index build (s)": time.perf_counter() - start}
+    for name, query in queries(words).items():
+        results[name] = measure(
+            partial(storage.search_items, query, owner_id=None, skip=0, limit=20),
+            repeat,
+        )
+        matched = storage.search_items(query, owner_id=None, skip=0, limit=1)[1]
+        results[f"  matches ({name})"] = matched
+    results["common word, one owner"] = measure(
+        partial(storage.search_items, words[0], owner_id=owners[0], skip=0, limit=20),
+        repeat,
+    )
+    results["scan: rare word"] = measure(partial(scan, storage, words[-1]), 1)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    memory = run(MemoryStorage(), args.items, args.repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(str(Path(tmp, "search.db")))
+        sqlite = run(storage, args.items, args.repeat)
+        storage.close()
+
+    print(f"{args.items:,} items; latencies in us (median)")
+    print(f"{'query':>28} {'memory':>14} {'sqlite':>14}")
+    for name, value in memory.items():
+        print(f"{name:>28} {value:>14,.1f} {sqlite[name]:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
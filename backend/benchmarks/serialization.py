@@ -0,0 +1,70 @@
+"""CPU cost of encoding a list page: per-row validation vs single pass.
+
+Run from ``backend/``::
+
+    uv run python -m benchmarks.serialization --rows 100
+"""
+
+import argparse
+from functools import partial
+
+from fastapi.utils import create_model_field
+
+from app.api.serialization import items_page_response, users_page_response
+from app.models import Item, ItemPublic, ItemsPublic, User, UserPublic, UsersPublic
+from benchmarks.common import measure
+
+_response_fields = {
+    model: create_model_field(name="Response", type_=model, mode="serialization")
+    for model in (ItemsPublic, UsersPublic)
+}
+
+
+def validate_twice(public, page_model, records: list) -> bytes:
+    """What the routes did before: validate every row, then let FastAPI
+    validate and serialize the response model again."""
+    field = _response_fields[page_model]
+    content = page_model(
+        data=[public.model_validate(record) for record in records],
+        count=len(records),
+        next_cursor=None,
+    )
+    value, _ = field.validate(content, {}, loc=("response",))
+    return field.serialize_json(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2_000)
+    args = parser.parse_args()
+
+    owner = User(email="owner@example.com", hashed_password="x")
+    items = [Item(title=f"Item {i}", owner_id=owner.id) for i in range(args.rows)]
+    users = [
+        User(email=f"user{i}@example.com", hashed_password="x")
+        for i in range(args.rows)
+    ]
+
+    cases = {
+        "items": (
+            partial(validate_twice, ItemPublic, ItemsPublic, items),
+            partial(items_page_response, items, len(items), None),
+        ),
+        "users": (
+            partial(validate_twice, UserPublic, UsersPublic, users),
+            partial(users_page_response, users, len(users), None),
+        ),
+    }
+    print(
+        f"{'page':>6} {'validate twice (us)':>20} {'single pass (us)':>17}"
+        f" {'speedup':>8}"
+    )
+    for name, (before, after) in cases.items():
+        slow = measure(before, args.repeat)
+        fast = measure(after, args.repeat)
+        print(f"{name:>6} {slow:>20.1f} {fast:>17.1f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
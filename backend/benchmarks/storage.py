@@ -0,0 +1,84 @@
+"""Memory versus SQLite storage on the crud calls behind each route.
+
+Run from ``backend/``::
+
+    uv run python -m benchmarks.storage --items 10000 100000
+"""
+
+import argparse
+import os
+import tempfile
+from functools import partial
+
+from app import crud
+from app.core.security import get_password_hash
+from app.crud.backends import MemoryStorage, SQLiteStorage, Storage, set_storage
+from app.models import Item, ItemCreate, ItemUpdate, User
+from benchmarks.common import measure
+
+OWNERS = 100
+
+
+def populate(storage: Storage, n_items: int) -> list[User]:
+    hashed_password = get_password_hash("password123")
+    owners = [
+        User(email=f"owner{i}@example.com", hashed_password=hashed_password)
+        for i in range(OWNERS)
+    ]
+    for owner in owners:
+        storage.add_user(owner)
+    for i in range(n_items):
+        storage.add_item(Item(title=f"Item {i}", owner_id=owners[i % OWNERS].id))
+    return owners
+
+
+def run(storage: Storage, n_items: int, repeat: int) -> dict[str, float]:
+    set_storage(storage)
+    owners = populate(storage, n_items)
+    owner = owners[-1]
+    middle = crud.get_items(skip=n_items // 2, limit=1)[0][0]
+
+    def create_update_delete() -> None:
+        item = crud.create_item(item_in=ItemCreate(title="Bench"), owner_id=owner.id)
+        item = crud.update_item(item=item, item_in=ItemUpdate(title="Bench 2"))
+        crud.delete_item(item=item)
+
+    return {
+        "login lookup": measure(
+            partial(crud.get_user_by_email, email=owner.email), repeat
+        ),
+        "current user": measure(partial(crud.get_user, user_id=owner.id), repeat),
+        "own items page": measure(
+            partial(crud.get_items_by_owner, owner_id=owner.id, limit=100), repeat
+        ),
+        "all items page": measure(partial(crud.get_items, limit=100), repeat),
+        "deep cursor page": measure(
+            partial(crud.get_items, limit=100, after=(middle.created_at, middle.id)),
+            repeat,
+        ),
+        "create/update/delete": measure(create_update_delete, repeat),
+        "stats": measure(crud.get_user_stats, repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for n_items in args.items:
+        with tempfile.TemporaryDirectory() as tmp:
+            sqlite = SQLiteStorage(os.path.join(tmp, "bench.db"))
+            memory_results = run(MemoryStorage(), n_items, args.repeat)
+            sqlite_results = run(sqlite, n_items, args.repeat)
+            sqlite.close()
+
+        print(f"\n{n_items} items, {OWNERS} owners (median us)")
+        print(f"{'workload':<22} {'memory':>10} {'sqlite':>10}")
+        for name, memory_us in memory_results.items():
+            print(f"{name:<22} {memory_us:>10.1f} {sqlite_results[name]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
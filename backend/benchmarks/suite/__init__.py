@@ -0,0 +1,12 @@
+"""Regression suite: crud, security and route latencies, saved as JSON.
+
+Every function exported by ``app.crud`` and ``app.core.security`` and the
+main API routes are timed against synthetic stores of each ``--size``
+(that many users and that many items). Save a run as the baseline, run
+again after a change, and compare; the exit status is 1 when a case got
+slower than ``--threshold``. Run from ``backend/``::
+
+    uv run python -m benchmarks.suite run --sizes 1000 100000 -o baseline.json
+    uv run python -m benchmarks.suite run --sizes 1000 100000 -o current.json
+    uv run python -m benchmarks.suite compare baseline.json current.json
+"""
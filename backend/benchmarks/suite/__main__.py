@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from app.core.hashing import hasher_pool
+from app.core.response_cache import response_cache
+from app.crud.backends import set_storage
+from benchmarks.suite import __doc__ as suite_doc
+from benchmarks.suite import results, routes
+from benchmarks.suite.crud import crud_cases, security_cases, uncovered
+from benchmarks.suite.data import generate, make_storage
+from benchmarks.suite.timing import time_async_case, time_case
+
+GROUPS = ("crud", "security", "routes")
+
+
+def _progress(name: str, summary: dict[str, float]) -> None:
+    print(
+        f"{name:<50} {summary['median_us']:>12,.1f} us  (n={summary['samples']})",
+        file=sys.stderr,
+    )
+
+
+async def _time_routes(
+    size: int, dataset, repeat: int, budget: float
+) -> results.Results:
+    timed = {}
+    async with routes.client() as http:
+        for case in routes.route_cases(http, dataset):
+            name = f"routes/{case.name}@{size}"
+            timed[name] = await time_async_case(case, repeat=repeat, budget=budget)
+            _progress(name, timed[name])
+    return timed
+
+
+def run(args: argparse.Namespace) -> int:
+    logging.disable(logging.INFO)
+    response_cache.max_bytes = 0
+    timed: results.Results = {}
+    try:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                storage = make_storage(args.backend, tmp)
+                previous = set_storage(storage)
+                try:
+                    print(f"generating {size:,} users and items", file=sys.stderr)
+                    dataset = generate(storage, size)
+                    if missing := uncovered(
+                        crud_cases(dataset) + security_cases(dataset)
+                    ):
+                        print(f"warning: no case for {missing}", file=sys.stderr)
+                    cases = []
+                    if "crud" in args.groups:
+                        cases += [("crud", case) for case in crud_cases(dataset)]
+                    if "security" in args.groups and size == args.sizes[0]:
+                        cases += [("security", c) for c in security_cases(dataset)]
+                    for group, case in cases:
+                        # Security does not depend on the store: timed once.
+                        suffix = "" if group == "security" else f"@{size}"
+                        name = f"{group}/{case.name}{suffix}"
+                        timed[name] = time_case(
+                            case, repeat=args.repeat, budget=args.budget
+                        )
+                        _progress(name, timed[name])
+                    if "routes" in args.groups:
+                        timed |= asyncio.run(
+                            _time_routes(size, dataset, args.repeat, args.budget)
+                        )
+                finally:
+                    set_storage(previous)
+                    storage.close()
+    finally:
+        hasher_pool.shutdown()
+
+    results.save(
+        args.output,
+        timed,
+        backend=args.backend,
+        sizes=args.sizes,
+        repeat=args.repeat,
+        budget=args.budget,
+    )
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    base_meta, baseline = results.load(args.baseline)
+    meta, current = results.load(args.current)
+    for key in ("machine", "cpus", "python", "backend"):
+        if base_meta.get(key) != meta.get(key):
+            print(
+                f"warning: {key} differs: {base_meta.get(key)} vs {meta.get(key)}",
+                file=sys.stderr,
+            )
+    regressions = results.compare(
+        baseline, current, threshold=args.threshold, floor_us=args.floor_us
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=suite_doc.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runner = commands.add_parser("run", help="time every case, write JSON results")
+    runner.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000])
+    runner.add_argument(
+        "--backend", choices=["memory", "columnar", "sqlite"], default="memory"
+    )
+    runner.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    runner.add_argument("--repeat", type=int, default=200)
+    runner.add_argument(
+        "--budget", type=float, default=2.0, help="seconds per case, at most"
+    )
+    runner.add_argument("-o", "--output", type=Path, help="default: stdout")
+
+    comparer = commands.add_parser("compare", help="flag regressions vs a baseline")
+    comparer.add_argument("baseline", type=Path)
+    comparer.add_argument("current", type=Path)
+    comparer.add_argument(
+        "--threshold", type=float, default=0.25, help="slowdown that fails (0.25)"
+    )
+    comparer.add_argument(
+        "--floor-us", type=float, default=5.0, help="ignore smaller changes (5 us)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return compare(args)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""Cases for every function exported by ``app.crud`` and ``app.core.security``.
+
+Writes are balanced where they can be: a delete removes what its untimed
+setup created. Creates add ``repeat`` records at most, which leaves the
+store's size close to the generated one.
+"""
+
+import asyncio
+import inspect
+import itertools
+import json
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from datetime import timedelta
+from uuid import uuid4
+
+from app import crud
+from app.core import security
+from app.crud.backends import MemoryStorage, set_storage
+from app.models import (
+    Item,
+    ItemCreate,
+    ItemUpdate,
+    UserCreate,
+    UserUpdate,
+    UserUpdateMe,
+)
+from benchmarks.suite.data import PASSWORD, Dataset
+from benchmarks.suite.timing import Case
+
+# Records per call for the batch functions.
+BATCH = 10
+
+_serial = itertools.count()
+
+
+def _email() -> str:
+    return f"bench{next(_serial)}@bench.example.com"
+
+
+def _drain(records: Iterator) -> None:
+    deque(records, maxlen=0)
+
+
+async def _body(lines: list[dict]) -> AsyncIterator[bytes]:
+    yield "".join(json.dumps(line) + "\n" for line in lines).encode()
+
+
+def _on_scratch_storage(fn):
+    """Run ``fn`` against an empty memory store, for the functions that
+    reset or seed the whole store."""
+
+    def run(_):
+        previous = set_storage(MemoryStorage())
+        try:
+            fn()
+        finally:
+            set_storage(previous)
+
+    return run
+
+
+def crud_cases(d: Dataset) -> list[Case]:
+    owner_id = d.owner.id
+
+    def new_item(_=None) -> Item:
+        return crud.create_item(item_in=ItemCreate(title="Bench"), owner_id=owner_id)
+
+    def new_items(_=None, owner=owner_id) -> list[Item]:
+        return crud.create_items(
+            items_in=[ItemCreate(title=f"Bench {i}") for i in range(BATCH)],
+            owner_id=owner,
+        )
+
+    def new_user(_=None):
+        return crud.create_user(
+            user_create=UserCreate(email=_email(), password=PASSWORD),
+            hashed_password=d.hashed_password,
+        )
+
+    def new_owner_items():
+        owner = uuid4()
+        new_items(owner=owner)
+        return owner
+
+    return [
+        Case(
+            "authenticate",
+            lambda _: crud.authenticate(email=d.owner.email, password=PASSWORD),
+        ),
+        Case("count_items", lambda _: crud.count_items()),
+        Case("count_items[owner]", lambda _: crud.count_items(owner_id=owner_id)),
+        Case("count_users", lambda _: crud.count_users()),
+        Case("create_item", new_item),
+        Case("create_items", new_items),
+        Case("create_user", new_user),
+        Case(
+            "create_users",
+            lambda _: crud.create_users(
+                users_in=[
+                    UserCreate(email=_email(), password=PASSWORD) for _ in range(BATCH)
+                ],
+                hashed_passwords=[d.hashed_password] * BATCH,
+            ),
+        ),
+        Case("delete_item", lambda item: crud.delete_item(item=item), new_item),
+        Case("delete_items", lambda items: crud.delete_items(items=items), new_items),
+        Case(
+            "delete_items_by_owner",
+            lambda owner: crud.delete_items_by_owner(owner_id=owner),
+            new_owner_items,
+        ),
+        Case("delete_user", lambda user: crud.delete_user(user=user), new_user),
+        Case("export_items", lambda _: _drain(crud.export_items())),
+        Case(
+            "export_items[owner]",
+            lambda _: _drain(crud.export_items(owner_id=owner_id)),
+        ),
+        Case("export_users", lambda _: _drain(crud.export_users())),
+        Case("get_import_progress", lambda _: crud.get_import_progress("missing")),
+        Case("get_item", lambda _: crud.get_item(item_id=d.item.id)),
+        Case("get_item_version", lambda _: crud.get_item_version(item_id=d.item.id)),
+        Case("get_items", lambda _: crud.get_items(limit=100)),
+        Case(
+            "get_items[deep skip]",
+            lambda _: crud.get_items(skip=d.size // 2, limit=100),
+        ),
+        Case(
+            "get_items_by_owner",
+            lambda _: crud.get_items_by_owner(owner_id=owner_id, limit=100),
+        ),
+        Case("get_items_generation", lambda _: crud.get_items_generation()),
+        Case("get_user", lambda _: crud.get_user(user_id=d.middle_user.id)),
+        Case(
+            "get_user_by_email",
+            lambda _: crud.get_user_by_email(email=d.middle_user.email),
+        ),
+        Case("get_user_stats", lambda _: crud.get_user_stats()),
+        Case(
+            "get_user_version",
+            lambda _: crud.get_user_version(user_id=d.middle_user.id),
+        ),
+        Case("get_users", lambda _: crud.get_users(limit=100)),
+        Case(
+            "get_users[email order]",
+            lambda _: crud.get_users(limit=100, order_by="email"),
+        ),
+        Case("get_users_generation", lambda _: crud.get_users_generation()),
+        Case(
+            "import_items",
+            lambda _: asyncio.run(
+                crud.import_items(
+                    _body([{"title": f"Imported {i}"} for i in range(BATCH)]),
+                    fmt="ndjson",
+                    owner_id=owner_id,
+                )
+            ),
+        ),
+        Case(
+            "import_users",
+            lambda _: asyncio.run(
+                crud.import_users(
+                    _body([{"email": _email(), "password": PASSWORD}]),
+                    fmt="ndjson",
+                )
+            ),
+        ),
+        Case(
+            "insert_items",
+            lambda items: crud.insert_items(items=items),
+            lambda: [Item(title=f"Bench {i}", owner_id=owner_id) for i in range(BATCH)],
+        ),
+        Case("list_all_items", lambda _: crud.list_all_items()),
+        Case("list_all_users", lambda _: crud.list_all_users()),
+        Case("reset_mock_data", _on_scratch_storage(crud.reset_mock_data)),
+        Case("search_items", lambda _: crud.search_items(query=d.search_word)),
+        Case("seed_mock_data", _on_scratch_storage(crud.seed_mock_data)),
+        Case(
+            "update_item",
+            lambda _: crud.update_item(item=d.item, item_in=ItemUpdate(title="Bench")),
+        ),
+        Case(
+            "update_items",
+            lambda items: crud.update_items(
+                updates=[(item, ItemUpdate(title="Bench")) for item in items]
+            ),
+            new_items,
+        ),
+        Case(
+            "update_user",
+            lambda _: crud.update_user(
+                user=d.middle_user, user_update=UserUpdate(full_name="Bench")
+            ),
+        ),
+        Case(
+            "update_user_me",
+            lambda _: crud.update_user_me(
+                user=d.middle_user, user_update=UserUpdateMe(full_name="Bench")
+            ),
+        ),
+        Case(
+            "update_user_password",
+            lambda _: crud.update_user_password(
+                user=d.middle_user,
+                new_password=PASSWORD,
+                hashed_password=d.hashed_password,
+            ),
+        ),
+    ]
+
+
+def security_cases(d: Dataset) -> list[Case]:
+    return [
+        Case(
+            "create_access_token",
+            lambda _: security.create_access_token(d.owner.id, timedelta(hours=1)),
+        ),
+        Case("get_password_hash", lambda _: security.get_password_hash(PASSWORD)),
+        Case(
+            "verify_password",
+            lambda _: security.verify_password(PASSWORD, d.hashed_password),
+        ),
+    ]
+
+
+def uncovered(cases: list[Case]) -> list[str]:
+    """Exported crud and security functions no case times."""
+    names = {case.name.split("[")[0] for case in cases}
+    exported = [getattr(crud, name) for name in crud.__all__] + [
+        fn
+        for _, fn in inspect.getmembers(security, inspect.isfunction)
+        if fn.__module__ == security.__name__
+    ]
+    return sorted(
+        fn.__name__
+        for fn in exported
+        if inspect.isfunction(fn) and fn.__name__ not in names
+    )
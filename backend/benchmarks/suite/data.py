@@ -0,0 +1,91 @@
+"""Synthetic users and items for the suite, added straight to a storage."""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from app.core.security import create_access_token, get_password_hash
+from app.crud.backends import ColumnarStorage, MemoryStorage, SQLiteStorage, Storage
+from app.models import Item, User
+
+PASSWORD = "benchmark-password"
+# Every owner gets this many items, so per-owner pages stay the same size
+# whatever the store's size and only an O(n) path grows with it.
+ITEMS_PER_OWNER = 100
+WORDS = ("tent", "stove", "lantern", "kayak", "rope", "compass", "map", "boots")
+ADMIN_EMAIL = "admin@bench.example.com"
+
+
+def user_email(i: int) -> str:
+    """Email of the ``i``-th generated user, for ``1 <= i < size``."""
+    return f"user{i:07d}@bench.example.com"
+
+
+@dataclass
+class Dataset:
+    size: int
+    hashed_password: str
+    admin: User
+    owner: User
+    middle_user: User
+    item: Item
+    search_word: str
+
+    @property
+    def admin_token(self) -> str:
+        return create_access_token(str(self.admin.id), timedelta(hours=1))
+
+    @property
+    def owner_token(self) -> str:
+        return create_access_token(str(self.owner.id), timedelta(hours=1))
+
+
+def make_storage(backend: str, directory: str) -> Storage:
+    """An empty store of the ``--backend`` kind; SQLite's lives in ``directory``."""
+    if backend == "sqlite":
+        return SQLiteStorage(str(Path(directory, "bench.db")))
+    return ColumnarStorage() if backend == "columnar" else MemoryStorage()
+
+
+def generate(storage: Storage, size: int) -> Dataset:
+    """Fill an empty ``storage`` with ``size`` users and ``size`` items.
+
+    Users share one password hash; an admin comes first. Items are spread
+    evenly over ``size // ITEMS_PER_OWNER`` owners and titled from a small
+    vocabulary, so a keyword search matches ``1 / len(WORDS)`` of them.
+    """
+    hashed_password = get_password_hash(PASSWORD)
+    admin = User(
+        email=ADMIN_EMAIL,
+        hashed_password=hashed_password,
+        is_superuser=True,
+    )
+    users = [admin] + [
+        User(email=user_email(i), hashed_password=hashed_password)
+        for i in range(1, size)
+    ]
+    count = max(1, size // ITEMS_PER_OWNER)
+    owners = [users[i * len(users) // count] for i in range(count)]
+    items = [
+        Item(
+            title=f"{WORDS[i % len(WORDS)]} {i}",
+            description="Synthetic benchmark item",
+            owner_id=owners[i % count].id,
+        )
+        for i in range(size)
+    ]
+    with storage.batch():
+        for user in users:
+            storage.add_user(user)
+        for item in items:
+            storage.add_item(item)
+
+    return Dataset(
+        size=size,
+        hashed_password=hashed_password,
+        admin=admin,
+        owner=owners[-1],
+        middle_user=users[len(users) // 2],
+        item=items[len(items) // 2],
+        search_word=WORDS[1],
+    )
@@ -0,0 +1,83 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+type Results = dict[str, dict[str, float]]
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(path: Path | None, results: Results, **meta: Any) -> None:
+    """Write ``results`` with the machine and run settings, or print them."""
+    document = {
+        "meta": {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            **meta,
+        },
+        "results": results,
+    }
+    text = json.dumps(document, indent=2) + "\n"
+    if path is None:
+        print(text, end="")
+    else:
+        path.write_text(text)
+
+
+def load(path: Path) -> tuple[dict[str, Any], Results]:
+    document = json.loads(path.read_text())
+    return document["meta"], document["results"]
+
+
+def compare(
+    baseline: Results, current: Results, *, threshold: float, floor_us: float
+) -> list[str]:
+    """Print a case by case comparison of medians; return the regressions.
+
+    A case regresses when its median grew by more than ``threshold`` (a
+    fraction) and by more than ``floor_us``, which keeps sub-microsecond
+    jitter on the fastest cases from failing a run.
+    """
+    regressions = []
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before = baseline[name]["median_us"]
+        after = current[name]["median_us"]
+        change = after / before - 1 if before else 0.0
+        verdict = ""
+        if change > threshold and after - before > floor_us:
+            verdict = "REGRESSED"
+            regressions.append(name)
+        elif change < -threshold and before - after > floor_us:
+            verdict = "faster"
+        rows.append((change, name, before, after, verdict))
+
+    width = max((len(name) for _, name, *_ in rows), default=4)
+    print(f"{'case':<{width}} {'before us':>12} {'after us':>12} {'change':>8}")
+    for change, name, before, after, verdict in sorted(rows, reverse=True):
+        print(
+            f"{name:<{width}} {before:>12,.1f} {after:>12,.1f} {change:>+8.1%} "
+            f"{verdict}"
+        )
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f"{name:<{width}} only in the baseline")
+    for name in sorted(current.keys() - baseline.keys()):
+        print(f"{name:<{width}} new")
+    return regressions
@@ -0,0 +1,82 @@
+"""Route cases, sent through the whole ASGI app with httpx's ASGITransport.
+
+No sockets are involved: a request goes through the middleware, auth and
+the route as it would under uvicorn, minus the server. The response cache
+is off, so list pages are read and encoded on every request.
+"""
+
+import httpx
+
+from app.core.config import settings
+from app.main import app
+from benchmarks.suite.data import PASSWORD, Dataset
+from benchmarks.suite.timing import AsyncCase
+
+API = settings.API_V1_STR
+
+
+def client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+
+
+def route_cases(http: httpx.AsyncClient, d: Dataset) -> list[AsyncCase]:
+    admin = {"Authorization": f"Bearer {d.admin_token}"}
+    owner = {"Authorization": f"Bearer {d.owner_token}"}
+
+    def get(url: str, headers: dict):
+        async def run(_) -> None:
+            response = await http.get(url, headers=headers)
+            assert response.status_code == 200, (url, response.status_code)
+
+        return run
+
+    async def login(_) -> None:
+        response = await http.post(
+            f"{API}/login/access-token",
+            data={"username": d.owner.email, "password": PASSWORD},
+        )
+        assert response.status_code == 200, response.text
+
+    async def create_item(_) -> None:
+        response = await http.post(
+            f"{API}/items/", json={"title": "Bench"}, headers=owner
+        )
+        assert response.status_code == 201, response.text
+
+    async def new_item() -> str:
+        response = await http.post(
+            f"{API}/items/", json={"title": "Bench"}, headers=owner
+        )
+        return response.json()["id"]
+
+    async def update_item(item_id: str) -> None:
+        response = await http.patch(
+            f"{API}/items/{item_id}", json={"title": "Bench 2"}, headers=owner
+        )
+        assert response.status_code == 200, response.text
+
+    async def delete_item(item_id: str) -> None:
+        response = await http.delete(f"{API}/items/{item_id}", headers=owner)
+        assert response.status_code == 200, response.text
+
+    item = f"{API}/items/{d.item.id}"
+    return [
+        AsyncCase("GET /utils/health-check", get(f"{API}/utils/health-check", {})),
+        AsyncCase("POST /login/access-token", login),
+        AsyncCase("GET /users/me", get(f"{API}/users/me", owner)),
+        AsyncCase("GET /users/", get(f"{API}/users/?limit=100", admin)),
+        AsyncCase("GET /users/{id}", get(f"{API}/users/{d.middle_user.id}", admin)),
+        AsyncCase("GET /items/ (admin)", get(f"{API}/items/?limit=100", admin)),
+        AsyncCase("GET /items/ (owner)", get(f"{API}/items/?limit=100", owner)),
+        AsyncCase("GET /items/{id}", get(item, admin)),
+        AsyncCase(
+            "GET /items/search",
+            get(f"{API}/items/search?q={d.search_word}", admin),
+        ),
+        AsyncCase("POST /items/", create_item),
+        AsyncCase("PATCH /items/{id}", update_item, new_item),
+        AsyncCase("DELETE /items/{id}", delete_item, new_item),
+        AsyncCase("GET /utils/stats", get(f"{API}/utils/stats", admin)),
+    ]
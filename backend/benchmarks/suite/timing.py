@@ -0,0 +1,65 @@
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Slow cases (Argon2, full exports at 1M) stop after the time budget, but
+# never with fewer samples than this.
+MIN_SAMPLES = 5
+
+
+@dataclass
+class Case:
+    """One timed call. ``setup`` runs untimed before each call and its
+    result is passed in, e.g. a record for a delete to remove."""
+
+    name: str
+    run: Callable[[Any], Any]
+    setup: Callable[[], Any] | None = None
+
+
+@dataclass
+class AsyncCase:
+    name: str
+    run: Callable[[Any], Awaitable[Any]]
+    setup: Callable[[], Awaitable[Any]] | None = None
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    samples.sort()
+    n = len(samples)
+    return {
+        "median_us": samples[n // 2] * 1e6,
+        "p90_us": samples[min(n - 1, n * 9 // 10)] * 1e6,
+        "samples": n,
+    }
+
+
+def _more(samples: list[float], repeat: int, deadline: float) -> bool:
+    if len(samples) < MIN_SAMPLES:
+        return True
+    return len(samples) < repeat and time.perf_counter() < deadline
+
+
+def time_case(case: Case, *, repeat: int, budget: float) -> dict[str, float]:
+    samples: list[float] = []
+    deadline = time.perf_counter() + budget
+    while _more(samples, repeat, deadline):
+        arg = case.setup() if case.setup else None
+        start = time.perf_counter()
+        case.run(arg)
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+async def time_async_case(
+    case: AsyncCase, *, repeat: int, budget: float
+) -> dict[str, float]:
+    samples: list[float] = []
+    deadline = time.perf_counter() + budget
+    while _more(samples, repeat, deadline):
+        arg = await case.setup() if case.setup else None
+        start = time.perf_counter()
+        await case.run(arg)
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
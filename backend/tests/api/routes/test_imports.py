@@ -0,0 +1,85 @@
+from uuid import uuid4
+
+from tests.utils import get_auth_headers
+
+
+def test_import_items_streams_ndjson(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    before = client.get("/api/v1/items/", headers=headers).json()["count"]
+
+    def body():
+        yield b'{"title": "Imported 1"}\n{"title": '
+        yield b'"Imported 2"}\n{"title": ""}\n'
+
+    response = client.post(
+        "/api/v1/import/items?import_id=job-1",
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+        content=body(),
+    )
+    assert response.status_code == 200, response.text
+    progress = response.json()
+    assert progress["committed"] == 3
+    assert (progress["imported"], progress["failed"]) == (2, 1)
+    assert progress["done"] is True
+    after = client.get("/api/v1/items/", headers=headers).json()["count"]
+    assert after == before + 2
+
+    tracked = client.get("/api/v1/import/job-1", headers=headers)
+    assert tracked.json() == progress
+    assert client.get("/api/v1/import/unknown", headers=headers).status_code == 404
+
+
+def test_import_users_csv(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.post(
+        "/api/v1/import/users",
+        headers={**headers, "Content-Type": "text/csv; charset=utf-8"},
+        content=b"email,password\nimported@example.com,password123\n",
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 1
+    assert get_auth_headers(client, "imported@example.com", "password123")
+
+
+def test_import_requires_superuser_and_known_format(client):
+    admin_headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    alice_headers = get_auth_headers(client, "alice@example.com", "password123")
+
+    response = client.post(
+        "/api/v1/import/items",
+        headers={**admin_headers, "Content-Type": "application/xml"},
+        content=b"<items/>",
+    )
+    assert response.status_code == 415
+
+    response = client.post(
+        "/api/v1/import/items",
+        headers={**alice_headers, "Content-Type": "application/x-ndjson"},
+        content=b'{"title": "Nope"}\n',
+    )
+    assert response.status_code == 403
+
+
+def test_import_items_for_another_owner(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    alice = get_auth_headers(client, "alice@example.com", "password123")
+    alice_id = client.get("/api/v1/users/me", headers=alice).json()["id"]
+    ndjson = {**headers, "Content-Type": "application/x-ndjson"}
+
+    response = client.post(
+        f"/api/v1/import/items?owner_id={alice_id}",
+        headers=ndjson,
+        content=b'{"title": "For Alice"}\n',
+    )
+    assert response.status_code == 200, response.text
+    titles = [
+        i["title"] for i in client.get("/api/v1/items/", headers=alice).json()["data"]
+    ]
+    assert "For Alice" in titles
+
+    response = client.post(
+        f"/api/v1/import/items?owner_id={uuid4()}",
+        headers=ndjson,
+        content=b'{"title": "Orphan"}\n',
+    )
+    assert response.status_code == 404
@@ -1,3 +1,6 @@
+import json
+
+from app.core.config import settings
 from tests.utils import get_auth_headers
 
 
@@ -82,3 +85,265 @@ def test_owner_can_update_and_delete_item(client):
 
     read_deleted = client.get(f"/api/v1/items/{item_id}", headers=headers)
     assert read_deleted.status_code == 404
+
+
+def test_read_items_cursor_pagination_is_stable_under_inserts(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    for i in range(3):
+        res = client.post(
+            "/api/v1/items/", headers=headers, json={"title": f"Cursor {i}"}
+        )
+        assert res.status_code == 201
+
+    first = client.get("/api/v1/items/?limit=2", headers=headers).json()
+    assert [i["title"] for i in first["data"]] == ["Cursor 2", "Cursor 1"]
+    assert first["next_cursor"]
+
+    # A new item lands at the head and must not shift the next page.
+    client.post("/api/v1/items/", headers=headers, json={"title": "Cursor 3"})
+
+    second = client.get(
+        f"/api/v1/items/?limit=2&after={first['next_cursor']}", headers=headers
+    ).json()
+    assert [i["title"] for i in second["data"]] == ["Cursor 0", "Portable Stove"]
+    assert second["count"] == 6
+
+    rest = client.get(
+        f"/api/v1/items/?limit=100&after={second['next_cursor']}", headers=headers
+    ).json()
+    assert rest["next_cursor"] is None
+    assert [i["title"] for i in rest["data"]] == ["Camping Tent"]
+
+
+def test_read_items_rejects_invalid_cursor(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    response = client.get("/api/v1/items/?after=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_bulk_create_items_reports_each_element(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    response = client.post(
+        "/api/v1/items/bulk",
+        headers=headers,
+        json=[{"title": "Bulk A"}, {"title": ""}, {"title": "Bulk B"}],
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [r["status"] for r in body["results"]] == [201, 422, 201]
+    assert body["results"][1]["id"] is None
+
+    created_id = body["results"][0]["id"]
+    read_res = client.get(f"/api/v1/items/{created_id}", headers=headers)
+    assert read_res.json()["title"] == "Bulk A"
+
+
+def test_bulk_update_items_reports_each_element(client):
+    admin_headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    alice_headers = get_auth_headers(client, "alice@example.com", "password123")
+    admin_item = next(
+        item
+        for item in client.get("/api/v1/items/", headers=admin_headers).json()["data"]
+        if item["title"] == "Admin Test Item"
+    )
+    own_id = client.post(
+        "/api/v1/items/", headers=alice_headers, json={"title": "Mine"}
+    ).json()["id"]
+
+    response = client.patch(
+        "/api/v1/items/bulk",
+        headers=alice_headers,
+        json=[
+            {"id": own_id, "title": "Mine, renamed"},
+            {"id": admin_item["id"], "title": "Stolen"},
+            {"id": "00000000-0000-0000-0000-000000000000", "title": "Ghost"},
+            {"id": own_id, "title": "Again"},
+            {"title": "No id"},
+        ],
+    )
+    assert response.status_code == 200, response.text
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == [200, 403, 404, 409, 422]
+
+    read_res = client.get(f"/api/v1/items/{own_id}", headers=alice_headers)
+    assert read_res.json()["title"] == "Mine, renamed"
+    admin_res = client.get(f"/api/v1/items/{admin_item['id']}", headers=admin_headers)
+    assert admin_res.json()["title"] == "Admin Test Item"
+
+
+def test_bulk_delete_items(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    created = client.post(
+        "/api/v1/items/bulk",
+        headers=headers,
+        json=[{"title": "Gone 1"}, {"title": "Gone 2"}],
+    ).json()
+    ids = [r["id"] for r in created["results"]]
+
+    response = client.post(
+        "/api/v1/items/bulk-delete", headers=headers, json=[*ids, "not-a-uuid"]
+    )
+    assert response.status_code == 200, response.text
+    assert [r["status"] for r in response.json()["results"]] == [200, 200, 422]
+    for item_id in ids:
+        read_res = client.get(f"/api/v1/items/{item_id}", headers=headers)
+        assert read_res.status_code == 404
+
+
+def test_bulk_rejects_oversized_batches(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    response = client.post(
+        "/api/v1/items/bulk",
+        headers=headers,
+        json=[{"title": "x"}] * (settings.BULK_MAX_ITEMS + 1),
+    )
+    assert response.status_code == 422
+
+
+def test_export_items_streams_ndjson_to_superusers(client):
+    admin_headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    alice_headers = get_auth_headers(client, "alice@example.com", "password123")
+    alice_id = client.get("/api/v1/users/me", headers=alice_headers).json()["id"]
+
+    response = client.get("/api/v1/items/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert (
+        len(rows) == client.get("/api/v1/items/", headers=admin_headers).json()["count"]
+    )
+    assert [row["created_at"] for row in rows] == sorted(
+        row["created_at"] for row in rows
+    )
+
+    own = client.get(
+        f"/api/v1/items/export?owner_id={alice_id}&since=2000-01-01T00:00:00",
+        headers=admin_headers,
+    )
+    assert {json.loads(line)["owner_id"] for line in own.text.splitlines()} == {
+        alice_id
+    }
+    future = client.get("/api/v1/items/export?since=2999-01-01", headers=admin_headers)
+    assert future.text == ""
+
+    assert client.get("/api/v1/items/export", headers=alice_headers).status_code == 403
+
+
+def test_search_items_is_limited_to_own_items_for_regular_users(client):
+    admin_headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    alice_headers = get_auth_headers(client, "alice@example.com", "password123")
+
+    response = client.get("/api/v1/items/search?q=test+ite", headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["title"] for item in data["data"]] == ["Admin Test Item"]
+    assert data["count"] == 1
+
+    response = client.get("/api/v1/items/search?q=test+ite", headers=alice_headers)
+    assert response.json() == {"data": [], "count": 0, "next_cursor": None}
+    response = client.get("/api/v1/items/search?q=stov", headers=alice_headers)
+    assert [item["title"] for item in response.json()["data"]] == ["Portable Stove"]
+
+    assert (
+        client.get("/api/v1/items/search?q=", headers=alice_headers).status_code == 422
+    )
+
+
+def test_read_items_filters_by_creation_time_oldest_first(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    created = [
+        client.post(
+            "/api/v1/items/", headers=headers, json={"title": f"Ranged {i}"}
+        ).json()
+        for i in range(3)
+    ]
+
+    response = client.get(
+        "/api/v1/items/",
+        headers=headers,
+        params={
+            "since": created[0]["created_at"],
+            "order_by": "created_at",
+            "limit": 2,
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3
+    assert [item["title"] for item in data["data"]] == ["Ranged 0", "Ranged 1"]
+
+    response = client.get(
+        "/api/v1/items/",
+        headers=headers,
+        params={"order_by": "created_at", "after": data["next_cursor"]},
+    )
+    assert [item["title"] for item in response.json()["data"]] == ["Ranged 2"]
+
+
+def test_read_items_revalidates_with_etag(client):
+    alice = get_auth_headers(client, "alice@example.com", "password123")
+    admin = get_auth_headers(client, "admin@example.com", "changethis123")
+
+    response = client.get("/api/v1/items/", headers=alice)
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+    response = client.get("/api/v1/items/", headers={**alice, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # Another user's list at the same URL never shares the tag.
+    response = client.get("/api/v1/items/", headers={**admin, "If-None-Match": etag})
+    assert response.status_code == 200
+    admin_etag = response.headers["etag"]
+
+    # Admin's own write moves the full list but not Alice's.
+    client.post("/api/v1/items/", headers=admin, json={"title": "Admin's"})
+    response = client.get("/api/v1/items/", headers={**alice, "If-None-Match": etag})
+    assert response.status_code == 304
+    response = client.get(
+        "/api/v1/items/", headers={**admin, "If-None-Match": admin_etag}
+    )
+    assert response.status_code == 200
+
+    client.post("/api/v1/items/", headers=alice, json={"title": "Alice's"})
+    response = client.get("/api/v1/items/", headers={**alice, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_update_item_if_match(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    item = client.post("/api/v1/items/", headers=headers, json={"title": "Lamp"}).json()
+    url = f"/api/v1/items/{item['id']}"
+
+    response = client.get(url, headers=headers)
+    assert response.json() == item
+    etag = response.headers["etag"]
+    response = client.get(url, headers={**headers, "If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+
+    response = client.patch(
+        url, headers={**headers, "If-Match": etag}, json={"title": "Desk lamp"}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Desk lamp"
+
+    # The tag moved with the update, so a second write based on it fails.
+    response = client.patch(
+        url, headers={**headers, "If-Match": etag}, json={"title": "Floor lamp"}
+    )
+    assert response.status_code == 412
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Desk lamp"
+
+    new_etag = response.headers["etag"]
+    response = client.patch(
+        url, headers={**headers, "If-Match": f"W/{new_etag}"}, json={"title": "x"}
+    )
+    assert response.status_code == 412  # If-Match compares strongly
+    response = client.patch(url, headers={**headers, "If-Match": "*"}, json={})
+    assert response.status_code == 200
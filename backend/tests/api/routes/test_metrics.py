@@ -0,0 +1,74 @@
+import asyncio
+import re
+
+from app.core import metrics
+from app.core.config import settings
+from tests.utils import get_auth_headers
+
+
+def _sample(page: str, name: str) -> float:
+    match = re.search(rf"^{re.escape(name)} (\S+)$", page, re.MULTILINE)
+    assert match, name
+    return float(match.group(1))
+
+
+def test_metrics_record_route_latency_by_route_id(client):
+    count = 'http_request_duration_seconds_count{route="utils-health_check"}'
+    before = client.get("/metrics").text
+    previous = _sample(before, count) if count in before else 0
+    for _ in range(3):
+        client.get("/api/v1/utils/health-check")
+    client.get("/api/v1/no-such-route")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    page = response.text
+    assert _sample(page, count) == previous + 3
+    assert 'http_request_duration_seconds_count{route="unmatched"}' in page
+    # The scrape itself is the one request in flight.
+    assert _sample(page, "http_requests_in_flight") == 1
+    assert _sample(page, "store_users") == 2
+    assert _sample(page, "store_items") == 3
+    assert _sample(page, "threadpool_threads") > 0
+
+
+def test_metrics_time_token_decoding_and_password_checks(client):
+    page = client.get("/metrics").text
+    decoded = _sample(page, "jwt_decode_duration_seconds_count")
+    verified = 'hashing_job_duration_seconds_count{op="verify"}'
+    jobs = _sample(page, verified) if verified in page else 0
+
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    client.get("/api/v1/utils/whoami", headers=headers)
+    client.get("/api/v1/utils/whoami", headers=headers)
+
+    page = client.get("/metrics").text
+    assert _sample(page, verified) == jobs + 1
+    # Decoded once; the second request is a token cache hit.
+    assert _sample(page, "jwt_decode_duration_seconds_count") == decoded + 1
+
+
+def test_metrics_token_is_required_when_set(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    assert client.get("/metrics").status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert response.status_code == 200
+
+
+def test_store_gauges_are_read_off_the_event_loop(client, monkeypatch):
+    def on_loop() -> float:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return 0
+        return 1
+
+    (gauge,) = [m for m in metrics._registry if m.name == "store_users"]
+    monkeypatch.setattr(gauge, "read", on_loop)
+    page = client.get("/metrics").text
+    assert _sample(page, "store_users") == 0
+    # Read before the render borrows a thread, so the scrape is not counted.
+    assert _sample(page, "threadpool_busy_threads") == 0
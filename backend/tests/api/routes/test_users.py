@@ -1,3 +1,10 @@
+import asyncio
+import json
+
+import httpx
+
+from app import crud
+from app.main import app
 from tests.utils import get_auth_headers
 
 
@@ -115,3 +122,175 @@ def test_admin_create_get_update_delete_user(client):
     # Should not exist now
     get_deleted = client.get(f"/api/v1/users/{user_id}", headers=admin_headers)
     assert get_deleted.status_code == 404
+
+
+def test_export_users_streams_ndjson_without_password_hashes(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.get("/api/v1/users/export", headers=headers)
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert "alice@example.com" in {row["email"] for row in rows}
+    assert all("hashed_password" not in row for row in rows)
+
+    alice_headers = get_auth_headers(client, "alice@example.com", "password123")
+    assert client.get("/api/v1/users/export", headers=alice_headers).status_code == 403
+
+
+def test_read_users_filters_and_orders(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.get(
+        "/api/v1/users/",
+        headers=headers,
+        params={"is_superuser": "false", "email_prefix": "ALI"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [user["email"] for user in data["data"]] == ["alice@example.com"]
+    assert data["count"] == 1
+
+    response = client.get(
+        "/api/v1/users/", headers=headers, params={"order_by": "email", "limit": 1}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"][0]["email"] == "admin@example.com"
+    assert response.json()["next_cursor"] is None
+
+    cursor = client.get("/api/v1/users/", headers=headers, params={"limit": 1}).json()[
+        "next_cursor"
+    ]
+    response = client.get(
+        "/api/v1/users/",
+        headers=headers,
+        params={"order_by": "-email", "after": cursor},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Cursors are only supported when ordering by created_at"
+    )
+
+    response = client.get(
+        "/api/v1/users/", headers=headers, params={"order_by": "full_name"}
+    )
+    assert response.status_code == 422
+
+
+def test_read_user_me_revalidates_and_update_checks_if_match(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    response = client.get("/api/v1/users/me", headers=headers)
+    etag = response.headers["etag"]
+    assert response.json()["email"] == "alice@example.com"
+    assert "hashed_password" not in response.json()
+
+    response = client.get(
+        "/api/v1/users/me", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    admin = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.get("/api/v1/users/me", headers={**admin, "If-None-Match": etag})
+    assert response.status_code == 200
+
+    response = client.patch(
+        "/api/v1/users/me",
+        headers={**headers, "If-Match": etag},
+        json={"full_name": "Alice A."},
+    )
+    assert response.status_code == 200
+    response = client.patch(
+        "/api/v1/users/me",
+        headers={**headers, "If-Match": etag},
+        json={"full_name": "Alice B."},
+    )
+    assert response.status_code == 412
+    response = client.get(
+        "/api/v1/users/me", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.json()["full_name"] == "Alice A."
+
+
+def test_read_users_etag_follows_user_writes(client):
+    admin = get_auth_headers(client, "admin@example.com", "changethis123")
+    etag = client.get("/api/v1/users/", headers=admin).headers["etag"]
+    response = client.get(
+        "/api/v1/users/", headers={**admin, "If-None-Match": f'"other", {etag}'}
+    )
+    assert response.status_code == 304
+
+    alice = client.get(
+        "/api/v1/users/", headers=admin, params={"email_prefix": "alice"}
+    ).json()["data"][0]
+    url = f"/api/v1/users/{alice['id']}"
+    user_etag = client.get(url, headers=admin).headers["etag"]
+    response = client.patch(
+        url, headers={**admin, "If-Match": user_etag}, json={"is_active": False}
+    )
+    assert response.status_code == 200
+    assert (
+        client.get(url, headers={**admin, "If-None-Match": user_etag}).json()[
+            "is_active"
+        ]
+        is False
+    )
+    response = client.get("/api/v1/users/", headers={**admin, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_concurrent_creates_of_one_email_store_one_user(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+
+    async def create_all() -> list[int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as http:
+            responses = await asyncio.gather(
+                *(
+                    http.post(
+                        "/api/v1/users/",
+                        headers=headers,
+                        json={"email": "dup@example.com", "password": "password123"},
+                    )
+                    for _ in range(3)
+                )
+            )
+        return sorted(response.status_code for response in responses)
+
+    # All three pass the route's lookup before any of them has been stored.
+    assert asyncio.run(create_all()) == [201, 409, 409]
+    assert crud.get_users(email_prefix="dup@")[1] == 1
+
+
+def test_hashing_routes_run_crud_off_the_event_loop(client, monkeypatch):
+    where = []
+
+    def spy(fn):
+        def call(**kwargs):
+            try:
+                asyncio.get_running_loop()
+                where.append((fn.__name__, "event loop"))
+            except RuntimeError:
+                where.append((fn.__name__, "thread"))
+            return fn(**kwargs)
+
+        return call
+
+    for name in ("get_user_by_email", "create_user", "update_user"):
+        monkeypatch.setattr(crud, name, spy(getattr(crud, name)))
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.post(
+        "/api/v1/users/",
+        headers=headers,
+        json={"email": "ivy@example.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    response = client.patch(
+        f"/api/v1/users/{response.json()['id']}",
+        headers=headers,
+        json={"password": "password456"},
+    )
+    assert response.status_code == 200
+
+    assert {name for name, _ in where} == {
+        "get_user_by_email",
+        "create_user",
+        "update_user",
+    }
+    assert {place for _, place in where} == {"thread"}
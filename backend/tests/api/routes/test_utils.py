@@ -1,4 +1,25 @@
+from tests.utils import get_auth_headers
+
+
 def test_health_check(client):
     response = client.get("/api/v1/utils/health-check")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_stats_as_admin(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.get("/api/v1/utils/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": 3,
+        "own_items": 1,
+        "users": {"total": 2, "active": 2, "superusers": 1},
+    }
+
+
+def test_stats_as_normal_user_hides_user_counts(client):
+    headers = get_auth_headers(client, "alice@example.com", "password123")
+    response = client.get("/api/v1/utils/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"items": 2, "own_items": 2, "users": None}
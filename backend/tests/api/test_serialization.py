@@ -0,0 +1,20 @@
+from app import crud
+from app.api.serialization import items_page_response, users_page_response
+from app.models import ItemsPublic, UsersPublic
+
+
+def test_items_page_matches_public_model():
+    items, count = crud.get_items()
+    body = items_page_response(items, count, None).body
+    page = ItemsPublic.model_validate_json(body)
+    assert page.count == count
+    assert [item.id for item in page.data] == [item.id for item in items]
+
+
+def test_users_page_omits_password_hash():
+    users, count = crud.get_users()
+    body = users_page_response(users, count, "cursor").body
+    assert b"hashed_password" not in body
+    page = UsersPublic.model_validate_json(body)
+    assert page.next_cursor == "cursor"
+    assert {user.email for user in page.data} == {user.email for user in users}
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.core.hashing import HashingQueueFull, PasswordHasherPool, hasher_pool
+from tests.utils import get_auth_headers
+
+
+def test_inline_pool_hashes_and_verifies():
+    pool = PasswordHasherPool(workers=0, queue_limit=4)
+
+    async def roundtrip():
+        hashed = await pool.hash("password123")
+        return await pool.verify("password123", hashed), await pool.verify(
+            "wrong-password", hashed
+        )
+
+    assert asyncio.run(roundtrip()) == (True, False)
+    stats = pool.stats()
+    assert stats.completed == 3
+    assert stats.pending == 0
+
+
+def test_full_queue_fails_fast():
+    pool = PasswordHasherPool(workers=0, queue_limit=0)
+    with pytest.raises(HashingQueueFull):
+        asyncio.run(pool.hash("password123"))
+    assert pool.stats().rejected == 1
+
+
+def test_login_returns_503_when_hashing_is_saturated(client, monkeypatch):
+    monkeypatch.setattr(hasher_pool, "queue_limit", 0)
+    response = client.post(
+        "/api/v1/login/access-token",
+        data={"username": "alice@example.com", "password": "password123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_hashing_stats_for_superuser(client):
+    headers = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.get("/api/v1/utils/hashing-stats", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["completed"] >= 1
+    assert data["queue_limit"] == hasher_pool.queue_limit
+
+
+def test_hash_many_keeps_order_and_waits_for_slots():
+    pool = PasswordHasherPool(workers=0, queue_limit=1)
+    passwords = [f"password-{i}" for i in range(3)]
+
+    async def hash_and_verify():
+        hashed = await pool.hash_many(passwords)
+        return [await pool.verify(p, h) for p, h in zip(passwords, hashed, strict=True)]
+
+    assert asyncio.run(hash_and_verify()) == [True, True, True]
+    assert pool.stats().rejected == 0
+
+
+def test_pool_recovers_after_a_worker_dies():
+    pool = PasswordHasherPool(workers=1, queue_limit=4)
+
+    async def hash_after_kill() -> str:
+        await pool.hash("password123")  # starts the worker
+        for process in pool._get_executor()._processes.values():
+            process.kill()
+        return await pool.hash("password123")
+
+    try:
+        assert asyncio.run(hash_after_kill()).startswith("$argon2")
+        # The dead pool was replaced, not kept around failing every job.
+        assert asyncio.run(pool.verify("x", asyncio.run(pool.hash("x"))))
+        assert pool.stats().pending == 0
+    finally:
+        pool.shutdown()
@@ -0,0 +1,138 @@
+import atexit
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.logging import (
+    AccessSampler,
+    RepeatLimiter,
+    get_logger,
+    setup_logging,
+    shutdown_logging,
+)
+from app.core.middleware import SecurityHeadersMiddleware
+
+# Loggers ``setup_logging`` configures; "" is the root logger.
+_CONFIGURED = ("", "app", "uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+@pytest.fixture
+def json_lines(capsys):
+    """Reads back the JSON lines logged to stderr, restoring the setup after.
+
+    Tests switch to JSON themselves: pytest swaps stderr between phases. The
+    previous handlers are put back rather than rebuilt: new ones would bind
+    to the capsys stream, which is closed once the test is over.
+    """
+    saved = {
+        name: (logger.handlers[:], logger.level, logger.propagate)
+        for name in _CONFIGURED
+        for logger in [logging.getLogger(name)]
+    }
+
+    def read() -> list[dict]:
+        shutdown_logging()  # drains the queue
+        return [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+
+    yield read
+    shutdown_logging()
+    for name, (handlers, level, propagate) in saved.items():
+        logger = logging.getLogger(name)
+        logger.handlers[:] = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+def _record(status: int | None = None, msg: str = "hello") -> logging.LogRecord:
+    record = logging.LogRecord("app.test", logging.INFO, "", 0, msg, None, None)
+    if status is not None:
+        record.access = True
+        record.status = status
+    return record
+
+
+def test_json_lines_carry_the_request_id_and_access_fields(json_lines):
+    setup_logging(log_format="json")
+    app = FastAPI()
+
+    @app.get("/work")
+    def do_work() -> dict[str, str]:
+        get_logger("app.work").info("working on %s", "it")
+        return {}
+
+    app.add_middleware(SecurityHeadersMiddleware, hsts=False, log_requests=True)
+    client = TestClient(app)
+    response = client.get("/work", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+    minted = client.get("/work", headers={"X-Request-ID": "not valid!"})
+    assert minted.headers["x-request-id"] != "not valid!"
+
+    lines = [line for line in json_lines() if line["logger"].startswith("app.")]
+    work, access = lines[:2]
+    assert work["msg"] == "working on it"
+    assert work["request_id"] == "abc-123"
+    assert access["msg"] == "GET /work -> 200"
+    assert access["request_id"] == "abc-123"
+    assert access["status"] == 200
+    assert access["duration_ms"] >= 0
+    assert lines[3]["request_id"] == minted.headers["x-request-id"]
+
+
+def test_json_lines_render_tracebacks(json_lines):
+    setup_logging(log_format="json")
+    try:
+        int("x")
+    except ValueError:
+        get_logger("app.test").exception("failed")
+
+    (line,) = json_lines()
+    assert line["level"] == "ERROR"
+    assert "ValueError: invalid literal" in line["exc"]
+
+
+def test_access_sampler_keeps_errors_and_other_records():
+    sampler = AccessSampler(0.0)
+    assert not sampler.filter(_record(status=200))
+    assert sampler.filter(_record(status=404))
+    assert sampler.filter(_record(status=500))
+    assert sampler.filter(_record())
+    assert AccessSampler(1.0).filter(_record(status=200))
+
+
+def test_repeat_limiter_drops_repeats_and_reports_them():
+    limiter = RepeatLimiter(2)
+    records = [_record() for _ in range(5)]
+    for record in records:
+        record.created = 100.5
+    assert [limiter.filter(record) for record in records] == [
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert limiter.filter(_record(msg="other", status=None))
+
+    later = _record()
+    later.created = 101.0
+    assert limiter.filter(later)
+    assert later.suppressed == 3
+    # Access records are the sampler's business.
+    assert all(limiter.filter(_record(status=200)) for _ in range(5))
+
+
+def test_repeated_json_setup_registers_one_exit_hook(json_lines, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    monkeypatch.setattr(
+        atexit, "unregister", lambda hook: hooks.remove(hook) if hook in hooks else None
+    )
+    for _ in range(3):
+        setup_logging(log_format="json")
+    get_logger("app.test").info("once")
+    assert hooks == [shutdown_logging]
+    # Each setup stopped the writer before it, so the record is written once.
+    assert [line["msg"] for line in json_lines()] == ["once"]
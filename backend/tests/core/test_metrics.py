@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from app.core import metrics
+
+
+@pytest.fixture(autouse=True)
+def scratch_registry():
+    """Keep the metrics made here off the app's /metrics page."""
+    registered = list(metrics._registry)
+    yield
+    metrics._registry[:] = registered
+
+
+def test_histogram_renders_cumulative_buckets():
+    latency = metrics.Histogram(
+        "test_latency_seconds", "Test.", ("route",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "a")
+    latency.observe(0.2, "b")
+
+    assert latency.render().splitlines() == [
+        "# HELP test_latency_seconds Test.",
+        "# TYPE test_latency_seconds histogram",
+        'test_latency_seconds_bucket{route="a",le="0.1"} 2',
+        'test_latency_seconds_bucket{route="a",le="1"} 3',
+        'test_latency_seconds_bucket{route="a",le="+Inf"} 4',
+        'test_latency_seconds_sum{route="a"} 3.65',
+        'test_latency_seconds_count{route="a"} 4',
+        'test_latency_seconds_bucket{route="b",le="0.1"} 0',
+        'test_latency_seconds_bucket{route="b",le="1"} 1',
+        'test_latency_seconds_bucket{route="b",le="+Inf"} 1',
+        'test_latency_seconds_sum{route="b"} 0.2',
+        'test_latency_seconds_count{route="b"} 1',
+    ]
+
+
+def test_threads_record_into_their_own_shards_and_scrapes_sum_them():
+    requests = metrics.Counter("test_requests", "Test.", ("route",))
+    in_flight = metrics.Gauge("test_in_flight", "Test.")
+    start = threading.Barrier(4)
+
+    def work():
+        start.wait()
+        for _ in range(10_000):
+            requests.inc("a")
+            in_flight.inc()
+        in_flight.dec(amount=9_999)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Raised on this thread, lowered on the workers: only the sum counts.
+    in_flight.inc(amount=-4)
+
+    assert requests.render().splitlines()[-1] == 'test_requests_total{route="a"} 40000'
+    assert in_flight.render().splitlines()[-1] == "test_in_flight 0"
+
+
+def test_exited_threads_fold_their_shards_into_the_retired_totals():
+    served = metrics.Counter("test_served", "Test.")
+    served.inc()
+    live = len(metrics._shards)
+
+    for _ in range(50):
+        thread = threading.Thread(target=served.inc, kwargs={"amount": 2})
+        thread.start()
+        thread.join()
+
+    assert len(metrics._shards) == live
+    assert served.render().endswith("test_served_total 101\n")
+
+
+def test_metrics_must_say_how_they_sample():
+    with pytest.raises(TypeError):
+        metrics.Metric("test_abstract", "Test.")
+
+
+def test_callback_gauge_is_read_at_scrape_and_labels_are_escaped():
+    size = [1]
+    gauge = metrics.CallbackGauge("test_size", "Test.", lambda: size[0])
+    labelled = metrics.Counter("test_labelled", "Test.", ("path",))
+    labelled.inc('a "b"\\\n')
+    size[0] = 7
+
+    assert gauge.render().endswith("test_size 7\n")
+    assert labelled.render().endswith(
+        'test_labelled_total{path="a \\"b\\"\\\\\\n"} 1\n'
+    )
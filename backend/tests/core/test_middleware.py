@@ -0,0 +1,56 @@
+import logging
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.core.middleware import SecurityHeadersMiddleware
+
+
+def _client(**options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/framed")
+    def framed() -> Response:
+        return Response(b"ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    app.add_middleware(SecurityHeadersMiddleware, **options)
+    return TestClient(app)
+
+
+def _logged(caplog) -> list[str]:
+    return [r.getMessage() for r in caplog.records if r.name == "app.main"]
+
+
+def test_sets_security_headers_on_app_responses(client):
+    response = client.get("/api/v1/utils/health-check")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["referrer-policy"] == "strict-origin-when-cross-origin"
+    # Local environment: no HSTS.
+    assert "strict-transport-security" not in response.headers
+
+    response = client.get("/api/v1/no-such-route")
+    assert response.status_code == 404
+    assert response.headers["x-xss-protection"] == "1; mode=block"
+
+
+def test_replaces_route_headers_and_adds_hsts(caplog):
+    client = _client(hsts=True, log_requests=False)
+    with caplog.at_level(logging.INFO, logger="app.main"):
+        response = client.get("/framed")
+    assert response.headers.get_list("x-frame-options") == ["DENY"]
+    assert response.headers["strict-transport-security"] == (
+        "max-age=63072000; includeSubDomains"
+    )
+    assert not _logged(caplog)
+
+
+def test_logs_requests_when_enabled(caplog):
+    client = _client(hsts=False, log_requests=True)
+    with caplog.at_level(logging.INFO, logger="app.main"):
+        client.get("/framed")
+        client.get("/missing")
+    assert _logged(caplog) == [
+        "GET /framed -> 200",
+        "GET /missing -> 404",
+    ]
@@ -0,0 +1,57 @@
+import pstats
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.core.profiling import ProfilingMiddleware
+
+
+def slow_route_body() -> int:
+    return sum(range(10_000))
+
+
+def _client(directory, sample_rate: float = 0.0) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/work")
+    def work() -> dict[str, int]:  # sync: runs on the threadpool
+        return {"total": slow_route_body()}
+
+    app.add_middleware(
+        ProfilingMiddleware, directory=str(directory), sample_rate=sample_rate
+    )
+    return TestClient(app)
+
+
+def test_profiles_requests_asking_for_it(tmp_path):
+    client = _client(tmp_path)
+
+    response = client.get("/work", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+    stats = pstats.Stats(str(tmp_path / f"{profile_id}.prof"))
+    # Captured on the threadpool thread, not only on the event loop.
+    assert any(name == "slow_route_body" for _, _, name in stats.stats)
+
+    response = client.get("/work")
+    assert "x-profile-id" not in response.headers
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_samples_requests_and_honours_an_opt_out(tmp_path):
+    client = _client(tmp_path, sample_rate=1.0)
+
+    assert "x-profile-id" in client.get("/work").headers
+    assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "0"}).headers
+
+
+def test_profiling_is_refused_in_production():
+    with pytest.raises(ValidationError, match="PROFILING_DIR"):
+        Settings(
+            ENVIRONMENT="production",
+            SECRET_KEY="x" * 40,
+            PROFILING_DIR="/tmp/profiles",
+        )
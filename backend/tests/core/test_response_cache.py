@@ -0,0 +1,119 @@
+import subprocess
+import sys
+
+from app import crud
+from app.core.response_cache import _ENTRY_OVERHEAD, ResponseCache
+from app.crud.backends import SQLiteStorage, set_storage
+from tests.utils import get_auth_headers
+
+
+def _build(body: bytes, calls: list):
+    def build() -> bytes:
+        calls.append(body)
+        return body
+
+    return build
+
+
+def test_serves_entries_only_under_their_etag():
+    cache = ResponseCache(max_bytes=10_000)
+    calls = []
+    assert cache.get_or_build("page", '"1"', _build(b"old", calls)) == b"old"
+    assert cache.get_or_build("page", '"1"', _build(b"unused", calls)) == b"old"
+    assert cache.get_or_build("page", '"2"', _build(b"new", calls)) == b"new"
+    assert calls == [b"old", b"new"]
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.stale) == (1, 2, 1)
+    assert stats.hit_ratio == 1 / 3
+    assert stats.entries == 1
+    assert stats.bytes == len(b"new") + _ENTRY_OVERHEAD
+
+
+def test_evicts_least_recently_used_past_the_byte_cap():
+    cache = ResponseCache(max_bytes=3 * (100 + _ENTRY_OVERHEAD))
+    calls = []
+    for key in "abc":
+        cache.get_or_build(key, "t", _build(key.encode() * 100, calls))
+    cache.get_or_build("a", "t", _build(b"", calls))  # refresh "a"
+    cache.get_or_build("d", "t", _build(b"d" * 100, calls))
+    assert len(cache) == 3
+    assert cache.stats().evictions == 1
+
+    calls.clear()
+    cache.get_or_build("b", "t", _build(b"rebuilt", calls))
+    assert calls == [b"rebuilt"]
+    cache.get_or_build("a", "t", _build(b"", calls))
+    assert calls == [b"rebuilt"]
+
+
+def test_oversized_bodies_and_disabled_cache_are_not_stored():
+    cache = ResponseCache(max_bytes=100)
+    cache.get_or_build("big", "t", lambda: b"x" * 100)
+    assert len(cache) == 0
+
+    disabled = ResponseCache(max_bytes=0)
+    disabled.get_or_build("page", "t", lambda: b"body")
+    assert len(disabled) == 0
+    assert disabled.stats().misses == 0
+
+
+def test_list_routes_hit_until_a_write_moves_the_generation(client):
+    admin = get_auth_headers(client, "admin@example.com", "changethis123")
+    alice = get_auth_headers(client, "alice@example.com", "password123")
+
+    def stats():
+        return client.get("/api/v1/utils/response-cache-stats", headers=admin).json()
+
+    first = client.get("/api/v1/items/", headers=alice).json()
+    before = stats()
+    assert client.get("/api/v1/items/", headers=alice).json() == first
+    assert stats()["hits"] == before["hits"] + 1
+
+    # Another owner's write leaves Alice's page cached.
+    client.post("/api/v1/items/", headers=admin, json={"title": "Admin's"})
+    client.get("/api/v1/items/", headers=alice)
+    assert stats()["hits"] == before["hits"] + 2
+
+    client.post("/api/v1/items/", headers=alice, json={"title": "Alice's"})
+    page = client.get("/api/v1/items/", headers=alice).json()
+    assert page["count"] == first["count"] + 1
+    assert stats()["stale"] == before["stale"] + 1
+
+    response = client.get("/api/v1/utils/response-cache-stats", headers=alice)
+    assert response.status_code == 403
+
+
+def test_pages_go_stale_when_another_worker_writes(client, tmp_path):
+    path = str(tmp_path / "app.db")
+    storage = SQLiteStorage(path)
+    previous = set_storage(storage)
+    try:
+        crud.reset_mock_data()
+        alice = get_auth_headers(client, "alice@example.com", "password123")
+        first = client.get("/api/v1/items/", headers=alice).json()
+        owner = crud.get_user_by_email(email="alice@example.com")
+
+        # Another worker process, sharing the database, adds an item.
+        subprocess.run(
+            [sys.executable, "-c", _OTHER_WORKER, path, str(owner.id)], check=True
+        )
+
+        page = client.get("/api/v1/items/", headers=alice).json()
+        assert page["count"] == first["count"] + 1
+    finally:
+        set_storage(previous)
+        storage.close()
+
+
+_OTHER_WORKER = """
+import sys
+from uuid import UUID
+
+from app import crud
+from app.crud.backends import SQLiteStorage, set_storage
+from app.models import ItemCreate
+
+set_storage(SQLiteStorage(sys.argv[1]))
+crud.create_item(item_in=ItemCreate(title="Elsewhere"), owner_id=UUID(sys.argv[2]))
+"""
@@ -0,0 +1,70 @@
+import time
+import uuid
+
+from app.core.token_cache import TokenCache, token_cache
+from tests.utils import get_access_token, get_auth_headers
+
+
+def test_evicts_least_recently_used():
+    cache = TokenCache(max_size=2)
+    exp = time.time() + 60
+    users = [uuid.uuid4() for _ in range(3)]
+    cache.put("a", users[0], exp)
+    cache.put("b", users[1], exp)
+    assert cache.get("a") == users[0]
+    cache.put("c", users[2], exp)
+    assert cache.get("b") is None
+    assert cache.get("a") == users[0]
+    assert cache.get("c") == users[2]
+    assert len(cache) == 2
+
+
+def test_expired_entries_are_dropped():
+    cache = TokenCache(max_size=4)
+    cache.put("stale", uuid.uuid4(), time.time() - 1)
+    assert cache.get("stale") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_user_drops_all_of_their_tokens():
+    cache = TokenCache(max_size=4)
+    exp = time.time() + 60
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    cache.put("t1", user_id, exp)
+    cache.put("t2", user_id, exp)
+    cache.put("t3", other_id, exp)
+    cache.invalidate_user(user_id)
+    assert cache.get("t1") is None
+    assert cache.get("t2") is None
+    assert cache.get("t3") == other_id
+
+
+def test_login_token_is_cached(client):
+    token = get_access_token(client, "alice@example.com", "password123")
+    assert token_cache.get(token) is None
+    response = client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert token_cache.get(token) is not None
+
+
+def test_deleted_user_token_is_rejected(client):
+    admin = get_auth_headers(client, "admin@example.com", "changethis123")
+    response = client.post(
+        "/api/v1/users/",
+        headers=admin,
+        json={"email": "carol@example.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    user_id = response.json()["id"]
+
+    headers = get_auth_headers(client, "carol@example.com", "password123")
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    response = client.delete(f"/api/v1/users/{user_id}", headers=admin)
+    assert response.status_code == 200
+    assert len(token_cache) == 1  # only the admin's token is left
+
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 403
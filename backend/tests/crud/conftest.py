@@ -0,0 +1,28 @@
+import pytest
+
+from app import crud
+from app.crud.backends import (
+    ColumnarStorage,
+    JournaledMemoryStorage,
+    MemoryStorage,
+    SQLiteStorage,
+    set_storage,
+)
+
+
+@pytest.fixture(autouse=True, params=["memory", "journal", "columnar", "sqlite"])
+def storage(request, tmp_path):
+    """Run every crud test against each storage backend."""
+    if request.param == "sqlite":
+        storage = SQLiteStorage(str(tmp_path / "app.db"))
+    elif request.param == "columnar":
+        storage = ColumnarStorage()
+    elif request.param == "journal":
+        storage = JournaledMemoryStorage(str(tmp_path / "data"), snapshot_every=5)
+    else:
+        storage = MemoryStorage()
+    previous = set_storage(storage)
+    crud.reset_mock_data()
+    yield storage
+    set_storage(previous)
+    storage.close()
@@ -0,0 +1,51 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.crud.backends import ColumnarStorage
+from app.models import Item
+
+
+@pytest.fixture
+def storage():
+    # Overrides the backend-parametrized fixture: these tests drive the
+    # columnar store directly.
+    return None
+
+
+def _items(owner_id, n, start=datetime(2026, 1, 1, tzinfo=UTC)):
+    return [
+        Item(title=f"Item {i}", owner_id=owner_id, created_at=start + timedelta(i))
+        for i in range(n)
+    ]
+
+
+def test_out_of_order_inserts_stay_sorted():
+    store = ColumnarStorage()
+    owner_id = uuid4()
+    items = _items(owner_id, 5)
+    for item in (items[3], items[0], items[4], items[1], items[2]):
+        store.add_item(item)
+
+    page = store.page_items(owner_id=None, skip=0, limit=10, after=None)
+    assert [item.title for item in page] == [f"Item {i}" for i in range(4, -1, -1)]
+    after = (items[3].created_at, items[3].id)
+    page = store.page_items(owner_id=owner_id, skip=1, limit=10, after=after)
+    assert [item.title for item in page] == ["Item 1", "Item 0"]
+
+
+def test_delete_items_by_owner_keeps_other_rows():
+    store = ColumnarStorage()
+    alice, bob = uuid4(), uuid4()
+    for a, b in zip(_items(alice, 50), _items(bob, 50), strict=True):
+        store.add_item(a)
+        store.add_item(b)
+
+    assert store.delete_items_by_owner(alice) == 50
+    assert store.count_items() == 50
+    assert store.count_items(alice) == 0
+    assert store.page_items(owner_id=alice, skip=0, limit=10, after=None) == []
+    remaining = store.list_items()
+    assert {item.owner_id for item in remaining} == {bob}
+    assert store.get_item(remaining[0].id) == remaining[0]
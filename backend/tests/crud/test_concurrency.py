@@ -0,0 +1,147 @@
+import random
+import sys
+import threading
+from uuid import uuid4
+
+import pytest
+
+from app import crud
+from app.crud.backends import SQLiteStorage
+from app.models import Item, ItemCreate, ItemUpdate
+
+WRITERS = 4
+READERS = 4
+OPS_PER_WRITER = 1_000
+
+
+@pytest.fixture
+def fast_switching():
+    # Force frequent thread switches so interleavings actually happen.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _is_newest_first(page):
+    keys = [(i.created_at, i.id) for i in page]
+    return keys == sorted(keys, reverse=True) and len(set(keys)) == len(keys)
+
+
+def _walk_cursor_pages(owner_id):
+    walked, after = [], None
+    while True:
+        if owner_id is None:
+            page, _ = crud.get_items(limit=100, after=after)
+        else:
+            page, _ = crud.get_items_by_owner(owner_id=owner_id, limit=100, after=after)
+        if not page:
+            return walked
+        walked += page
+        after = (page[-1].created_at, page[-1].id)
+
+
+def test_mixed_reads_and_writes_stay_consistent(storage, fast_switching):
+    owners = [uuid4() for _ in range(3)]
+    errors: list[BaseException] = []
+    done = threading.Event()
+    # Build records up front so writers spend their time inside the store.
+    batches = [
+        [Item(title=f"w{w}-{n}", owner_id=owners[n % 3]) for n in range(OPS_PER_WRITER)]
+        for w in range(WRITERS)
+    ]
+
+    def writer(seed: int) -> None:
+        rng = random.Random(seed)
+        mine = []
+        try:
+            for item in batches[seed]:
+                storage.add_item(item)
+                mine.append(item)
+                if rng.random() < 0.3:
+                    item = mine.pop(rng.randrange(len(mine)))
+                    storage.update_item(item.id, {"title": "edited"})
+                    storage.delete_item(item.id)
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    def reader() -> None:
+        try:
+            while not done.is_set():
+                page, _ = crud.get_items(limit=20)
+                assert _is_newest_first(page)
+                page, _ = crud.get_items_by_owner(owner_id=owners[0], limit=20)
+                assert _is_newest_first(page)
+                assert all(i.owner_id == owners[0] for i in page)
+                if page:
+                    last = page[-1]
+                    crud.get_items(limit=20, after=(last.created_at, last.id))
+                stats = crud.get_user_stats()
+                assert stats.active <= stats.total
+                crud.list_all_items()
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    readers = [threading.Thread(target=reader) for _ in range(READERS)]
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(WRITERS)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors, errors[0]
+
+    items = crud.list_all_items()
+    assert crud.count_items() == len(items)
+    seeded = len(items) - sum(crud.count_items(owner_id=o) for o in owners)
+    assert seeded == 3
+    for owner_id in (None, *owners):
+        expected = {i.id for i in items if owner_id in (None, i.owner_id)}
+        walked = _walk_cursor_pages(owner_id)
+        assert _is_newest_first(walked)
+        assert [i.id for i in walked if i.id in expected] == [i.id for i in walked]
+        assert {i.id for i in walked} == expected
+
+
+def test_concurrent_item_updates_keep_each_others_fields(storage, fast_switching):
+    item = crud.create_item(item_in=ItemCreate(title="draft"), owner_id=uuid4())
+    errors: list[BaseException] = []
+
+    # Both writers hold the copy read before either update.
+    def writer(field: str) -> None:
+        try:
+            for n in range(200):
+                update = ItemUpdate(**{field: f"{field}-{n}"})
+                crud.update_item(item=item, item_in=update)
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [
+        threading.Thread(target=writer, args=(field,))
+        for field in ("title", "description")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors[0]
+    stored = crud.get_item(item_id=item.id)
+    assert (stored.title, stored.description) == ("title-199", "description-199")
+
+
+def test_exited_threads_close_their_sqlite_connections(storage):
+    if not isinstance(storage, SQLiteStorage):
+        pytest.skip("per-thread connections are SQLite's")
+    storage.count_items()
+    live = len(storage._connections)
+
+    for _ in range(50):
+        thread = threading.Thread(target=storage.count_items)
+        thread.start()
+        thread.join()
+
+    assert len(storage._connections) == live
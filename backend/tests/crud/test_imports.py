@@ -0,0 +1,81 @@
+import asyncio
+from uuid import uuid4
+
+from app import crud
+from app.core.config import settings
+
+
+async def _body(data: bytes, size: int):
+    # Small, odd-sized reads split lines and multi-byte characters.
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _import_items(data: bytes, **kwargs):
+    owner = crud.get_user_by_email(email="alice@example.com")
+    return asyncio.run(crud.import_items(_body(data, 7), owner_id=owner.id, **kwargs))
+
+
+def test_import_items_ndjson_in_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    owner = crud.get_user_by_email(email="alice@example.com")
+    before = crud.count_items(owner_id=owner.id)
+    data = (
+        '{"title": "Café"}\n'
+        '{"title": ""}\n'
+        "\n"
+        f'{{"title": "Orphan", "owner_id": "{uuid4()}"}}\n'
+        "not json\n"
+        '{"title": "Last", "description": "no trailing newline"}'
+    ).encode()
+
+    committed = []
+    progress = _import_items(
+        data, fmt="ndjson", on_commit=lambda p: committed.append(p.committed)
+    )
+
+    assert (progress.committed, progress.imported, progress.failed) == (5, 2, 3)
+    assert progress.done
+    assert [error.record for error in progress.errors] == [2, 3, 4]
+    assert progress.errors[1].detail == "Owner not found"
+    assert committed == [2, 4, 5, 5]
+    assert crud.count_items(owner_id=owner.id) == before + 2
+    titles = {item.title for item in crud.export_items(owner_id=owner.id)}
+    assert {"Café", "Last"} <= titles
+
+
+def test_import_items_resumes_after_skip():
+    owner = crud.get_user_by_email(email="alice@example.com")
+    before = crud.count_items(owner_id=owner.id)
+    data = b"".join(b'{"title": "Row %d"}\n' % i for i in range(1, 6))
+
+    progress = _import_items(data, fmt="ndjson", skip=3, import_id="resume-test")
+
+    assert (progress.committed, progress.imported) == (5, 2)
+    assert crud.get_import_progress("resume-test") is progress
+    titles = [item.title for item in crud.export_items(owner_id=owner.id)]
+    assert titles[before:] == ["Row 4", "Row 5"]
+
+
+def test_import_users_csv():
+    data = (
+        b"email,password,full_name\n"
+        b'new@example.com,password123,"Multi\nLine"\n'
+        b"ALICE@example.com,password123,\n"
+        b"new@example.com,password123,Again\n"
+        b"short@example.com,short,\n"
+        b"missing@example.com,password123\n"
+    )
+
+    progress = asyncio.run(crud.import_users(_body(data, 5), fmt="csv"))
+
+    assert (progress.committed, progress.imported, progress.failed) == (5, 1, 4)
+    assert [(e.record, e.detail.split(":")[0]) for e in progress.errors] == [
+        (2, "Email already exists"),
+        (3, "Email already exists"),
+        (4, "password"),
+        (5, "Expected 3 columns, got 2"),
+    ]
+    user = crud.get_user_by_email(email="new@example.com")
+    assert user.full_name == "Multi\nLine"
+    assert crud.authenticate(email="new@example.com", password="password123")
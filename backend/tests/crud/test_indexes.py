@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from app.crud.backends import MemoryStorage
+from app.crud.backends.base import UserFilter
+from app.crud.indexes import (
+    Bitset,
+    SortedKeys,
+    count_bits,
+    iter_bits,
+    select_bits,
+)
+from app.models import User
+
+
+@pytest.fixture
+def storage():
+    # Overrides the backend-parametrized fixture: these tests exercise the
+    # index structures on their own.
+    return None
+
+
+def test_sorted_keys_match_a_sorted_list_across_chunk_splits():
+    rng = random.Random(7)
+    keys, expected = SortedKeys(), set()
+    for _ in range(6000):
+        key = f"k{rng.randrange(4000):05d}"
+        if key in expected and rng.random() < 0.3:
+            keys.remove(key)
+            expected.discard(key)
+        elif key not in expected:
+            keys.add(key)
+            expected.add(key)
+    ordered = sorted(expected)
+    assert list(keys) == ordered
+    assert list(reversed(keys)) == ordered[::-1]
+    assert len(keys) == len(ordered)
+    assert keys.range("k010", "k020") == [k for k in ordered if "k010" <= k < "k020"]
+    assert keys.range("k9", "l") == []
+    assert list(SortedKeys.from_sorted(ordered)) == ordered
+
+
+def test_bitset_matches_a_list_of_flags_across_chunks():
+    rng = random.Random(3)
+    # Three chunks' worth, so inserts and deletes carry bits between them.
+    flags = [rng.random() < 0.5 for _ in range(150_000)]
+    bits = Bitset.from_flags(flags)
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.6 or not flags:
+            pos = len(flags) if op < 0.4 else rng.randrange(len(flags) + 1)
+            value = rng.random() < 0.5
+            bits.insert(pos, value)
+            flags.insert(pos, value)
+        elif op < 0.8:
+            pos = rng.randrange(len(flags))
+            bits.delete(pos)
+            del flags[pos]
+        else:
+            pos, value = rng.randrange(len(flags)), rng.random() < 0.5
+            bits.set(pos, value)
+            flags[pos] = value
+
+    rebuilt = Bitset.from_flags(flags)
+    for candidate in (bits, rebuilt):
+        everything = range(len(flags))
+        assert list(iter_bits(candidate, everything)) == [
+            i for i, flag in enumerate(flags) if flag
+        ]
+        window = range(len(flags) - 5, 60_000, -1)
+        assert list(iter_bits(candidate, window)) == [i for i in window if flags[i]]
+        assert count_bits(candidate, range(100, 140_000)) == sum(flags[100:140_000])
+
+    cleared = select_bits([(bits, False)], len(flags))
+    assert count_bits(cleared, range(len(flags))) == flags.count(False)
+
+
+def test_bulk_added_users_answer_filters_like_single_adds():
+    users = [
+        User(
+            email=f"user{i:05d}@example.com",
+            hashed_password="x",
+            is_active=i % 3 != 0,
+            is_superuser=i % 7 == 0,
+        )
+        for i in range(5000)
+    ]
+    one_by_one, bulk = MemoryStorage(), MemoryStorage()
+    for user in users:
+        one_by_one.add_user(user)
+    taken = User(email="USER00001@example.com", hashed_password="x")
+    assert bulk.add_users([*users, taken]) == users
+
+    for filters in (
+        UserFilter(is_active=False),
+        UserFilter(is_active=True, is_superuser=False),
+        UserFilter(email_prefix="user012"),
+    ):
+        for order_by in ("-created_at", "email"):
+            kwargs = dict(skip=0, limit=50, after=None, filters=filters)
+            assert bulk.page_users(**kwargs, order_by=order_by) == (
+                one_by_one.page_users(**kwargs, order_by=order_by)
+            )
+        assert bulk.count_users(filters) == one_by_one.count_users(filters)
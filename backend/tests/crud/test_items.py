@@ -0,0 +1,148 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from app import crud
+from app.crud.backends import get_storage
+from app.models import Item, ItemCreate, ItemUpdate
+
+
+def _create_items(owner_id, n):
+    return [
+        crud.create_item(item_in=ItemCreate(title=f"Item {i}"), owner_id=owner_id)
+        for i in range(n)
+    ]
+
+
+def test_get_items_by_owner_pages_newest_first():
+    owner_id = uuid4()
+    created = _create_items(owner_id, 5)
+
+    page, count = crud.get_items_by_owner(owner_id=owner_id, skip=1, limit=2)
+    assert count == 5
+    assert page == [created[3], created[2]]
+
+    page, count = crud.get_items_by_owner(owner_id=owner_id, skip=4, limit=10)
+    assert page == [created[0]]
+    assert crud.get_items_by_owner(owner_id=owner_id, skip=5) == ([], 5)
+
+
+def test_owner_index_tracks_deletes():
+    owner_id = uuid4()
+    created = _create_items(owner_id, 3)
+
+    crud.delete_item(item=created[1])
+    page, count = crud.get_items_by_owner(owner_id=owner_id)
+    assert count == 2
+    assert page == [created[2], created[0]]
+
+
+def test_delete_items_by_owner_only_touches_that_owner():
+    owner_id, other_id = uuid4(), uuid4()
+    _create_items(owner_id, 3)
+    others = _create_items(other_id, 2)
+    total_before = len(crud.list_all_items())
+
+    assert crud.delete_items_by_owner(owner_id=owner_id) == 3
+    assert crud.get_items_by_owner(owner_id=owner_id) == ([], 0)
+    assert crud.get_items_by_owner(owner_id=other_id)[1] == 2
+    assert len(crud.list_all_items()) == total_before - 3
+    assert crud.get_item(item_id=others[0].id) == others[0]
+
+
+def test_bulk_create_update_delete():
+    owner_id = uuid4()
+    items = crud.create_items(
+        items_in=[ItemCreate(title=f"Bulk {i}") for i in range(5)], owner_id=owner_id
+    )
+    assert crud.count_items(owner_id=owner_id) == 5
+
+    updated = crud.update_items(
+        updates=[(item, ItemUpdate(title=item.title.upper())) for item in items[:2]]
+    )
+    assert [crud.get_item(item_id=item.id).title for item in updated] == [
+        "BULK 0",
+        "BULK 1",
+    ]
+
+    crud.delete_items(items=items[1:])
+    page, count = crud.get_items_by_owner(owner_id=owner_id)
+    assert count == 1
+    assert page == [updated[0]]
+
+
+def test_export_items_filters_by_owner_and_creation_time():
+    owner_id, other_id = uuid4(), uuid4()
+    start = datetime(2030, 1, 1, tzinfo=UTC)
+    for day in range(4):
+        for owner in (owner_id, other_id):
+            get_storage().add_item(
+                Item(
+                    title=f"Day {day}",
+                    owner_id=owner,
+                    created_at=start + timedelta(days=day),
+                )
+            )
+
+    exported = list(crud.export_items(since=start))
+    assert [item.title for item in exported] == [
+        f"Day {day}" for day in range(4) for _ in range(2)
+    ]
+
+    window = list(
+        crud.export_items(
+            owner_id=owner_id,
+            since=start + timedelta(days=1),
+            until=start + timedelta(days=3),
+        )
+    )
+    assert [item.title for item in window] == ["Day 1", "Day 2"]
+    assert {item.owner_id for item in window} == {owner_id}
+    assert list(crud.export_items(owner_id=uuid4())) == []
+
+
+def test_export_items_reads_a_snapshot():
+    owner_id = uuid4()
+    items = _create_items(owner_id, 3)
+
+    exported = crud.export_items(owner_id=owner_id)
+    crud.create_item(item_in=ItemCreate(title="Late"), owner_id=owner_id)
+    crud.update_item(item=items[0], item_in=ItemUpdate(title="Renamed"))
+    crud.delete_item(item=items[1])
+
+    assert [item.title for item in exported] == ["Item 0", "Item 1", "Item 2"]
+
+
+def test_get_items_filters_by_creation_time_in_either_order():
+    owner_id, other_id = uuid4(), uuid4()
+    start = datetime(2030, 1, 1, tzinfo=UTC)
+    items = []
+    for day in range(6):
+        item = Item(
+            title=f"Day {day}",
+            owner_id=owner_id if day % 2 else other_id,
+            created_at=start + timedelta(days=day),
+        )
+        get_storage().add_item(item)
+        items.append(item)
+    since, until = start + timedelta(days=1), start + timedelta(days=5)
+
+    assert crud.get_items(since=since, until=until) == (items[4:0:-1], 4)
+    page, count = crud.get_items(since=since, until=until, order_by="created_at")
+    assert (page, count) == (items[1:5], 4)
+    page, _ = crud.get_items(
+        since=since, order_by="created_at", limit=2, after=(since, items[1].id)
+    )
+    assert page == items[2:4]
+    assert crud.get_items(since=start, skip=4) == (items[1::-1], 6)
+
+    page, count = crud.get_items_by_owner(owner_id=owner_id, since=since, until=until)
+    assert (page, count) == ([items[3], items[1]], 2)
+    page, count = crud.get_items_by_owner(
+        owner_id=owner_id, since=since, order_by="created_at", skip=1
+    )
+    assert (page, count) == ([items[3], items[5]], 3)
+    page, _ = crud.get_items_by_owner(
+        owner_id=other_id, order_by="created_at", after=(since, items[1].id)
+    )
+    assert page == [items[2], items[4]]
+    assert crud.get_items(since=start + timedelta(days=6)) == ([], 0)
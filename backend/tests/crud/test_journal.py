@@ -0,0 +1,92 @@
+from uuid import uuid4
+
+import pytest
+
+from app import crud
+from app.crud.backends import JournaledMemoryStorage, set_storage
+from app.crud.backends.base import UserFilter
+from app.models import (
+    Item,
+    ItemCreate,
+    ItemUpdate,
+    User,
+    UserCreate,
+    UserUpdateMe,
+)
+
+
+@pytest.fixture
+def storage():
+    # Overrides the backend-parametrized fixture: these tests reopen the store.
+    return None
+
+
+def _state(storage):
+    users = sorted((u.id, u.email, u.full_name) for u in storage.list_users())
+    items = sorted((i.id, i.title, i.owner_id) for i in storage.list_items())
+    return users, items
+
+
+@pytest.mark.parametrize("snapshot_every", [1_000, 3])
+def test_reopen_restores_state(tmp_path, snapshot_every):
+    data_dir = str(tmp_path / "data")
+    store = JournaledMemoryStorage(data_dir, snapshot_every=snapshot_every)
+    previous = set_storage(store)
+    try:
+        crud.reset_mock_data()
+        user = crud.create_user(
+            user_create=UserCreate(email="erin@example.com", password="password123")
+        )
+        items = [
+            crud.create_item(item_in=ItemCreate(title=f"Log {i}"), owner_id=user.id)
+            for i in range(4)
+        ]
+        crud.update_item(item=items[0], item_in=ItemUpdate(title="Renamed"))
+        crud.delete_item(item=items[1])
+        crud.update_user_me(user=user, user_update=UserUpdateMe(full_name="Erin"))
+        expected = _state(store)
+    finally:
+        set_storage(previous)
+        store.close()
+
+    reopened = JournaledMemoryStorage(data_dir, snapshot_every=snapshot_every)
+    assert _state(reopened) == expected
+    assert reopened.user_stats() == store.user_stats()
+    # Replay goes through the record hooks, so the search index is rebuilt.
+    found, _ = reopened.search_items("renamed", owner_id=None, skip=0, limit=10)
+    assert [item.id for item in found] == [items[0].id]
+    # So are the user filter indexes.
+    filters = UserFilter(is_superuser=False, email_prefix="er")
+    page = reopened.page_users(skip=0, limit=10, after=None, filters=filters)
+    assert [u.id for u in page] == [user.id]
+    reopened.close()
+
+
+def test_torn_log_tail_is_discarded(tmp_path):
+    data_dir = tmp_path / "data"
+    store = JournaledMemoryStorage(str(data_dir))
+    store.add_item(Item(title="Kept", owner_id=uuid4()))
+    store.close()
+
+    (segment,) = data_dir.glob("wal-*.log")
+    with open(segment, "ab") as f:
+        f.write(b"\x10\x00\x00")  # half a record header
+
+    reopened = JournaledMemoryStorage(str(data_dir))
+    assert [i.title for i in reopened.list_items()] == ["Kept"]
+    reopened.close()
+
+
+def test_bulk_insert_past_a_snapshot_is_replayed_once(tmp_path):
+    data_dir = str(tmp_path / "data")
+    store = JournaledMemoryStorage(data_dir, snapshot_every=3)
+    users = [User(email=f"u{i}@example.com", hashed_password="x") for i in range(5)]
+    assert store.add_users(users) == users
+    store.close()
+
+    reopened = JournaledMemoryStorage(data_dir, snapshot_every=3)
+    assert reopened.count_users() == 5
+    assert reopened.user_stats() == store.user_stats()
+    page = reopened.page_users(skip=0, limit=10, after=None)
+    assert sorted(u.email for u in page) == [u.email for u in users]
+    reopened.close()
@@ -0,0 +1,45 @@
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.crud.backends import MemoryStorage
+from app.crud.backends.records import ItemRecord, UserRecord
+from app.models import Item, User
+
+
+@pytest.fixture
+def storage():
+    # Overrides the backend-parametrized fixture: these tests inspect the
+    # memory store's records directly.
+    return None
+
+
+def test_records_round_trip_to_models():
+    user = User(email="erin@example.com", full_name="Erin", hashed_password="x")
+    assert UserRecord.from_model(user).to_model() == user
+
+    item = Item(title="Tent", description=None, owner_id=user.id)
+    record = ItemRecord.from_model(item, item.owner_id.int)
+    assert record.to_model(item.owner_id) == item
+
+
+def test_items_share_one_owner_id():
+    store = MemoryStorage()
+    owner_id = uuid4()
+    for i in range(3):
+        store.add_item(Item(title=f"Item {i}", owner_id=UUID(str(owner_id))))
+
+    first, *rest = store.item_records()
+    assert all(record.owner_id is first.owner_id for record in rest)
+    models = store.list_items()
+    assert all(model.owner_id is models[0].owner_id for model in models)
+
+
+def test_owner_id_is_released_with_its_last_item():
+    store = MemoryStorage()
+    owner_id = uuid4()
+    item = Item(title="Only", owner_id=owner_id)
+    store.add_item(item)
+    store.delete_item(item.id)
+    assert store.count_items(owner_id) == 0
+    assert store._owners == {}
@@ -0,0 +1,119 @@
+import sqlite3
+from uuid import uuid4
+
+import pytest
+
+from app import crud
+from app.crud.backends import SQLiteStorage
+from app.crud.search import SearchIndex, tokenize
+from app.models import ItemCreate, ItemUpdate
+
+
+def _create(owner_id, title, description=None):
+    item_in = ItemCreate(title=title, description=description)
+    return crud.create_item(item_in=item_in, owner_id=owner_id)
+
+
+def _titles(query, **kwargs):
+    items, _ = crud.search_items(query=query, **kwargs)
+    return [item.title for item in items]
+
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Crème Brûlée, x_y 42!") == ["creme", "brulee", "x", "y", "42"]
+    assert tokenize(None) == []
+
+
+def test_search_matches_prefixes_of_every_term():
+    owner_id = uuid4()
+    _create(owner_id, "Quarterly report", "numbers for the board")
+    _create(owner_id, "Quartz clock")
+    _create(owner_id, "Weekly report")
+
+    assert set(_titles("quar")) == {"Quarterly report", "Quartz clock"}
+    assert _titles("quar rep") == ["Quarterly report"]
+    assert _titles("REPORT board") == ["Quarterly report"]
+    assert _titles("q") == []  # too short to match as a prefix
+    assert crud.search_items(query="  !! ") == ([], 0)
+
+
+def test_search_ranks_title_hits_above_description_hits():
+    owner_id = uuid4()
+    _create(owner_id, "Notes", "about the zephyr engine")
+    _create(owner_id, "Zephyr engine")
+    _create(owner_id, "Zephyrus notes")
+
+    titles = _titles("zephyr")
+    assert set(titles) == {"Zephyr engine", "Zephyrus notes", "Notes"}
+    assert titles.index("Zephyr engine") < titles.index("Notes")
+
+
+def test_search_counts_all_matches_and_pages():
+    owner_id = uuid4()
+    for i in range(5):
+        _create(owner_id, f"Widget {i}")
+
+    items, count = crud.search_items(query="widget", skip=1, limit=2)
+    assert count == 5
+    assert len(items) == 2
+    assert {item.title for item in items} < {f"Widget {i}" for i in range(5)}
+    # Equal scores go newest first.
+    assert _titles("widget", limit=2) == ["Widget 4", "Widget 3"]
+
+
+def test_search_follows_updates_and_deletes():
+    owner_id = uuid4()
+    item = _create(owner_id, "Old gadget")
+    other = _create(owner_id, "Gadget spare")
+
+    crud.update_item(item=item, item_in=ItemUpdate(title="New gizmo"))
+    assert _titles("gadget") == ["Gadget spare"]
+    assert _titles("gizmo") == ["New gizmo"]
+
+    crud.delete_item(item=other)
+    assert crud.search_items(query="gadget") == ([], 0)
+
+    crud.delete_items_by_owner(owner_id=owner_id)
+    assert crud.search_items(query="gizmo") == ([], 0)
+
+
+def test_search_filters_by_owner():
+    owner_id, other_id = uuid4(), uuid4()
+    _create(owner_id, "Shared word")
+    _create(other_id, "Shared word too")
+
+    assert _titles("shared", owner_id=owner_id) == ["Shared word"]
+    assert crud.search_items(query="shared")[1] == 2
+
+
+def test_sqlite_indexes_items_stored_before_search_existed(storage, tmp_path):
+    if not isinstance(storage, SQLiteStorage):
+        pytest.skip("only SQLite keeps its index on disk")
+    _create(uuid4(), "Legacy thing")
+    conn = sqlite3.connect(tmp_path / "app.db")
+    conn.executescript(
+        "DROP TRIGGER tr_items_fts_insert; DROP TRIGGER tr_items_fts_update;"
+        "DROP TRIGGER tr_items_fts_delete; DROP TABLE items_fts; DROP TABLE item_docs;"
+    )
+    conn.close()
+
+    reopened = SQLiteStorage(str(tmp_path / "app.db"))
+    items, count = reopened.search_items("legacy", owner_id=None, skip=0, limit=10)
+    reopened.close()
+    assert [item.title for item in items] == ["Legacy thing"]
+    assert count == 1
+
+
+def test_index_compacts_tombstones():
+    index = SearchIndex()
+    for i in range(3000):
+        index.add(i, 1, f"doc {i}", None)
+    for i in range(2000):
+        index.remove(i)
+
+    # Removals past the tombstone threshold renumbered the survivors.
+    assert len(index) == 1000
+    assert len(index._doc_ids) < 3000
+    ids, count = index.search("doc", owner_id=1, limit=3)
+    assert count == 1000
+    assert ids == [2999, 2998, 2997]
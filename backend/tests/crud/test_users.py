@@ -0,0 +1,199 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app import crud
+from app.crud.backends import get_storage
+from app.models import User, UserCreate, UserUpdate, UserUpdateMe
+
+
+def test_get_user_by_email_is_case_insensitive():
+    user = crud.get_user_by_email(email="Alice@Example.COM")
+    assert user is not None
+    assert user.email == "alice@example.com"
+
+
+def test_email_index_follows_updates_and_deletes():
+    user = crud.create_user(
+        user_create=UserCreate(email="bob@example.com", password="password123")
+    )
+    assert crud.get_user_by_email(email="bob@example.com").id == user.id
+
+    user = crud.update_user(
+        user=user, user_update=UserUpdate(email="robert@example.com")
+    )
+    assert crud.get_user_by_email(email="bob@example.com") is None
+    assert crud.get_user_by_email(email="robert@example.com").id == user.id
+
+    user = crud.update_user_me(
+        user=user, user_update=UserUpdateMe(email="rob@example.com")
+    )
+    assert crud.get_user_by_email(email="robert@example.com") is None
+    assert crud.get_user_by_email(email="rob@example.com").id == user.id
+
+    crud.delete_user(user=user)
+    assert crud.get_user_by_email(email="rob@example.com") is None
+
+
+def test_store_refuses_a_taken_email():
+    storage = get_storage()
+    alice = crud.get_user_by_email(email="alice@example.com")
+    with pytest.raises(crud.EmailAlreadyExists):
+        storage.add_user(User(email="ALICE@example.com", hashed_password="x"))
+    with pytest.raises(crud.EmailAlreadyExists):
+        crud.update_user_me(
+            user=crud.get_user_by_email(email="admin@example.com"),
+            user_update=UserUpdateMe(email="Alice@Example.com"),
+        )
+    # Nothing was half-applied: one Alice, still found by her email.
+    assert crud.get_user_by_email(email="alice@example.com").id == alice.id
+    assert crud.get_users(email_prefix="alice")[1] == 1
+    assert crud.get_user_by_email(email="admin@example.com").is_superuser
+    assert crud.count_users() == 2
+
+    created = crud.create_users(
+        users_in=[
+            UserCreate(email="new@example.com", password="password123"),
+            UserCreate(email="alice@example.com", password="password123"),
+        ],
+        hashed_passwords=["x", "x"],
+    )
+    assert [user.email for user in created] == ["new@example.com"]
+    assert crud.count_users() == 3
+
+
+def test_updates_from_stale_copies_keep_each_others_fields():
+    user = crud.create_user(
+        user_create=UserCreate(email="hal@example.com", password="password123")
+    )
+    # Both writers read ``user`` first: an admin deactivates it, then the
+    # user renames themselves from the copy they loaded before that.
+    crud.update_user(user=user, user_update=UserUpdate(is_active=False))
+    renamed = crud.update_user_me(user=user, user_update=UserUpdateMe(full_name="Hal"))
+
+    assert (renamed.full_name, renamed.is_active) == ("Hal", False)
+    stored = crud.get_user(user_id=user.id)
+    assert (stored.full_name, stored.is_active) == ("Hal", False)
+    assert crud.get_users(is_active=False)[0] == [stored]
+
+
+def test_reset_mock_data_rebuilds_email_index():
+    crud.create_user(
+        user_create=UserCreate(email="carol@example.com", password="password123")
+    )
+    crud.reset_mock_data()
+    assert crud.get_user_by_email(email="carol@example.com") is None
+    assert crud.get_user_by_email(email="admin@example.com") is not None
+
+
+def test_user_stats_follow_flag_changes():
+    user = crud.create_user(
+        user_create=UserCreate(email="dave@example.com", password="password123")
+    )
+    assert crud.get_user_stats().model_dump() == {
+        "total": 3,
+        "active": 3,
+        "superusers": 1,
+    }
+
+    user = crud.update_user(
+        user=user, user_update=UserUpdate(is_active=False, is_superuser=True)
+    )
+    assert crud.get_user_stats().model_dump() == {
+        "total": 3,
+        "active": 2,
+        "superusers": 2,
+    }
+
+    crud.delete_user(user=user)
+    assert crud.get_user_stats().model_dump() == {
+        "total": 2,
+        "active": 2,
+        "superusers": 1,
+    }
+
+
+def test_export_users_reads_a_snapshot_in_creation_order():
+    users = crud.list_all_users()
+    exported = crud.export_users()
+    crud.create_user(
+        user_create=UserCreate(email="late@example.com", password="password123")
+    )
+
+    assert [user.id for user in exported] == [
+        user.id for user in sorted(users, key=lambda u: (u.created_at, u.id))
+    ]
+    since = max(user.created_at for user in users)
+    assert [user.email for user in crud.export_users(since=since)][-1] == (
+        "late@example.com"
+    )
+
+
+def _add_users(start, specs):
+    users = []
+    for day, (email, is_active, is_superuser) in enumerate(specs):
+        user = User(
+            email=email,
+            is_active=is_active,
+            is_superuser=is_superuser,
+            hashed_password="x",
+            created_at=start + timedelta(days=day),
+        )
+        get_storage().add_user(user)
+        users.append(user)
+    return users
+
+
+def test_get_users_filters_on_flags_email_prefix_and_creation_time():
+    start = datetime(2030, 1, 1, tzinfo=UTC)
+    erin, fay, gus, erik = _add_users(
+        start,
+        [
+            ("erin@example.com", True, False),
+            ("fay@example.com", False, False),
+            ("gus@example.com", True, True),
+            ("Erik@example.com", False, True),
+        ],
+    )
+
+    assert crud.get_users(is_active=False) == ([erik, fay], 2)
+    assert crud.get_users(is_superuser=True, since=start)[0] == [erik, gus]
+    assert crud.get_users(is_active=True, is_superuser=False, since=start) == (
+        [erin],
+        1,
+    )
+    assert crud.get_users(email_prefix="ER") == ([erik, erin], 2)
+    assert crud.get_users(email_prefix="eri", is_active=False) == ([erik], 1)
+    assert crud.get_users(email_prefix="zed") == ([], 0)
+    page, count = crud.get_users(
+        since=start + timedelta(days=1), until=start + timedelta(days=3)
+    )
+    assert (page, count) == ([gus, fay], 2)
+
+    # Filters follow updates and deletes.
+    fay = crud.update_user(user=fay, user_update=UserUpdate(is_active=True))
+    crud.delete_user(user=erik)
+    assert crud.get_users(is_active=False) == ([], 0)
+    assert crud.get_users(email_prefix="er") == ([erin], 1)
+    assert crud.get_users(is_active=True, since=start)[0] == [gus, fay, erin]
+
+
+def test_get_users_orders_and_pages():
+    start = datetime(2030, 1, 1, tzinfo=UTC)
+    users = _add_users(start, [(f"{name}@example.com", True, False) for name in "dcba"])
+
+    page, count = crud.get_users(since=start, order_by="created_at", limit=3)
+    assert (page, count) == (users[:3], 4)
+    last = page[-1]
+    page, _ = crud.get_users(
+        since=start, order_by="created_at", after=(last.created_at, last.id)
+    )
+    assert page == users[3:]
+    page, _ = crud.get_users(since=start, after=(last.created_at, last.id))
+    assert page == users[:2][::-1]
+
+    emails = [user.email for user in crud.get_users(order_by="email")[0]]
+    assert emails == sorted(emails)
+    assert emails[:3] == ["a@example.com", "admin@example.com", "alice@example.com"]
+    page, _ = crud.get_users(order_by="-email", since=start, skip=1, limit=2)
+    assert page == users[1:3]
@@ -0,0 +1,107 @@
+from uuid import uuid4
+
+import pytest
+
+from app import crud
+from app.crud.backends import SQLiteStorage
+from app.models import ItemCreate, ItemUpdate, UserCreate, UserUpdate
+
+
+def test_item_writes_move_their_lists_only():
+    owner_id, other_id = uuid4(), uuid4()
+    before = crud.get_items_generation()
+    other = crud.get_items_generation(owner_id=other_id)
+    users = crud.get_users_generation()
+
+    items = crud.create_items(
+        items_in=[ItemCreate(title=f"Item {i}") for i in range(3)], owner_id=owner_id
+    )
+    after_create = crud.get_items_generation(owner_id=owner_id)
+    assert crud.get_items_generation() > before
+    assert after_create > 0
+    assert crud.get_items_generation(owner_id=other_id) == other
+    assert crud.get_users_generation() == users
+    # Fresh records start at version 0; only updates move them.
+    assert crud.get_item_version(item_id=items[0].id) == 0
+
+    crud.update_items(updates=[(items[0], ItemUpdate(title="Renamed"))])
+    assert crud.get_item_version(item_id=items[0].id) > 0
+    assert crud.get_item_version(item_id=items[1].id) == 0
+    assert crud.get_items_generation(owner_id=owner_id) > after_create
+
+    generation = crud.get_items_generation(owner_id=owner_id)
+    crud.delete_items(items=items[1:])
+    assert crud.get_items_generation(owner_id=owner_id) > generation
+
+
+def test_conditional_update_fails_once_the_record_moved():
+    user = crud.create_user(
+        user_create=UserCreate(email="erin@example.com", password="password123")
+    )
+    version = crud.get_user_version(user_id=user.id)
+
+    updated = crud.update_user(
+        user=user, user_update=UserUpdate(full_name="Erin"), expected_version=version
+    )
+    with pytest.raises(crud.VersionConflict):
+        crud.update_user(
+            user=user,
+            user_update=UserUpdate(full_name="Stale"),
+            expected_version=version,
+        )
+    assert crud.get_user(user_id=user.id).full_name == "Erin"
+
+    current = crud.get_user_version(user_id=user.id)
+    crud.update_user(
+        user=updated, user_update=UserUpdate(is_active=False), expected_version=current
+    )
+    assert crud.get_user(user_id=user.id).is_active is False
+
+
+def test_reset_draws_a_new_epoch():
+    epoch = crud.versions.epoch
+    crud.reset_mock_data()
+    assert crud.versions.epoch != epoch
+    assert crud.get_items_generation() == 0
+
+
+def test_deleted_records_drop_their_versions(storage):
+    owner_id = uuid4()
+    items = crud.create_items(
+        items_in=[ItemCreate(title=f"Item {i}") for i in range(3)], owner_id=owner_id
+    )
+    crud.update_items(updates=[(item, ItemUpdate(title="Moved")) for item in items])
+    assert all(crud.get_item_version(item_id=item.id) > 0 for item in items)
+
+    crud.delete_item(item=items[0])
+    crud.delete_items_by_owner(owner_id=owner_id)
+    assert [storage.record_version(item.id) for item in items] == [0, 0, 0]
+
+
+def test_sqlite_workers_share_the_counters(storage, tmp_path):
+    if not isinstance(storage, SQLiteStorage):
+        pytest.skip("only SQLite is shared between processes")
+    # A second handle on the same file, as another worker process holds.
+    other = SQLiteStorage(str(tmp_path / "app.db"))
+    try:
+        user = crud.create_user(
+            user_create=UserCreate(email="erin@example.com", password="password123")
+        )
+        crud.update_user(user=user, user_update=UserUpdate(full_name="Erin"))
+        assert other.version_epoch() == crud.versions.epoch
+        assert other.generation("users") == crud.get_users_generation() > 0
+        assert other.record_version(user.id) == crud.get_user_version(user_id=user.id)
+
+        # Another worker updates the user between this one's read and write.
+        version = crud.get_user_version(user_id=user.id)
+        with other.batch():
+            other.update_user(user.id, {"full_name": "Elsewhere"})
+            other.bump_versions(["users"], [user.id])
+        with pytest.raises(crud.VersionConflict):
+            crud.update_user(
+                user=user,
+                user_update=UserUpdate(full_name="Stale"),
+                expected_version=version,
+            )
+    finally:
+        other.close()
@@ -15,8 +15,7 @@ import {
 
 import { useCurrentUserQuery } from '@/hooks/use-auth';
 import { getAccessToken } from '@/lib/api/auth';
-import { getItems } from '@/lib/api/items';
-import { getUsers } from '@/lib/api/users';
+import { getStats } from '@/lib/api/stats';
 import { getHealthCheck } from '@/lib/api/health';
 import {
   Card,
@@ -31,16 +30,9 @@ import { PageHeader } from '@/components/common/page-header';
 function useStats() {
   const token = getAccessToken() ?? '';
 
-  const itemsQuery = useQuery({
-    queryKey: ['items', 0, 1],
-    queryFn: () => getItems(token, { skip: 0, limit: 1 }),
-    enabled: !!token,
-    retry: false,
-  });
-
-  const usersQuery = useQuery({
-    queryKey: ['users', 0, 1],
-    queryFn: () => getUsers(token, { skip: 0, limit: 1 }),
+  const statsQuery = useQuery({
+    queryKey: ['stats'],
+    queryFn: () => getStats(token),
     enabled: !!token,
     retry: false,
   });
@@ -50,7 +42,7 @@ function useStats() {
     queryFn: getHealthCheck,
   });
 
-  return { itemsQuery, usersQuery, healthQuery };
+  return { statsQuery, healthQuery };
 }
 
 function StatCard({
@@ -110,9 +102,11 @@ const NAV_LINKS = [
 
 export default function DashboardHomePage() {
   const meQuery = useCurrentUserQuery();
-  const { itemsQuery, usersQuery, healthQuery } = useStats();
+  const { statsQuery, healthQuery } = useStats();
 
   const user = meQuery.data;
+  // User counts are only returned to superusers.
+  const usersHidden = statsQuery.isSuccess && !statsQuery.data.users;
   const backendOk = healthQuery.isSuccess;
 
   return (
@@ -133,16 +127,16 @@ export default function DashboardHomePage() {
       <div className="grid grid-cols-1 gap-4 sm:grid-cols-3">
         <StatCard
           label="Total items"
-          value={itemsQuery.data?.count}
-          isLoading={itemsQuery.isPending}
-          isError={itemsQuery.isError}
+          value={statsQuery.data?.items}
+          isLoading={statsQuery.isPending}
+          isError={statsQuery.isError}
           icon={Package}
         />
         <StatCard
           label="Total users"
-          value={usersQuery.data?.count}
-          isLoading={usersQuery.isPending}
-          isError={usersQuery.isError}
+          value={statsQuery.data?.users?.total}
+          isLoading={statsQuery.isPending}
+          isError={statsQuery.isError || usersHidden}
           icon={Users}
         />
         <Card>
@@ -42,6 +42,7 @@ export function useCreateItemMutation() {
     },
     onSuccess: async () => {
       await queryClient.invalidateQueries({ queryKey: ['items'] });
+      await queryClient.invalidateQueries({ queryKey: ['stats'] });
     },
   });
 }
@@ -56,6 +57,7 @@ export function useUpdateItemMutation() {
     },
     onSuccess: async () => {
       await queryClient.invalidateQueries({ queryKey: ['items'] });
+      await queryClient.invalidateQueries({ queryKey: ['stats'] });
     },
   });
 }
@@ -70,6 +72,7 @@ export function useDeleteItemMutation() {
     },
     onSuccess: async () => {
       await queryClient.invalidateQueries({ queryKey: ['items'] });
+      await queryClient.invalidateQueries({ queryKey: ['stats'] });
     },
   });
 }
@@ -42,6 +42,7 @@ export function useCreateUserMutation() {
     },
     onSuccess: async () => {
       await queryClient.invalidateQueries({ queryKey: ['users'] });
+      await queryClient.invalidateQueries({ queryKey: ['stats'] });
     },
   });
 }
@@ -56,6 +57,7 @@ export function useUpdateUserMutation() {
     },
     onSuccess: async () => {
       await queryClient.invalidateQueries({ queryKey: ['users'] });
+      await queryClient.invalidateQueries({ queryKey: ['stats'] });
     },
   });
 }
@@ -70,6 +72,7 @@ export function useDeleteUserMutation() {
     },
     onSuccess: async () => {
       await queryClient.invalidateQueries({ queryKey: ['users'] });
+      await queryClient.invalidateQueries({ queryKey: ['stats'] });
     },
   });
 }
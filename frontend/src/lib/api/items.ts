@@ -11,6 +11,7 @@ export type ItemPublic = {
 export type ItemsPublic = {
   data: ItemPublic[];
   count: number;
+  next_cursor: string | null;
 };
 
 export type ItemCreateInput = {
@@ -25,11 +26,12 @@ export type ItemUpdateInput = {
 
 export function getItems(
   token: string,
-  params?: { skip?: number; limit?: number },
+  params?: { skip?: number; limit?: number; after?: string },
 ) {
   const search = new URLSearchParams();
   if (params?.skip !== undefined) search.set('skip', String(params.skip));
   if (params?.limit !== undefined) search.set('limit', String(params.limit));
+  if (params?.after !== undefined) search.set('after', params.after);
 
   const qs = search.toString();
   const path = `/api/v1/items/${qs ? `?${qs}` : ''}`;
@@ -0,0 +1,22 @@
+import { apiFetch } from './client';
+
+export type UserStats = {
+  total: number;
+  active: number;
+  superusers: number;
+};
+
+export type StatsPublic = {
+  items: number;
+  own_items: number;
+  users: UserStats | null;
+};
+
+export function getStats(token: string) {
+  return apiFetch<StatsPublic>('/api/v1/utils/stats', {
+    method: 'GET',
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+  });
+}
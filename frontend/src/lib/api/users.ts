@@ -12,6 +12,7 @@ export type UserPublic = {
 export type UsersPublic = {
   data: UserPublic[];
   count: number;
+  next_cursor: string | null;
 };
 
 export type UserCreateInput = {
@@ -51,11 +52,12 @@ export function getCurrentUser(token: string) {
 
 export function getUsers(
   token: string,
-  params?: { skip?: number; limit?: number },
+  params?: { skip?: number; limit?: number; after?: string },
 ) {
   const search = new URLSearchParams();
   if (params?.skip !== undefined) search.set('skip', String(params.skip));
   if (params?.limit !== undefined) search.set('limit', String(params.limit));
+  if (params?.after !== undefined) search.set('after', params.after);
 
   const qs = search.toString();
   const path = `/api/v1/users/${qs ? `?${qs}` : ''}`;